@@ -0,0 +1,48 @@
+from django import forms
+from django.core.exceptions import ValidationError
+
+from posts.forms import PostForm
+
+
+class PreloadedChoiceField(forms.Field):
+    """Выбор из заранее загруженных объектов: проверка без запроса.
+
+    Ключ — id или slug, ошибки — те же, что у ModelChoiceField.
+    """
+
+    default_error_messages = forms.ModelChoiceField.default_error_messages
+
+    def __init__(self, objects, **kwargs):
+        super().__init__(**kwargs)
+        self.objects = objects
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return self.objects[value]
+        except (KeyError, TypeError):
+            raise ValidationError(
+                self.error_messages['invalid_choice'], code='invalid_choice'
+            )
+
+
+class BulkPostForm(PostForm):
+    """PostForm для пакетной записи: без картинки, группы уже загружены."""
+
+    class Meta(PostForm.Meta):
+        fields = ('text', 'group')
+
+    def __init__(self, *args, groups, **kwargs):
+        super().__init__(*args, **kwargs)
+        group = self.fields['group']
+        self.fields['group'] = PreloadedChoiceField(
+            groups,
+            required=group.required,
+            label=group.label,
+            help_text=group.help_text,
+        )
+
+    def _get_validation_exclusions(self):
+        # Иначе full_clean модели проверит группу отдельным запросом
+        return [*super()._get_validation_exclusions(), 'group']
@@ -0,0 +1,104 @@
+import json
+
+from django.core.files.storage import default_storage
+
+
+def isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def media_url(name):
+    return default_storage.url(name) if name else None
+
+
+def thumbnail_urls(thumbnails):
+    if not thumbnails:
+        return {}
+    return {
+        size: default_storage.url(name)
+        for size, name in json.loads(thumbnails).items()
+    }
+
+
+def zero_if_none(value):
+    return value or 0
+
+
+class FieldsError(ValueError):
+    pass
+
+
+class Serializer:
+    """Поля API поверх строк values(): модели не создаются.
+
+    fields — {поле API: (выражение ORM, преобразование или None)}.
+    Выбранные поля превращаются в список выражений для values(),
+    поэтому лишние колонки и JOIN не попадают в запрос.
+    """
+
+    fields = {}
+    # Нужны серверу (например, для курсора), в ответ не попадают
+    required = ()
+
+    def __init__(self, fields=None):
+        if fields:
+            names = [name.strip() for name in fields.split(',')]
+            unknown = [name for name in names if name not in self.fields]
+            if unknown:
+                raise FieldsError(
+                    f'Неизвестные поля: {", ".join(unknown)}. '
+                    f'Доступны: {", ".join(self.fields)}'
+                )
+            self.names = list(dict.fromkeys(names))
+        else:
+            self.names = list(self.fields)
+
+    @property
+    def lookups(self):
+        lookups = [self.fields[name][0] for name in self.names]
+        return list(dict.fromkeys([*lookups, *self.required]))
+
+    def values(self, queryset):
+        return queryset.values(*self.lookups)
+
+    def serialize(self, row):
+        data = {}
+        for name in self.names:
+            lookup, transform = self.fields[name]
+            value = row[lookup]
+            data[name] = transform(value) if transform else value
+        return data
+
+
+class PostSerializer(Serializer):
+    fields = {
+        'id': ('id', None),
+        'text': ('text', None),
+        'pub_date': ('pub_date', isoformat),
+        'updated': ('updated', isoformat),
+        'author': ('author__username', None),
+        'group': ('group__slug', None),
+        'image': ('image', media_url),
+        'thumbnails': ('thumbnails', thumbnail_urls),
+    }
+    required = ('id', 'pub_date')
+
+
+class GroupSerializer(Serializer):
+    fields = {
+        'id': ('id', None),
+        'slug': ('slug', None),
+        'title': ('title', None),
+        'description': ('description', None),
+        'posts_count': ('posts_count', None),
+    }
+
+
+class ProfileSerializer(Serializer):
+    fields = {
+        'id': ('id', None),
+        'username': ('username', None),
+        'first_name': ('first_name', None),
+        'last_name': ('last_name', None),
+        'posts_count': ('post_stats__posts_count', zero_if_none),
+    }
@@ -0,0 +1,167 @@
+import base64
+import json
+from unittest import mock
+
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import AuthorStats, Group, Post, User
+
+
+class BulkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='Автор', password='пароль'
+        )
+        cls.group = Group.objects.create(
+            title='Стихи', slug='poems', description='Описание'
+        )
+        cls.other = Group.objects.create(
+            title='Проза', slug='prose', description='Описание'
+        )
+        cls.url = reverse('api:posts_bulk')
+
+    def setUp(self):
+        credentials = base64.b64encode('Автор:пароль'.encode()).decode()
+        self.auth = {'HTTP_AUTHORIZATION': f'Basic {credentials}'}
+
+    def post(self, items, client=None, **headers):
+        return (client or self.client).post(
+            self.url,
+            json.dumps(items),
+            content_type='application/json',
+            **{**self.auth, **headers},
+        )
+
+    def test_creates_all(self):
+        """Все посты создаются от автора, группа — по id или slug."""
+        response = self.post([
+            {'text': 'Первый', 'group': self.group.pk},
+            {'text': 'Второй', 'group': 'prose'},
+            {'text': 'Третий'},
+        ])
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual((data['created'], data['failed']), (3, 0))
+        ids = [result['id'] for result in data['results']]
+        posts = Post.objects.in_bulk(ids)
+        self.assertEqual(
+            [(posts[pk].text, posts[pk].group_id) for pk in ids],
+            [
+                ('Первый', self.group.pk),
+                ('Второй', self.other.pk),
+                ('Третий', None),
+            ],
+        )
+        self.assertTrue(all(
+            post.author_id == self.author.pk for post in posts.values()
+        ))
+
+    def test_partial_failure(self):
+        """Неверные посты возвращаются с ошибками, верные создаются."""
+        response = self.post([
+            {'text': 'Верный'},
+            {'text': ''},
+            {'text': 'Чужая группа', 'group': 'missing'},
+            'не объект',
+        ])
+        self.assertEqual(response.status_code, 207)
+        data = response.json()
+        self.assertEqual((data['created'], data['failed']), (1, 3))
+        self.assertEqual(
+            [result['status'] for result in data['results']],
+            ['created', 'invalid', 'invalid', 'invalid'],
+        )
+        self.assertEqual(
+            data['results'][1]['errors']['text'][0]['code'], 'required'
+        )
+        self.assertEqual(
+            data['results'][2]['errors']['group'][0]['code'],
+            'invalid_choice',
+        )
+        self.assertEqual(Post.objects.get().text, 'Верный')
+
+    def test_nothing_valid(self):
+        response = self.post([{'text': ''}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+    def test_bad_body(self):
+        for body in ('не json', '{}', '[]'):
+            with self.subTest(body=body):
+                response = self.client.post(
+                    self.url, body,
+                    content_type='application/json', **self.auth,
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', response.json())
+
+    @override_settings(API_BULK_SIZE=2)
+    def test_size_limit(self):
+        response = self.post([{'text': 'Пост'}] * 3)
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Post.objects.exists())
+
+    def test_queries_do_not_grow_with_batch(self):
+        """Группы — одним запросом, счётчики — раз на пачку."""
+        def count(size):
+            items = [
+                {'text': f'Пост {number}', 'group': group}
+                for number in range(size)
+                for group in ('poems', self.other.pk)
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = self.post(items)
+            self.assertEqual(response.status_code, 201)
+            return len(context)
+
+        count(1)  # строки счётчиков автора создаются первой пачкой
+        self.assertEqual(count(2), count(20))
+
+    def test_counters_once_per_batch(self):
+        with mock.patch(
+            'posts.bulk.change_group_count'
+        ) as change_group_count:
+            self.post([{'text': 'Пост', 'group': 'poems'}] * 5)
+        change_group_count.assert_called_once_with(self.group.pk, 5)
+
+    def test_counters_updated(self):
+        self.post([{'text': 'Пост', 'group': 'poems'}] * 3)
+        self.assertEqual(
+            AuthorStats.objects.get(author=self.author).posts_count, 3
+        )
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 3)
+
+    def test_requires_authentication(self):
+        response = self.post([{'text': 'Пост'}], HTTP_AUTHORIZATION='')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Basic', response['WWW-Authenticate'])
+        wrong = base64.b64encode('Автор:не тот'.encode()).decode()
+        response = self.post(
+            [{'text': 'Пост'}], HTTP_AUTHORIZATION=f'Basic {wrong}'
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Post.objects.exists())
+
+    def test_session_needs_csrf(self):
+        """С сессией без CSRF-токена запись запрещена, с Basic — нет."""
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.author)
+        self.auth = {}
+        self.assertEqual(
+            self.post([{'text': 'Пост'}], client=client).status_code, 403
+        )
+        client.get(reverse('posts:create_post'))
+        token = client.cookies['csrftoken'].value
+        response = self.post(
+            [{'text': 'Пост'}], client=client, HTTP_X_CSRFTOKEN=token
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_only_post(self):
+        response = self.client.get(self.url, **self.auth)
+        self.assertEqual(response.status_code, 405)
@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Group, Post, User
+from posts.utils import POST_PER_PAGE
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(
+            username='Автор', first_name='Анна', last_name='Ахматова'
+        )
+        cls.group = Group.objects.create(
+            title='Стихи', slug='poems', description='Описание'
+        )
+        now = timezone.now()
+        cls.posts = []
+        for number in range(POST_PER_PAGE + 3):
+            post = Post.objects.create(
+                author=cls.author,
+                group=cls.group if number % 2 else None,
+                text=f'Стих {number}',
+            )
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=now - timedelta(minutes=number)
+            )
+            cls.posts.append(post)
+
+    def get(self, name, *args, **params):
+        return self.client.get(reverse(f'api:{name}', args=args), params)
+
+    def test_timeline_cursor_pages(self):
+        """Курсор проходит всю ленту в порядке сайта без повторов."""
+        response = self.get('posts')
+        data = response.json()
+        self.assertEqual(len(data['results']), POST_PER_PAGE)
+        self.assertIsNone(data['previous'])
+        second = self.client.get(data['next']).json()
+        ids = [post['id'] for post in data['results'] + second['results']]
+        self.assertEqual(ids, [post.pk for post in self.posts])
+        self.assertIsNone(second['next'])
+        self.assertEqual(
+            data['results'][0],
+            {
+                'id': self.posts[0].pk,
+                'text': 'Стих 0',
+                'pub_date': Post.objects.get(
+                    pk=self.posts[0].pk
+                ).pub_date.isoformat(),
+                'updated': Post.objects.get(
+                    pk=self.posts[0].pk
+                ).updated.isoformat(),
+                'author': 'Автор',
+                'group': None,
+                'image': None,
+                'thumbnails': {},
+            },
+        )
+
+    def test_fields_pushed_into_query(self):
+        """fields= сужает SELECT и убирает JOIN, сериализует без моделей."""
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get('posts', fields='id,text').json()
+        self.assertEqual(set(data['results'][0]), {'id', 'text'})
+        (sql,) = [query['sql'] for query in queries]
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('"image"', sql)
+        response = self.get('posts', fields='id,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('password', response.json()['error'])
+
+    def test_ids_lookup(self):
+        """ids= — много постов одним запросом, в порядке запроса."""
+        ids = [self.posts[5].pk, self.posts[1].pk, 0, self.posts[5].pk]
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get(
+                'posts', ids=','.join(map(str, ids)), fields='id,author'
+            ).json()
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            data['results'],
+            [
+                {'id': self.posts[5].pk, 'author': 'Автор'},
+                {'id': self.posts[1].pk, 'author': 'Автор'},
+            ],
+        )
+        self.assertEqual(self.get('posts', ids='1,x').status_code, 400)
+        too_many = ','.join(map(str, range(1, 102)))
+        self.assertEqual(self.get('posts', ids=too_many).status_code, 400)
+
+    def test_group_and_profile(self):
+        group = self.get('group_detail', self.group.slug).json()
+        self.assertEqual(group['title'], 'Стихи')
+        self.assertEqual(group['posts_count'], 6)
+        posts = self.get('group_posts', self.group.slug).json()['results']
+        self.assertEqual(
+            [post['id'] for post in posts],
+            [post.pk for post in self.posts if post.group_id],
+        )
+        profile = self.get(
+            'profile_detail',
+            self.author.username,
+            fields='username,posts_count',
+        ).json()
+        self.assertEqual(
+            profile, {'username': 'Автор', 'posts_count': len(self.posts)}
+        )
+        posts = self.get(
+            'profile_posts', self.author.username, fields='id'
+        ).json()
+        self.assertEqual(len(posts['results']), POST_PER_PAGE)
+
+    @override_settings(POSTS_PAGE_SIZES={'api:posts': (5, 8)})
+    def test_page_size(self):
+        """page_size ограничен пределом представления и идёт в next."""
+        data = self.get('posts', page_size=3, fields='id').json()
+        self.assertEqual(len(data['results']), 3)
+        self.assertIn('page_size=3', data['next'])
+        second = self.client.get(data['next']).json()
+        self.assertEqual(
+            [post['id'] for post in data['results'] + second['results']],
+            [post.pk for post in self.posts[:6]],
+        )
+        self.assertEqual(len(self.get('posts').json()['results']), 5)
+        self.assertEqual(
+            len(self.get('posts', page_size=100).json()['results']), 8
+        )
+
+    def test_detail_and_errors(self):
+        post = self.get(
+            'post_detail', self.posts[2].pk, fields='text,group'
+        ).json()
+        self.assertEqual(post, {'text': 'Стих 2', 'group': None})
+        for response in (
+            self.get('post_detail', 0),
+            self.get('group_detail', 'missing'),
+            self.get('profile_posts', 'missing'),
+        ):
+            self.assertEqual(response.status_code, 404)
+            self.assertEqual(response.json(), {'error': 'Не найдено'})
+        response = self.client.post(reverse('api:posts'))
+        self.assertEqual(response.status_code, 405)
@@ -0,0 +1,263 @@
+import base64
+import binascii
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.exceptions import RequestDataTooBig
+from django.db.models import Q
+from django.http import Http404, JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+
+from core.routers import replica_reads
+from posts.bulk import bulk_create_posts
+from posts.models import Group, Post, User
+from posts.utils import CursorPaginator, page_size
+
+from .forms import BulkPostForm
+from .serializers import (FieldsError, GroupSerializer, PostSerializer,
+                          ProfileSerializer)
+
+MAX_IDS = 100
+
+
+def respond(data, status=200):
+    return JsonResponse(
+        data, status=status, json_dumps_params={'ensure_ascii': False}
+    )
+
+
+def error(message, status=400):
+    return respond({'error': message}, status)
+
+
+def api_view(view):
+    """Только чтение, ошибки — JSON, а не HTML-страницы."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return error('Метод не поддерживается', 405)
+        try:
+            return view(request, *args, **kwargs)
+        except FieldsError as fields_error:
+            return error(str(fields_error))
+        except Http404:
+            return error('Не найдено', 404)
+    return replica_reads(wrapper)
+
+
+def cursor_url(request, cursor):
+    if cursor is None:
+        return None
+    query = request.GET.copy()
+    query['cursor'] = cursor
+    return request.build_absolute_uri(f'{request.path}?{query.urlencode()}')
+
+
+def post_page(request, posts):
+    """Страница постов по курсору, в порядке лент сайта.
+
+    Размер — ?page_size= в пределах POSTS_PAGE_SIZES.
+    """
+    serializer = PostSerializer(request.GET.get('fields'))
+    page = CursorPaginator(
+        serializer.values(posts), page_size(request)
+    ).get_page(request.GET.get('cursor'))
+    return respond({
+        'results': [serializer.serialize(row) for row in page],
+        'next': cursor_url(request, page.next_cursor),
+        'previous': cursor_url(request, page.previous_cursor),
+    })
+
+
+def detail(serializer, queryset):
+    row = serializer.values(queryset).first()
+    if row is None:
+        raise Http404
+    return respond(serializer.serialize(row))
+
+
+@api_view
+def posts(request):
+    if 'ids' in request.GET:
+        return posts_by_ids(request)
+    return post_page(request, Post.objects.all())
+
+
+def posts_by_ids(request):
+    """Посты ?ids=1,2,3 одним запросом, в порядке ids; ненайденных нет."""
+    try:
+        ids = [int(pk) for pk in request.GET['ids'].split(',') if pk]
+    except ValueError:
+        return error('ids — список id постов через запятую')
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_IDS:
+        return error(f'Не больше {MAX_IDS} id за запрос')
+    serializer = PostSerializer(request.GET.get('fields'))
+    rows = {
+        row['id']: row
+        for row in serializer.values(Post.objects.filter(pk__in=ids))
+    }
+    return respond({
+        'results': [serializer.serialize(rows[pk]) for pk in ids if pk in rows]
+    })
+
+
+@api_view
+def post_detail(request, post_id):
+    return detail(
+        PostSerializer(request.GET.get('fields')),
+        Post.objects.filter(pk=post_id),
+    )
+
+
+@api_view
+def group_detail(request, slug):
+    return detail(
+        GroupSerializer(request.GET.get('fields')),
+        Group.objects.filter(slug=slug),
+    )
+
+
+@api_view
+def group_posts(request, slug):
+    group = get_object_or_404(Group.objects.only('pk'), slug=slug)
+    return post_page(request, Post.objects.filter(group_id=group.pk))
+
+
+@api_view
+def profile_detail(request, username):
+    return detail(
+        ProfileSerializer(request.GET.get('fields')),
+        User.objects.filter(username=username),
+    )
+
+
+@api_view
+def profile_posts(request, username):
+    author = get_object_or_404(User.objects.only('pk'), username=username)
+    return post_page(request, Post.objects.filter(author_id=author.pk))
+
+
+def basic_user(request):
+    """Пользователь из заголовка Authorization: Basic, иначе None."""
+    scheme, _, credentials = request.META.get(
+        'HTTP_AUTHORIZATION', ''
+    ).partition(' ')
+    if scheme.lower() != 'basic':
+        return None
+    try:
+        username, _, password = base64.b64decode(
+            credentials, validate=True
+        ).decode().partition(':')
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+    return authenticate(request, username=username, password=password)
+
+
+def write_view(view):
+    """Запись: POST от пользователя с паролем в Basic или с сессией.
+
+    Для сессии CSRF проверяется как обычно; клиентам с Basic токен
+    не нужен — браузер сам такие заголовки не подставляет.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'POST':
+            return error('Метод не поддерживается', 405)
+        if 'HTTP_AUTHORIZATION' in request.META:
+            user = basic_user(request)
+        elif request.user.is_authenticated:
+            if CsrfViewMiddleware().process_view(request, None, (), {}):
+                return error('Нет CSRF-токена', 403)
+            user = request.user
+        else:
+            user = None
+        if user is None:
+            response = error('Нужна авторизация', 401)
+            response['WWW-Authenticate'] = 'Basic realm="api"'
+            return response
+        request.user = user
+        return view(request, *args, **kwargs)
+    return csrf_exempt(wrapper)
+
+
+def bulk_size():
+    return getattr(settings, 'API_BULK_SIZE', 1000)
+
+
+def load_groups(items):
+    """Группы всех элементов одним запросом: по id и по slug."""
+    ids, slugs = set(), set()
+    for item in items:
+        group = item.get('group') if isinstance(item, dict) else None
+        if isinstance(group, int) and not isinstance(group, bool):
+            ids.add(group)
+        elif isinstance(group, str):
+            slugs.add(group)
+    if not ids and not slugs:
+        return {}
+    groups = {}
+    for group in Group.objects.filter(Q(pk__in=ids) | Q(slug__in=slugs)):
+        groups[group.pk] = group
+        groups[group.slug] = group
+    return groups
+
+
+def check_item(item, groups):
+    """Результат проверки элемента пачки и несохранённый пост."""
+    if not isinstance(item, dict):
+        return {'status': 'invalid', 'errors': {'__all__': [
+            {'message': 'Ожидается объект', 'code': 'invalid'}
+        ]}}, None
+    form = BulkPostForm(item, groups=groups)
+    if not form.is_valid():
+        return {
+            'status': 'invalid', 'errors': form.errors.get_json_data()
+        }, None
+    return {'status': 'created'}, form.save(commit=False)
+
+
+def bulk_status(created, total):
+    if not created:
+        return 400
+    return 201 if created == total else 207
+
+
+@write_view
+def posts_bulk(request):
+    """Пачка постов: JSON-массив объектов {"text", "group"}.
+
+    Каждый проверяется правилами PostForm, группа — по id или slug.
+    Верные посты вставляются вместе, неверные возвращаются с ошибками.
+    Ответ 201 — созданы все, 207 — часть, 400 — ни одного.
+    """
+    try:
+        items = json.loads(request.body)
+    except RequestDataTooBig:
+        return error('Слишком большой запрос', 413)
+    except ValueError:
+        return error('Тело запроса — не JSON')
+    if not isinstance(items, list) or not items:
+        return error('Ожидается непустой массив постов')
+    if len(items) > bulk_size():
+        return error(f'Не больше {bulk_size()} постов за запрос', 413)
+    groups = load_groups(items)
+    results, created = [], []
+    for index, item in enumerate(items):
+        result, post = check_item(item, groups)
+        results.append({'index': index, **result})
+        if post is not None:
+            post.author = request.user
+            created.append((results[-1], post))
+    posts = bulk_create_posts(post for _, post in created)
+    for (result, _), post in zip(created, posts):
+        result['id'] = post.pk
+    return respond({
+        'created': len(posts),
+        'failed': len(items) - len(posts),
+        'results': results,
+    }, bulk_status(len(posts), len(items)))
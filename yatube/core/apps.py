@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        from .sqlite import connect
+        connect()
+        # Задачи регистрируются при импорте модулей tasks приложений
+        autodiscover_modules('tasks')
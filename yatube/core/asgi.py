@@ -0,0 +1,182 @@
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
+from django.urls import Resolver404, resolve
+
+READ_VIEWS = (
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+)
+
+
+class ASGIHandler:
+    """ASGI-приложение поверх WSGI-обработчика Django.
+
+    Django 2.2 не умеет асинхронные представления, поэтому соединение,
+    чтение тела и отправка ответа живут в цикле событий, а сам запрос
+    к Django уходит в пул потоков. Медленный клиент не держит поток,
+    пока передаёт запрос. Ленты и страница поста идут в отдельный пул,
+    чтобы записи не занимали все потоки чтения.
+    """
+
+    def __init__(self, wsgi_application):
+        self.wsgi_application = wsgi_application
+        self.read_pool = ThreadPoolExecutor(
+            getattr(settings, 'ASGI_READ_THREADS', 8),
+            thread_name_prefix='asgi-read',
+        )
+        self.pool = ThreadPoolExecutor(
+            getattr(settings, 'ASGI_THREADS', 4),
+            thread_name_prefix='asgi',
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        if scope['type'] != 'http':
+            raise ValueError(f'Неподдерживаемое соединение {scope["type"]}')
+        body = await self.read_body(receive)
+        if body is None:
+            return
+        loop = asyncio.get_event_loop()
+        messages = asyncio.Queue()
+
+        def push(message):
+            loop.call_soon_threadsafe(messages.put_nowait, message)
+
+        done = loop.run_in_executor(
+            self.pool_for(scope),
+            self.run_wsgi,
+            self.environ(scope, body),
+            push,
+        )
+        while True:
+            message = await messages.get()
+            if message is None:
+                break
+            await send(message)
+        await done
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.read_pool.shutdown(wait=False)
+                self.pool.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def read_body(self, receive):
+        """Тело запроса; большое уходит во временный файл."""
+        body = SpooledTemporaryFile(
+            max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        )
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return None
+            body.write(message.get('body', b''))
+            if not message.get('more_body', False):
+                break
+        body.seek(0)
+        return body
+
+    def pool_for(self, scope):
+        if scope['method'] not in ('GET', 'HEAD'):
+            return self.pool
+        path = scope['path'][len(scope.get('root_path', '')):]
+        try:
+            view_name = resolve(path).view_name
+        except Resolver404:
+            return self.pool
+        return self.read_pool if view_name in READ_VIEWS else self.pool
+
+    def environ(self, scope, body):
+        server = scope.get('server') or ('localhost', 80)
+        client = scope.get('client') or ('', 0)
+        root_path = scope.get('root_path', '')
+        environ = {
+            'REQUEST_METHOD': scope['method'],
+            'SCRIPT_NAME': root_path.encode().decode('latin1'),
+            'PATH_INFO': scope['path'][len(root_path):].encode().decode(
+                'latin1'
+            ),
+            'QUERY_STRING': scope.get('query_string', b'').decode('latin1'),
+            'SERVER_NAME': str(server[0]),
+            'SERVER_PORT': str(server[1]),
+            'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+            'REMOTE_ADDR': str(client[0]),
+            'REMOTE_PORT': str(client[1]),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': scope.get('scheme', 'http'),
+            'wsgi.input': body,
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in scope.get('headers', []):
+            name = name.decode('latin1').upper().replace('-', '_')
+            value = value.decode('latin1')
+            if name not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                name = f'HTTP_{name}'
+            if name in environ:
+                # Повторные Cookie склеиваются через '; ', остальные — ','
+                separator = '; ' if name == 'HTTP_COOKIE' else ','
+                value = f'{environ[name]}{separator}{value}'
+            environ[name] = value
+        return environ
+
+    def run_wsgi(self, environ, push):
+        """Выполняется в потоке пула: ответ Django сообщениями ASGI.
+
+        Обычный ответ уходит одним сообщением, потоковый — частями,
+        как их отдаёт Django. Ответ закрывается в том же потоке — так
+        Django закрывает соединения с базой этого потока. В конце
+        отправляется None.
+        """
+        def start_response(status, headers, exc_info=None):
+            push({
+                'type': 'http.response.start',
+                'status': int(status.split(' ', 1)[0]),
+                'headers': [
+                    (name.lower().encode('latin1'), value.encode('latin1'))
+                    for name, value in headers
+                ],
+            })
+
+        try:
+            result = self.wsgi_application(environ, start_response)
+            try:
+                if getattr(result, 'streaming', False):
+                    for chunk in result:
+                        push({
+                            'type': 'http.response.body',
+                            'body': chunk,
+                            'more_body': True,
+                        })
+                    push({'type': 'http.response.body', 'body': b''})
+                else:
+                    push({
+                        'type': 'http.response.body',
+                        'body': b''.join(result),
+                    })
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        finally:
+            environ['wsgi.input'].close()
+            push(None)
+
+
+def get_asgi_application():
+    return ASGIHandler(get_wsgi_application())
@@ -0,0 +1,278 @@
+import math
+import random
+import statistics
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from core.metrics import wrap_queries
+from posts.bulk import bulk_create_posts
+from posts.models import Group, Post
+from posts.utils import PAGE_SIZE_PARAM, POST_PER_PAGE
+
+User = get_user_model()
+
+PASSWORD = 'bench-Password-42'
+USERNAME_PREFIX = 'bench-user-'
+PAGE_SIZES = (10, 20, 50, 100)
+# Ленты, которые листает бенчмарк размеров страницы
+PAGE_SIZE_VIEWS = ('posts:index', 'api:posts')
+SCENARIOS = (
+    'index',
+    'group_posts',
+    'profile',
+    'post_detail',
+    'create_post',
+    'post_edit',
+    'signup',
+    'login',
+    'about_author',
+    'about_tech',
+)
+
+
+def seed(users=50, groups=10, posts=2000, random_seed=0, batch_size=500):
+    """Засевает базу через mixer и Faker; при одном seed данные те же."""
+    mixer.faker.seed_instance(random_seed)
+    rng = random.Random(random_seed)
+    mixer.cycle(users).blend(
+        User,
+        username=mixer.sequence(USERNAME_PREFIX + '{0}'),
+        password=make_password(PASSWORD),
+    )
+    mixer.cycle(groups).blend(
+        Group, slug=mixer.sequence('bench-group-{0}')
+    )
+    author_ids = list(User.objects.values_list('pk', flat=True))
+    group_ids = list(Group.objects.values_list('pk', flat=True))
+    now = timezone.now()
+    bulk_create_posts(
+        (
+            Post(
+                text=mixer.faker.text(max_nb_chars=400),
+                author_id=rng.choice(author_ids),
+                group_id=(
+                    rng.choice(group_ids)
+                    if group_ids and rng.random() < 0.7 else None
+                ),
+                pub_date=now - timedelta(minutes=number),
+            )
+            for number in range(posts)
+        ),
+        batch_size=batch_size,
+        keep_pub_date=True,
+    )
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Scenarios:
+    """Запросы к страницам posts, users и about со случайными аргументами."""
+
+    def __init__(self, random_seed=0):
+        self.rng = random.Random(random_seed)
+        self.anonymous = Client()
+        self.author = User.objects.filter(
+            username__startswith=USERNAME_PREFIX
+        ).order_by('pk').first()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.usernames = list(User.objects.values_list('username', flat=True))
+        self.slugs = list(Group.objects.values_list('slug', flat=True))
+        self.post_ids = list(Post.objects.values_list('pk', flat=True))
+        self.own_post_ids = list(
+            self.author.posts.values_list('pk', flat=True)
+        )
+        self.pages = max(math.ceil(len(self.post_ids) / POST_PER_PAGE), 1)
+        self.signups = 0
+
+    def all(self):
+        return {name: getattr(self, name) for name in SCENARIOS}
+
+    def index(self):
+        return self.anonymous.get(
+            reverse('posts:index'), {'page': self.rng.randint(1, self.pages)}
+        )
+
+    def group_posts(self):
+        return self.anonymous.get(
+            reverse('posts:group_list', args=[self.rng.choice(self.slugs)])
+        )
+
+    def profile(self):
+        return self.anonymous.get(
+            reverse('posts:profile', args=[self.rng.choice(self.usernames)])
+        )
+
+    def post_detail(self):
+        return self.anonymous.get(
+            reverse('posts:post_detail', args=[self.rng.choice(self.post_ids)])
+        )
+
+    def create_post(self):
+        return self.author_client.post(
+            reverse('posts:create_post'),
+            {'text': mixer.faker.sentence(), 'group': ''},
+        )
+
+    def post_edit(self):
+        post_id = self.rng.choice(self.own_post_ids)
+        return self.author_client.post(
+            reverse('posts:post_edit', args=[post_id]),
+            {'text': mixer.faker.sentence(), 'group': ''},
+        )
+
+    def signup(self):
+        self.signups += 1
+        password = f'{PASSWORD}-{self.signups}'
+        return Client().post(reverse('users:signup'), {
+            'username': f'bench-signup-{self.signups}',
+            'password1': password,
+            'password2': password,
+        })
+
+    def login(self):
+        return Client().post(reverse('users:login'), {
+            'username': self.author.username,
+            'password': PASSWORD,
+        })
+
+    def about_author(self):
+        return self.anonymous.get(reverse('about:author'))
+
+    def about_tech(self):
+        return self.anonymous.get(reverse('about:tech'))
+
+
+def percentile(values, quantile):
+    """Перцентиль по ближайшему рангу."""
+    values = sorted(values)
+    return values[max(math.ceil(quantile * len(values)) - 1, 0)]
+
+
+def measure(request, requests, warmup=0):
+    for _ in range(warmup):
+        request()
+    counter = QueryCounter()
+    timings = []
+    queries = []
+    statuses = Counter()
+    started = time.perf_counter()
+    for _ in range(requests):
+        counter.count = 0
+        with wrap_queries(counter):
+            request_started = time.perf_counter()
+            response = request()
+            timings.append(time.perf_counter() - request_started)
+        queries.append(counter.count)
+        statuses[response.status_code] += 1
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': requests,
+        'throughput_rps': round(requests / elapsed, 2) if elapsed else None,
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'queries_per_request': round(statistics.mean(queries), 2),
+        'max_queries': max(queries),
+        'statuses': {
+            str(status): count for status, count in sorted(statuses.items())
+        },
+    }
+
+
+def run_benchmark(requests=100, warmup=5, names=None, random_seed=0):
+    """Прогоняет сценарии по очереди, возвращает метрики каждого."""
+    scenarios = Scenarios(random_seed).all()
+    return {
+        name: measure(request, requests, warmup)
+        for name, request in scenarios.items()
+        if not names or name in names
+    }
+
+
+def read_feed(client, view_name, size, total):
+    """Листает ленту страницами по size, пока не прочитает total постов.
+
+    HTML-лента идёт по ?page=, API — по ссылкам next. Возвращает
+    время, SQL-запросы и число постов каждого запроса.
+    """
+    url = reverse(view_name)
+    params = {PAGE_SIZE_PARAM: size}
+    counter = QueryCounter()
+    requests = []
+    read = 0
+    page = 1
+    while read < total and url:
+        counter.count = 0
+        with wrap_queries(counter):
+            started = time.perf_counter()
+            response = client.get(url, params)
+            elapsed = time.perf_counter() - started
+        if view_name.startswith('api:'):
+            data = response.json()
+            posts = len(data['results'])
+            url, params = data['next'], None
+        else:
+            page_obj = response.context['page_obj']
+            posts = len(page_obj)
+            page += 1
+            params = {PAGE_SIZE_PARAM: size, 'page': page}
+            if not page_obj.has_next():
+                url = None
+        requests.append((elapsed, counter.count, posts))
+        read += posts
+        if not posts:
+            break
+    return requests
+
+
+def run_page_size_benchmark(sizes=PAGE_SIZES, total=200, repeat=3,
+                            views=PAGE_SIZE_VIEWS):
+    """Сколько стоит прочитать total постов страницами разного размера.
+
+    Большая страница — меньше запросов, но каждый дороже; результат —
+    число запросов, их цена и итоговая скорость чтения постов. Размер
+    больше предела представления урезается: это видно по posts_per_request.
+    """
+    client = Client()
+    results = {}
+    for view_name in views:
+        results[view_name] = {}
+        for size in sizes:
+            read_feed(client, view_name, size, total)
+            runs = [
+                read_feed(client, view_name, size, total)
+                for _ in range(repeat)
+            ]
+            requests = [request for run in runs for request in run]
+            timings = [elapsed for elapsed, _, _ in requests]
+            elapsed = sum(timings) / repeat
+            posts = sum(posts for _, _, posts in requests) / repeat
+            results[view_name][str(size)] = {
+                'requests': len(runs[0]),
+                'posts_per_request': round(posts / len(runs[0]), 1),
+                'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+                'queries_per_request': round(statistics.mean(
+                    queries for _, queries, _ in requests
+                ), 2),
+                'total_ms': round(elapsed * 1000, 3),
+                'posts_per_second': (
+                    round(posts / elapsed, 1) if elapsed else None
+                ),
+            }
+    return results
@@ -0,0 +1,143 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/feed+json',
+    'application/javascript',
+    'application/xml',
+    'application/rss+xml',
+    'application/atom+xml',
+    'image/svg+xml',
+)
+# Уровни сжатия на лету: быстрые. Заранее сжатые копии кэша
+# делаются один раз, поэтому для них — максимальные
+LEVELS = {'br': 4, 'gzip': 6}
+PRECOMPRESS_LEVELS = {'br': 11, 'gzip': 9}
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def compression_enabled():
+    return getattr(settings, 'COMPRESSION', True)
+
+
+def min_size():
+    return getattr(settings, 'COMPRESSION_MIN_SIZE', 512)
+
+
+def encodings():
+    """Поддерживаемые кодировки в порядке предпочтения."""
+    return ('br', 'gzip') if brotli else ('gzip',)
+
+
+def accepted_encoding(header):
+    """Лучшая из поддерживаемых кодировок, которую принимает клиент.
+
+    Учитывает веса q; при равных весах br лучше gzip.
+    """
+    weights = {}
+    for part in header.split(','):
+        name, *params = part.split(';')
+        weight = 1.0
+        for param in params:
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    best, best_weight = None, 0.0
+    for encoding in encodings():
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(data, encoding, level=None):
+    level = level or LEVELS[encoding]
+    if encoding == 'br':
+        return brotli.compress(data, quality=level)
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding):
+    """Сжимает поток по частям; каждая часть уходит клиенту сразу."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=LEVELS['br'])
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(LEVELS['gzip'], zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def compressible(response):
+    content_type = response.get('Content-Type', '').lower()
+    return (
+        not response.has_header('Content-Encoding')
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+        and (response.streaming or len(response.content) >= min_size())
+    )
+
+
+def precompress(response):
+    """Сжимает ответ, который уходит в кэш, во все кодировки заранее.
+
+    Копии хранятся вместе с ответом; compress_response берёт готовую
+    вместо того, чтобы сжимать страницу на каждом попадании в кэш.
+    """
+    if not compression_enabled() or response.streaming:
+        return
+    if compressible(response):
+        response.precompressed = {
+            encoding: compress(
+                response.content, encoding, PRECOMPRESS_LEVELS[encoding]
+            )
+            for encoding in encodings()
+        }
+
+
+def compress_response(request, response):
+    """Сжимает ответ в кодировку из Accept-Encoding.
+
+    Маленькие ответы и ответы не с текстом остаются как есть.
+    ETag становится слабым: байты ответа зависят от кодировки.
+    """
+    if not compressible(response):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    encoding = accepted_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if encoding is None:
+        return response
+    if response.streaming:
+        response.streaming_content = compress_stream(
+            response.streaming_content, encoding
+        )
+        del response['Content-Length']
+    else:
+        content = getattr(response, 'precompressed', {}).get(encoding)
+        if content is None:
+            content = compress(response.content, encoding)
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response['Content-Length'] = str(len(content))
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response['ETag'] = 'W/' + etag
+    response['Content-Encoding'] = encoding
+    return response
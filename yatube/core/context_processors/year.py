@@ -1,8 +1,16 @@
 import django.utils.timezone as timezone
+from django.utils.functional import SimpleLazyObject
+
+
+def current_year():
+    return timezone.now().year
 
 
 def year(request):
-    """Добавляет переменную с текущим годом."""
+    """Добавляет переменную с текущим годом.
+
+    Год считается, только если шаблон его выводит.
+    """
     return {
-        'year': timezone.now().year
+        'year': SimpleLazyObject(current_year)
     }
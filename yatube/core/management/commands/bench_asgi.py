@@ -0,0 +1,278 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from itertools import cycle
+from urllib.parse import unquote
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+from django.urls import reverse
+
+from core.asgi import ASGIHandler
+from core.benchmark import percentile, seed
+from posts.models import Group, Post, User
+
+HOST = '127.0.0.1'
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """wsgiref с пулом потоков, как у синхронного воркера.
+
+    Поток занят с момента, когда клиент подключился, и до конца ответа.
+    """
+
+    request_queue_size = 1024
+
+    def __init__(self, address, threads):
+        super().__init__(address, QuietHandler)
+        self.executor = ThreadPoolExecutor(threads)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_in_thread, request, client_address)
+
+    def process_in_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+async def serve_asgi(application, reader, writer):
+    """Минимальный HTTP/1.1-сервер для ASGI: запрос — соединение."""
+    try:
+        method, target, version = (
+            (await reader.readline()).decode('latin1').split()
+        )
+        headers = []
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, value = line.decode('latin1').split(':', 1)
+            headers.append((
+                name.strip().lower().encode('latin1'),
+                value.strip().encode('latin1'),
+            ))
+        length = int(dict(headers).get(b'content-length', 0))
+        body = await reader.readexactly(length) if length else b''
+        path, _, query = target.partition('?')
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': version.split('/')[1],
+            'method': method,
+            'scheme': 'http',
+            'path': unquote(path),
+            'raw_path': path.encode('latin1'),
+            'query_string': query.encode('latin1'),
+            'root_path': '',
+            'headers': headers,
+            'client': writer.get_extra_info('peername')[:2],
+            'server': writer.get_extra_info('sockname')[:2],
+        }
+
+        async def receive():
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                writer.write(
+                    f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n'
+                    .encode('latin1')
+                )
+                for name, value in message['headers']:
+                    writer.write(name + b': ' + value + b'\r\n')
+                writer.write(b'connection: close\r\n\r\n')
+            else:
+                writer.write(message.get('body', b''))
+                await writer.drain()
+
+        await application(scope, receive, send)
+    except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+def start_wsgi(threads):
+    server = PooledWSGIServer((HOST, 0), threads)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def stop():
+        server.shutdown()
+        server.server_close()
+        server.executor.shutdown(wait=False)
+
+    return server.server_address[1], stop
+
+
+def start_asgi(threads):
+    application = ASGIHandler(get_wsgi_application())
+    application.read_pool = ThreadPoolExecutor(threads)
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(asyncio.start_server(
+        partial(serve_asgi, application), HOST, 0, backlog=1024
+    ))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    def stop():
+        loop.call_soon_threadsafe(server.close)
+        loop.call_soon_threadsafe(loop.stop)
+        application.read_pool.shutdown(wait=False)
+        application.pool.shutdown(wait=False)
+
+    return server.sockets[0].getsockname()[1], stop
+
+
+def raw_request(path):
+    return (
+        f'GET {path} HTTP/1.1\r\nHost: localhost\r\n'
+        f'Connection: close\r\n\r\n'
+    ).encode('latin1')
+
+
+async def slow_client(port, request, seconds):
+    """Клиент на медленном канале: шлёт запрос по байту."""
+    reader, writer = await asyncio.open_connection(HOST, port)
+    delay = seconds / len(request)
+    for index in range(len(request)):
+        writer.write(request[index:index + 1])
+        await writer.drain()
+        await asyncio.sleep(delay)
+    await reader.read()
+    writer.close()
+
+
+async def fast_client(port, request):
+    started = time.perf_counter()
+    reader, writer = await asyncio.open_connection(HOST, port)
+    writer.write(request)
+    response = await reader.read()
+    writer.close()
+    return time.perf_counter() - started, int(response.split(b' ', 2)[1])
+
+
+async def load(port, paths, options):
+    """Медленные клиенты занимают соединения, быстрые меряют задержку."""
+    started = time.perf_counter()
+    slow = [
+        asyncio.ensure_future(slow_client(
+            port, raw_request(path), options['slow_seconds']
+        ))
+        for path, _ in zip(cycle(paths), range(options['slow_clients']))
+    ]
+    await asyncio.sleep(0.1)
+    semaphore = asyncio.Semaphore(options['concurrency'])
+
+    async def limited(path):
+        async with semaphore:
+            return await fast_client(port, raw_request(path))
+
+    fast_started = time.perf_counter()
+    results = await asyncio.gather(*(
+        limited(path)
+        for path, _ in zip(cycle(paths), range(options['requests']))
+    ))
+    fast_elapsed = time.perf_counter() - fast_started
+    await asyncio.gather(*slow)
+    timings = [timing for timing, _ in results]
+    return {
+        'requests': len(results),
+        'errors': sum(1 for _, status in results if status != 200),
+        'throughput_rps': round(len(results) / fast_elapsed, 2),
+        'p50_ms': round(percentile(timings, 0.5) * 1000, 3),
+        'p95_ms': round(percentile(timings, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(timings, 0.99) * 1000, 3),
+        'total_seconds': round(time.perf_counter() - started, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает WSGI с пулом потоков и ASGI-обработчик под медленными '
+        'клиентами: задержка и пропускная способность быстрых запросов '
+        'к лентам и странице поста.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--slow-clients', type=int, default=50)
+        parser.add_argument('--slow-seconds', type=float, default=2.0)
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument(
+            '--output', help='Куда сохранить JSON с результатами.'
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            seed(users=20, groups=5, posts=options['posts'])
+            paths = self.paths()
+            results = {}
+            for name, start in (('wsgi', start_wsgi), ('asgi', start_asgi)):
+                port, stop = start(options['threads'])
+                try:
+                    results[name] = asyncio.run(load(port, paths, options))
+                finally:
+                    stop()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(
+            f'{"server":<8}{"rps":>10}{"p50, ms":>10}{"p95, ms":>10}'
+            f'{"p99, ms":>10}{"errors":>8}{"total, s":>10}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<8}'
+                f'{result["throughput_rps"]:>10.1f}'
+                f'{result["p50_ms"]:>10.2f}'
+                f'{result["p95_ms"]:>10.2f}'
+                f'{result["p99_ms"]:>10.2f}'
+                f'{result["errors"]:>8}'
+                f'{result["total_seconds"]:>10.2f}'
+            )
+        if options['output']:
+            report = {
+                'options': {
+                    name: options[name] for name in (
+                        'posts', 'threads', 'slow_clients', 'slow_seconds',
+                        'requests', 'concurrency',
+                    )
+                },
+                'results': results,
+            }
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+
+    def paths(self):
+        group = Group.objects.order_by('pk').first()
+        author = User.objects.order_by('pk').first()
+        post = Post.objects.order_by('pk').first()
+        return (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[group.slug]),
+            reverse('posts:profile', args=[author.username]),
+            reverse('posts:post_detail', args=[post.pk]),
+        )
@@ -0,0 +1,86 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+
+from core.benchmark import (PAGE_SIZE_VIEWS, PAGE_SIZES,
+                            run_page_size_benchmark, seed)
+
+
+class Command(BaseCommand):
+    help = (
+        'Засевает временную базу и читает одни и те же посты ленты '
+        'страницами разного размера: число запросов, цена запроса '
+        'и постов в секунду.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument(
+            '--read', type=int, default=200,
+            help='Сколько постов прочитать при каждом размере.',
+        )
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--size', action='append', type=int, dest='sizes',
+            help=f'Размер страницы (можно несколько раз), '
+                 f'по умолчанию {", ".join(map(str, PAGE_SIZES))}.',
+        )
+        parser.add_argument(
+            '--view', action='append', dest='views',
+            choices=PAGE_SIZE_VIEWS,
+            help='Листать только эту ленту (можно несколько раз).',
+        )
+        parser.add_argument(
+            '--output', help='Куда сохранить JSON с результатами.'
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            seed(
+                users=options['users'],
+                groups=options['groups'],
+                posts=options['posts'],
+                random_seed=options['seed'],
+            )
+            results = run_page_size_benchmark(
+                sizes=options['sizes'] or PAGE_SIZES,
+                total=options['read'],
+                repeat=options['repeat'],
+                views=options['views'] or PAGE_SIZE_VIEWS,
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.print_report(results)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(
+                    {'read': options['read'], 'results': results},
+                    output, ensure_ascii=False, indent=2,
+                )
+
+    def print_report(self, results):
+        self.stdout.write(
+            f'{"view":<14}{"size":>6}{"requests":>10}{"posts/req":>11}'
+            f'{"p50, ms":>10}{"queries":>9}{"total, ms":>11}{"posts/s":>10}'
+        )
+        for view_name, sizes in results.items():
+            for size, result in sizes.items():
+                self.stdout.write(
+                    f'{view_name:<14}{size:>6}'
+                    f'{result["requests"]:>10}'
+                    f'{result["posts_per_request"]:>11.1f}'
+                    f'{result["p50_ms"]:>10.2f}'
+                    f'{result["queries_per_request"]:>9.1f}'
+                    f'{result["total_ms"]:>11.1f}'
+                    f'{result["posts_per_second"] or 0:>10.1f}'
+                )
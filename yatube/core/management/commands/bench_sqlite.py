@@ -0,0 +1,173 @@
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import (override_settings, setup_test_environment,
+                               teardown_test_environment)
+from django.urls import reverse
+
+from core.benchmark import percentile, seed
+from posts.models import Group, User
+
+# Профиль до настройки: журнал по умолчанию и подключение на запрос
+BASELINE = ('default', 0)
+TUNED = ('production', 60)
+
+
+class Worker(threading.Thread):
+    """Крутит один вид запросов до дедлайна и копит задержки и ошибки."""
+
+    def __init__(self, request):
+        super().__init__(daemon=True)
+        self.request = request
+        self.deadline = None
+        self.timings = []
+        self.errors = Counter()
+
+    def run(self):
+        try:
+            while time.perf_counter() < self.deadline:
+                started = time.perf_counter()
+                try:
+                    status = self.request()
+                except Exception as error:
+                    self.errors[str(error)] += 1
+                    continue
+                if status in (200, 302):
+                    self.timings.append(time.perf_counter() - started)
+                else:
+                    self.errors[f'HTTP {status}'] += 1
+        finally:
+            connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        'Смешанная нагрузка на файловую SQLite: потоки читают ленты, '
+        'потоки создают посты. Сравнивает журнал по умолчанию '
+        'с профилем production (WAL, PRAGMA, CONN_MAX_AGE).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument(
+            '--output', help='Куда сохранить JSON с результатами.'
+        )
+
+    def handle(self, *args, **options):
+        directory = tempfile.mkdtemp()
+        database = connection.settings_dict
+        database['TEST'] = {
+            **database.get('TEST', {}),
+            'NAME': os.path.join(directory, 'bench.sqlite3'),
+        }
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            seed(users=20, groups=5, posts=options['posts'])
+            results = {
+                profile: self.run_profile(profile, max_age, options)
+                for profile, max_age in (BASELINE, TUNED)
+            }
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            shutil.rmtree(directory, ignore_errors=True)
+
+        self.stdout.write(
+            f'{"profile":<12}{"journal":>8}{"reads/s":>9}{"read p95":>10}'
+            f'{"writes/s":>10}{"write p95":>11}{"errors":>8}'
+        )
+        for profile, result in results.items():
+            self.stdout.write(
+                f'{profile:<12}'
+                f'{result["journal_mode"]:>8}'
+                f'{result["reads_per_second"]:>9.1f}'
+                f'{result["read_p95_ms"]:>10.1f}'
+                f'{result["writes_per_second"]:>10.1f}'
+                f'{result["write_p95_ms"]:>11.1f}'
+                f'{sum(result["errors"].values()):>8}'
+            )
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(
+                    {'options': options, 'results': results},
+                    output, ensure_ascii=False, indent=2, default=str,
+                )
+
+    def run_profile(self, profile, max_age, options):
+        connection.settings_dict['CONN_MAX_AGE'] = max_age
+        pragmas = settings.SQLITE_PROFILES[profile]
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            # Режим журнала меняется, пока к файлу нет других подключений
+            connections.close_all()
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                (journal_mode,) = cursor.fetchone()
+            readers = [
+                Worker(self.reader(number))
+                for number in range(options['readers'])
+            ]
+            writers = [
+                Worker(self.writer()) for _ in range(options['writers'])
+            ]
+            connections.close_all()
+            deadline = time.perf_counter() + options['seconds']
+            for worker in readers + writers:
+                worker.deadline = deadline
+            for worker in readers + writers:
+                worker.start()
+            for worker in readers + writers:
+                worker.join()
+        reads = [timing for worker in readers for timing in worker.timings]
+        writes = [timing for worker in writers for timing in worker.timings]
+        errors = Counter()
+        for worker in readers + writers:
+            errors.update(worker.errors)
+        return {
+            'conn_max_age': max_age,
+            'pragmas': pragmas,
+            'journal_mode': journal_mode,
+            'reads_per_second': round(len(reads) / options['seconds'], 1),
+            'read_p95_ms': round(percentile(reads or [0], 0.95) * 1000, 1),
+            'writes_per_second': round(len(writes) / options['seconds'], 1),
+            'write_p95_ms': round(percentile(writes or [0], 0.95) * 1000, 1),
+            'errors': dict(errors),
+        }
+
+    def reader(self, number):
+        rng = random.Random(number)
+        client = Client()
+        paths = [reverse('posts:index')] + [
+            reverse('posts:group_list', args=[slug])
+            for slug in Group.objects.values_list('slug', flat=True)
+        ]
+
+        def request():
+            return client.get(rng.choice(paths)).status_code
+
+        return request
+
+    def writer(self):
+        client = Client()
+        client.force_login(User.objects.order_by('?').first())
+
+        def request():
+            return client.post(
+                reverse('posts:create_post'), {'text': 'Пост под нагрузкой'}
+            ).status_code
+
+        return request
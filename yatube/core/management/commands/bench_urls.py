@@ -0,0 +1,120 @@
+import json
+import platform
+import subprocess
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import (setup_test_environment,
+                               teardown_test_environment)
+from django.utils import timezone
+
+from core.benchmark import SCENARIOS, run_benchmark, seed
+
+
+class Command(BaseCommand):
+    help = (
+        'Засевает временную базу и прогоняет через тестовый клиент '
+        'страницы posts, users и about: пропускная способность, '
+        'p50/p95/p99 и SQL-запросы на запрос.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            choices=SCENARIOS,
+            help='Прогнать только этот сценарий (можно несколько раз).',
+        )
+        parser.add_argument(
+            '--output', help='Куда сохранить JSON с результатами.'
+        )
+        parser.add_argument(
+            '--compare', help='JSON прошлого прогона для сравнения.'
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            seed(
+                users=options['users'],
+                groups=options['groups'],
+                posts=options['posts'],
+                random_seed=options['seed'],
+                batch_size=options['batch_size'],
+            )
+            results = run_benchmark(
+                requests=options['requests'],
+                warmup=options['warmup'],
+                names=options['scenarios'],
+                random_seed=options['seed'],
+            )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'commit': self.commit(),
+            'created': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'options': {
+                name: options[name] for name in (
+                    'users', 'groups', 'posts', 'requests', 'warmup', 'seed'
+                )
+            },
+            'results': results,
+        }
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as stream:
+                baseline = json.load(stream)['results']
+        self.print_report(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+
+    def commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def print_report(self, results, baseline=None):
+        self.stdout.write(
+            f'{"scenario":<16}{"rps":>10}{"p50, ms":>10}{"p95, ms":>10}'
+            f'{"p99, ms":>10}{"queries":>9}'
+            + (f'{"p95 Δ":>9}{"queries Δ":>11}' if baseline else '')
+        )
+        for name, result in results.items():
+            line = (
+                f'{name:<16}'
+                f'{result["throughput_rps"]:>10.1f}'
+                f'{result["p50_ms"]:>10.2f}'
+                f'{result["p95_ms"]:>10.2f}'
+                f'{result["p99_ms"]:>10.2f}'
+                f'{result["queries_per_request"]:>9.1f}'
+            )
+            previous = (baseline or {}).get(name)
+            if previous:
+                change = (
+                    result['p95_ms'] / previous['p95_ms'] - 1
+                    if previous['p95_ms'] else 0
+                )
+                queries = (
+                    result['queries_per_request']
+                    - previous['queries_per_request']
+                )
+                line += f'{change:>+9.0%}{queries:>+11.1f}'
+            self.stdout.write(line)
@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.routers import PRIMARY, replicate, replicas
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную SQLite-базу в файлы реплик — локальная замена '
+        'репликации для проверки маршрутизации чтений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'aliases', nargs='*',
+            help='Псевдонимы реплик (по умолчанию DATABASE_REPLICAS).',
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            help='Повторять копирование раз в столько секунд.',
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or replicas()
+        if not aliases:
+            raise CommandError('Реплики не заданы: DATABASE_REPLICAS пуст.')
+        for alias in (PRIMARY, *aliases):
+            if alias not in connections.databases:
+                raise CommandError(f'Нет базы {alias!r} в DATABASES.')
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'База {alias!r} не SQLite.')
+        while True:
+            started = time.perf_counter()
+            for alias in aliases:
+                replicate(connections.databases[alias]['NAME'])
+            self.stdout.write(
+                f'Реплики {", ".join(aliases)} обновлены за '
+                f'{time.perf_counter() - started:.3f} с'
+            )
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,115 @@
+import multiprocessing
+import signal
+import sys
+import time
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Запускает процессы-воркеры очереди фоновых задач. '
+        'SIGTERM и Ctrl+C дают воркерам доделать текущую задачу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=getattr(settings, 'TASKS_WORKERS', 2),
+            help='Сколько процессов-воркеров запустить.',
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--burst',
+            action='store_true',
+            help='Выполнить готовые задачи и выйти.',
+        )
+
+    def handle(self, *args, **options):
+        if options['processes'] == 1:
+            done = work(options['poll'], options['burst'])
+            self.stdout.write(f'{current_name()}: задач {done}')
+            return
+        # Подключения к базе не должны достаться дочерним процессам
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(
+                target=run_worker,
+                args=(options['poll'], options['burst']),
+                name=f'worker-{number}',
+            )
+            for number in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+
+        def forward(signum, frame):
+            # Воркер на SIGTERM доделывает текущую задачу и выходит
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+
+        previous = {
+            signum: signal.signal(signum, forward)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for worker in workers:
+                worker.join()
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+
+def current_name():
+    return multiprocessing.current_process().name
+
+
+def work(poll, burst):
+    """Выполняет задачи до SIGTERM или SIGINT; возвращает их число."""
+    # Не на уровне модуля: процесс spawn импортирует модуль до django.setup
+    from core.tasks import run_pending
+
+    stopping = []
+
+    def stop(*args):
+        stopping.append(True)
+
+    previous = {
+        signum: signal.signal(signum, stop)
+        for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    done = 0
+    try:
+        while not stopping:
+            count = run_pending(limit=100)
+            done += count
+            if not count:
+                if burst:
+                    break
+                time.sleep(poll)
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        connections.close_all()
+    return done
+
+
+def run_worker(poll, burst):
+    """Точка входа процесса-воркера.
+
+    При методе запуска spawn процесс начинается с чистого
+    интерпретатора, поэтому Django настраивается заново.
+    """
+    django.setup()
+    done = work(poll, burst)
+    sys.stdout.write(f'{current_name()}: задач {done}\n')
@@ -0,0 +1,211 @@
+import bisect
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from functools import wraps
+
+from django.db import connections
+from django.template.backends.django import Template
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Верхние границы корзин: время — в секундах, запросы — штуками
+TIME_BUCKETS = tuple(
+    round(0.0005 * 2 ** power, 4) for power in range(18)
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 4, 5, 7, 10, 15, 20, 30, 50, 75, 100, 200, 500)
+
+METRICS = {
+    'queries': ('SQL-запросов за запрос', COUNT_BUCKETS),
+    'db_seconds': ('Время в базе, с', TIME_BUCKETS),
+    'template_seconds': ('Время рендера шаблонов, с', TIME_BUCKETS),
+    'total_seconds': ('Полное время ответа, с', TIME_BUCKETS),
+}
+
+_local = threading.local()
+
+# Счётчики приложений (кэши и т. п.): имя -> функция, отдающая dict чисел
+collectors = {}
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами: O(log n) на замер.
+
+    Перцентиль оценивается верхней границей корзины, но не больше
+    наибольшего замера.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0
+        self.max = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, quantile):
+        if not self.count:
+            return 0
+        rank = quantile * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                if index < len(self.bounds):
+                    return min(self.bounds[index], self.max)
+                break
+        return self.max
+
+
+class Registry:
+    """Гистограммы по представлениям, общие для потоков процесса."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view_name, values):
+        with self.lock:
+            histograms = self.views.get(view_name)
+            if histograms is None:
+                histograms = self.views[view_name] = {
+                    metric: Histogram(bounds)
+                    for metric, (_, bounds) in METRICS.items()
+                }
+            for metric, value in values.items():
+                histograms[metric].observe(value)
+
+    def snapshot(self):
+        """Перцентили по каждому представлению и метрике."""
+        with self.lock:
+            return {
+                view_name: {
+                    metric: {
+                        'count': histogram.count,
+                        'sum': histogram.sum,
+                        'max': histogram.max,
+                        'quantiles': {
+                            quantile: histogram.percentile(quantile)
+                            for quantile in QUANTILES
+                        },
+                    }
+                    for metric, histogram in histograms.items()
+                }
+                for view_name, histograms in sorted(self.views.items())
+            }
+
+    def clear(self):
+        with self.lock:
+            self.views.clear()
+
+
+registry = Registry()
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0
+        self.template_seconds = 0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+
+def current_stats():
+    return getattr(_local, 'stats', None)
+
+
+@contextmanager
+def wrap_queries(wrapper):
+    """Ставит обёртку запросов на все подключения к базам."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        yield wrapper
+
+
+@contextmanager
+def collect_stats():
+    """Считает запросы и рендер шаблонов внутри блока текущего потока."""
+    stats = _local.stats = RequestStats()
+    try:
+        with wrap_queries(stats):
+            yield stats
+    finally:
+        _local.stats = None
+
+
+def install_template_timer():
+    """Оборачивает рендер шаблонов Django замером времени.
+
+    Вложенные рендеры (include, render_to_string в тегах) уже входят
+    во внешний и повторно не считаются.
+    """
+    if getattr(Template.render, 'timed', False):
+        return
+    render = Template.render
+
+    @wraps(render)
+    def timed_render(self, *args, **kwargs):
+        stats = current_stats()
+        if stats is None or stats.template_depth:
+            return render(self, *args, **kwargs)
+        stats.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            stats.template_depth -= 1
+            stats.template_seconds += time.perf_counter() - started
+
+    timed_render.timed = True
+    Template.render = timed_render
+
+
+def register_collector(name, collect):
+    collectors[name] = collect
+
+
+def collect():
+    return {name: collectors[name]() for name in sorted(collectors)}
+
+
+def format_prometheus(snapshot, collected=None, prefix='yatube'):
+    """Текстовый формат Prometheus.
+
+    Метрики запросов — summary с квантилями, счётчики приложений —
+    gauge.
+    """
+    lines = []
+    for metric, (description, _) in METRICS.items():
+        name = f'{prefix}_request_{metric}'
+        lines.append(f'# HELP {name} {description}')
+        lines.append(f'# TYPE {name} summary')
+        for view_name, metrics in snapshot.items():
+            data = metrics[metric]
+            label = view_name.replace('\\', '\\\\').replace('"', '\\"')
+            for quantile, value in data['quantiles'].items():
+                lines.append(
+                    f'{name}{{view="{label}",quantile="{quantile}"}} {value}'
+                )
+            lines.append(f'{name}_sum{{view="{label}"}} {data["sum"]}')
+            lines.append(f'{name}_count{{view="{label}"}} {data["count"]}')
+    for collector, values in (collected or {}).items():
+        for stat, value in values.items():
+            name = f'{prefix}_{collector}_{stat}'
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
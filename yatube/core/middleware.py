@@ -0,0 +1,84 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .compression import compress_response, compression_enabled
+from .metrics import collect_stats, install_template_timer, registry
+from .routers import PIN_COOKIE, replicas, request_wrote, start_request
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """Пишет в гистограммы число запросов, время базы, шаблонов и ответа.
+
+    Превышение бюджета запросов представления логируется предупреждением.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_METRICS', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_template_timer()
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        with collect_stats() as stats:
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        match = request.resolver_match
+        view_name = match.view_name if match else '<unresolved>'
+        registry.record(view_name, {
+            'queries': stats.queries,
+            'db_seconds': stats.db_seconds,
+            'template_seconds': stats.template_seconds,
+            'total_seconds': total,
+        })
+        budget = query_budget(view_name)
+        if budget is not None and stats.queries > budget:
+            logger.warning(
+                '%s: %d SQL-запросов при бюджете %d (%s)',
+                view_name, stats.queries, budget, request.path,
+            )
+        return response
+
+
+def query_budget(view_name):
+    budgets = getattr(settings, 'REQUEST_METRICS_QUERY_BUDGETS', {})
+    return budgets.get(
+        view_name, getattr(settings, 'REQUEST_METRICS_QUERY_BUDGET', None)
+    )
+
+
+class ReplicaPinMiddleware:
+    """После запроса с записью клиент какое-то время читает с основной."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start_request()
+        response = self.get_response(request)
+        if request_wrote() and replicas():
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 10),
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """Сжимает текстовые ответы в br или gzip, потоковые — по частям."""
+
+    def __init__(self, get_response):
+        if not compression_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return compress_response(request, self.get_response(request))
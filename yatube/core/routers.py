@@ -0,0 +1,102 @@
+import random
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+PRIMARY = 'default'
+PIN_COOKIE = 'primary_pin'
+# Эти приложения всегда читаются с основной базы: сессия нужна сразу,
+# очередь задач (core) живёт только на основной
+PRIMARY_APPS = ('sessions', 'core')
+
+_state = threading.local()
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', ())
+
+
+class ReplicaRouter:
+    """Чтения внутри replica_reads — с реплики, остальное — с основной.
+
+    Запись в любом месте запроса отмечается, чтобы закрепить клиента
+    за основной базой (см. ReplicaPinMiddleware).
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            replica_enabled()
+            and model._meta.app_label not in PRIMARY_APPS
+            and replicas()
+        ):
+            return random.choice(replicas())
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == PRIMARY
+
+
+def replica_reads(view):
+    """Отдаёт чтения представления реплике.
+
+    Клиент, который недавно что-то записал, читает с основной базы,
+    чтобы сразу увидеть свои изменения.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or PIN_COOKIE in request.COOKIES
+        ):
+            return view(request, *args, **kwargs)
+        with reading_replica(True):
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+def replica_enabled():
+    return getattr(_state, 'replica', False)
+
+
+@contextmanager
+def reading_replica(enabled):
+    """Включает или выключает чтение с реплики на время блока."""
+    previous = replica_enabled()
+    _state.replica = enabled
+    try:
+        yield
+    finally:
+        _state.replica = previous
+
+
+def start_request():
+    _state.wrote = False
+
+
+def request_wrote():
+    return getattr(_state, 'wrote', False)
+
+
+def replicate(target_name, using=PRIMARY):
+    """Копирует основную SQLite-базу в файл реплики — замена репликации.
+
+    Backup API SQLite даёт согласованный снимок даже при записи.
+    """
+    connection = connections[using]
+    connection.ensure_connection()
+    target = sqlite3.connect(target_name)
+    try:
+        connection.connection.backup(target)
+    finally:
+        target.close()
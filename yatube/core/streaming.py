@@ -0,0 +1,36 @@
+import secrets
+
+from django.http import StreamingHttpResponse
+from django.template import loader
+from django.utils.safestring import mark_safe
+
+from .routers import reading_replica, replica_enabled
+
+
+def render_streaming(request, template_name, context):
+    """Отдаёт страницу двумя частями: до {{ stream_break }} и после.
+
+    Каждая часть рендерится один раз: с stream_part='head' base.html
+    выводит только шапку, поэтому ленивые данные страницы ещё не
+    запрошены, когда она уходит клиенту; с stream_part='tail' — только
+    блок content и подвал. Генератор читает с той же базы, что
+    и представление.
+    """
+    template = loader.get_template(template_name)
+    marker = mark_safe(f'<!-- {secrets.token_hex(8)} -->')
+    replica = replica_enabled()
+
+    def chunks():
+        with reading_replica(replica):
+            head = template.render(
+                {**context, 'stream_break': marker, 'stream_part': 'head'},
+                request,
+            )
+            yield head.partition(marker)[0]
+            tail = template.render(
+                {**context, 'stream_break': marker, 'stream_part': 'tail'},
+                request,
+            )
+            yield tail.partition(marker)[2]
+
+    return StreamingHttpResponse(chunks())
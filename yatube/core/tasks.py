@@ -0,0 +1,148 @@
+import json
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+# Сколько готовых задач перебирает claim, если соседние уже забрали
+CLAIM_BATCH = 10
+
+registry = {}
+
+
+def queue_enabled():
+    return getattr(settings, 'TASKS_QUEUE', False)
+
+
+def task(name=None, max_attempts=None):
+    """Регистрирует функцию как задачу; функция остаётся прежней.
+
+    Аргументы задачи хранятся в JSON, поэтому передавайте id, а не
+    объекты моделей.
+    """
+    def decorator(function):
+        function.task_name = (
+            name or f'{function.__module__}.{function.__name__}'
+        )
+        function.max_attempts = max_attempts
+        registry[function.task_name] = function
+        return function
+    return decorator
+
+
+def enqueue(function, *args, key=None):
+    """Ставит задачу в очередь в текущей транзакции.
+
+    Запись откатится вместе с транзакцией, а воркеры увидят её только
+    после коммита. Задача с уже известным ключом key повторно не
+    ставится. Без TASKS_QUEUE функция выполняется сразу.
+    """
+    if not queue_enabled():
+        function(*args)
+        return None
+    try:
+        with transaction.atomic():
+            return Task.objects.create(
+                name=function.task_name,
+                args=json.dumps(args),
+                key=key,
+                max_attempts=(
+                    function.max_attempts
+                    or getattr(settings, 'TASKS_MAX_ATTEMPTS', 5)
+                ),
+            )
+    except IntegrityError:
+        return None
+
+
+def backoff(attempts):
+    """Пауза перед повтором.
+
+    Удваивается с каждой попыткой; случайный разброс не даёт задачам,
+    упавшим вместе, повторяться все разом.
+    """
+    delay = min(
+        getattr(settings, 'TASKS_RETRY_MAX_DELAY', 60 * 60),
+        getattr(settings, 'TASKS_RETRY_DELAY', 5) * 2 ** (attempts - 1),
+    )
+    return timedelta(seconds=delay * random.uniform(0.5, 1))
+
+
+def claim():
+    """Забирает одну готовую задачу или возвращает None.
+
+    Без SELECT FOR UPDATE: задачу получает тот воркер, чей условный
+    UPDATE её изменил. Задача воркера, который умер, снова готова,
+    когда истёк locked_until.
+    """
+    now = timezone.now()
+    ready = Task.objects.filter(
+        Q(status=Task.PENDING, run_at__lte=now)
+        | Q(status=Task.RUNNING, locked_until__lt=now)
+    )
+    lock_timeout = getattr(settings, 'TASKS_LOCK_TIMEOUT', 5 * 60)
+    candidates = ready.order_by('run_at').values_list('pk', flat=True)
+    for pk in candidates[:CLAIM_BATCH]:
+        claimed = ready.filter(pk=pk).update(
+            status=Task.RUNNING,
+            locked_until=now + timedelta(seconds=lock_timeout),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def run_task(task):
+    """Выполняет задачу; при ошибке откладывает повтор или сдаётся.
+
+    Изменения в базе и отметка о выполнении — в одной транзакции:
+    если воркер упадёт посередине, задача повторится целиком.
+    """
+    try:
+        with transaction.atomic():
+            function = registry.get(task.name)
+            if function is None:
+                raise LookupError(f'Неизвестная задача {task.name}')
+            function(*json.loads(task.args))
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.DONE, locked_until=None, error=''
+            )
+        return True
+    except Exception:
+        error = traceback.format_exc()
+    if task.attempts >= task.max_attempts:
+        logger.error('Задача %s провалена:\n%s', task, error)
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.FAILED, locked_until=None, error=error
+        )
+    else:
+        logger.warning('Задача %s повторится:\n%s', task, error)
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.PENDING,
+            locked_until=None,
+            run_at=timezone.now() + backoff(task.attempts),
+            error=error,
+        )
+    return False
+
+
+def run_pending(limit=None):
+    """Выполняет готовые задачи, пока они есть; возвращает их число."""
+    count = 0
+    while limit is None or count < limit:
+        task = claim()
+        if task is None:
+            break
+        run_task(task)
+        count += 1
+    return count
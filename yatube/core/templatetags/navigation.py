@@ -0,0 +1,66 @@
+from functools import lru_cache
+from urllib.parse import quote
+
+from django import template
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.http import RFC3986_SUBDELIMS
+from django.utils.safestring import mark_safe
+
+from core.context_processors.year import current_year
+
+register = template.Library()
+
+# Метки, на место которых в готовую шапку подставляется пользователь
+USERNAME_SLOT = 'navigation-username-slot'
+PROFILE_SLOT = 'navigation-profile-slot'
+
+
+@lru_cache(maxsize=None)
+def header_html(authenticated, view_name):
+    """Шапка для пары (вошёл ли пользователь, активная страница).
+
+    Ссылки разворачиваются один раз на процесс; пар немного — по числу
+    представлений.
+    """
+    return render_to_string('includes/header.html', {
+        'authenticated': authenticated,
+        'view_name': view_name,
+        'username': USERNAME_SLOT,
+        'profile_url': reverse('posts:profile', args=[PROFILE_SLOT]),
+    })
+
+
+@lru_cache(maxsize=None)
+def footer_html(year):
+    return render_to_string('includes/footer.html', {'year': year})
+
+
+@receiver(setting_changed)
+def clear_navigation(**kwargs):
+    header_html.cache_clear()
+    footer_html.cache_clear()
+
+
+@register.simple_tag(takes_context=True)
+def header(context):
+    request = context['request']
+    match = request.resolver_match
+    user = context['user']
+    html = header_html(
+        user.is_authenticated, match.view_name if match else None
+    )
+    if user.is_authenticated:
+        # Как в reverse: экранируются все символы вне pchar из RFC 3986
+        html = html.replace(PROFILE_SLOT, escape(
+            quote(user.username, safe=RFC3986_SUBDELIMS + '/~:@')
+        )).replace(USERNAME_SLOT, escape(user.username))
+    return mark_safe(html)
+
+
+@register.simple_tag
+def footer():
+    return footer_html(current_year())
@@ -6,3 +6,13 @@ register = template.Library()
 @register.filter
 def addclass(field, css):
     return field.as_widget(attrs={'class': css})
+
+
+@register.simple_tag
+def url_replace(request, field, value):
+    """Query string текущего запроса с заменённым параметром."""
+    query = request.GET.copy()
+    query.pop('page', None)
+    query.pop('cursor', None)
+    query[field] = value
+    return query.urlencode()
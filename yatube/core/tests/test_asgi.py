@@ -0,0 +1,174 @@
+import asyncio
+import re
+from concurrent.futures import Executor, Future
+from urllib.parse import unquote
+
+from django.contrib.auth import get_user_model
+from django.core.wsgi import get_wsgi_application
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.asgi import ASGIHandler
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class InlineExecutor(Executor):
+    """Выполняет задачу сразу: тест видит свою транзакцию."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def submit(self, function, *args, **kwargs):
+        self.calls += 1
+        future = Future()
+        future.set_result(function(*args, **kwargs))
+        return future
+
+
+class ASGIHandlerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='автор')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Пост через ASGI'
+        )
+
+    def setUp(self):
+        self.handler = ASGIHandler(get_wsgi_application())
+        self.handler.read_pool = InlineExecutor()
+        self.handler.pool = InlineExecutor()
+
+    def messages(self, method, path, query=b'', body=b'', headers=()):
+        scope = {
+            'type': 'http',
+            'http_version': '1.1',
+            'method': method,
+            'path': unquote(path),
+            'query_string': query,
+            'headers': [
+                (b'host', b'localhost'),
+                (b'content-length', str(len(body)).encode()),
+                *headers,
+            ],
+        }
+        chunks = [body[:3], body[3:]]
+        messages = []
+
+        async def receive():
+            chunk = chunks.pop(0)
+            return {
+                'type': 'http.request', 'body': chunk, 'more_body': chunks,
+            }
+
+        async def send(message):
+            messages.append(message)
+
+        asyncio.run(self.handler(scope, receive, send))
+        return messages
+
+    def request(self, *args, **kwargs):
+        start, body = self.messages(*args, **kwargs)
+        return start['status'], dict(start['headers']), body['body']
+
+    def test_read_views_use_read_pool(self):
+        """Ленты и страница поста отдаются через пул чтения."""
+        paths = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[self.group.slug]),
+            reverse('posts:profile', args=[self.user.username]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        )
+        for path in paths:
+            with self.subTest(path=path):
+                status, headers, body = self.request('GET', path)
+                self.assertEqual(status, 200)
+                self.assertIn('Пост через ASGI', body.decode())
+                self.assertIn(b'etag', headers)
+        self.assertEqual(self.handler.read_pool.calls, len(paths))
+        self.assertEqual(self.handler.pool.calls, 0)
+
+    def test_query_string_and_other_views(self):
+        """Строка запроса доходит до Django, прочее идёт в общий пул."""
+        status, _, body = self.request(
+            'GET', reverse('posts:search'), query=b'q=ASGI'
+        )
+        self.assertEqual(status, 200)
+        self.assertIn('Пост через ASGI', body.decode())
+        status, _, _ = self.request('GET', reverse('posts:create_post'))
+        self.assertEqual(status, 302)
+        self.assertEqual(self.handler.pool.calls, 2)
+        self.assertEqual(self.handler.read_pool.calls, 0)
+
+    def test_post_body_reaches_django(self):
+        """Тело запроса из нескольких сообщений собирается целиком."""
+        self.client.force_login(self.user)
+        session = f'sessionid={self.client.cookies["sessionid"].value}'
+        _, headers, body = self.request(
+            'GET',
+            reverse('posts:create_post'),
+            headers=[(b'cookie', session.encode())],
+        )
+        csrf_cookie = headers[b'set-cookie'].decode().split(';')[0].strip()
+        token = re.search(
+            r'name="csrfmiddlewaretoken" value="([^"]+)"', body.decode()
+        ).group(1)
+        status, _, _ = self.request(
+            'POST',
+            reverse('posts:create_post'),
+            body=f'text=Новый+пост&csrfmiddlewaretoken={token}'.encode(),
+            headers=[
+                (b'content-type', b'application/x-www-form-urlencoded'),
+                (b'cookie', f'{session}; {csrf_cookie}'.encode()),
+            ],
+        )
+        self.assertEqual(status, 302)
+        self.assertTrue(Post.objects.filter(text='Новый пост').exists())
+
+    def test_repeated_cookie_headers(self):
+        """Несколько заголовков Cookie — как одна строка через '; '."""
+        self.client.force_login(self.user)
+        session = f'sessionid={self.client.cookies["sessionid"].value}'
+        status, _, _ = self.request(
+            'GET',
+            reverse('posts:create_post'),
+            headers=[
+                (b'cookie', b'theme=dark'),
+                (b'cookie', session.encode()),
+            ],
+        )
+        self.assertEqual(status, 200)
+
+    @override_settings(POSTS_STREAMING_RENDER=True)
+    def test_streaming_response_sent_in_parts(self):
+        """Шапка потоковой ленты уходит отдельным сообщением."""
+        start, *parts = self.messages('GET', reverse('posts:index'))
+        self.assertEqual(start['status'], 200)
+        self.assertTrue(all(part['more_body'] for part in parts[:-1]))
+        self.assertFalse(parts[-1].get('more_body', False))
+        self.assertIn('<header', parts[0]['body'].decode())
+        self.assertNotIn('Пост через ASGI', parts[0]['body'].decode())
+        body = b''.join(part['body'] for part in parts).decode()
+        self.assertIn('Пост через ASGI', body)
+
+    def test_lifespan(self):
+        messages = [
+            {'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        asyncio.run(self.handler({'type': 'lifespan'}, receive, send))
+        self.assertEqual(
+            sent,
+            ['lifespan.startup.complete', 'lifespan.shutdown.complete'],
+        )
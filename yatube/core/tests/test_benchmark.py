@@ -0,0 +1,57 @@
+from django.test import TestCase, override_settings
+
+from core.benchmark import (SCENARIOS, percentile, run_benchmark,
+                            run_page_size_benchmark, seed)
+from posts.models import Group, Post, User
+
+
+@override_settings(
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']
+)
+class BenchmarkTests(TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_seed_and_run(self):
+        """Засев даёт заданные объёмы, все сценарии отвечают без ошибок."""
+        seed(users=3, groups=2, posts=30)
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Group.objects.count(), 2)
+        self.assertEqual(Post.objects.count(), 30)
+        results = run_benchmark(requests=2, warmup=0)
+        self.assertEqual(tuple(results), SCENARIOS)
+        for name, result in results.items():
+            with self.subTest(name=name):
+                self.assertEqual(result['requests'], 2)
+                self.assertLessEqual(set(result['statuses']), {'200', '302'})
+                self.assertLessEqual(
+                    result['p50_ms'], result['p99_ms']
+                )
+        self.assertGreater(results['index']['queries_per_request'], 0)
+
+    def test_page_size_benchmark(self):
+        """Чем больше страница, тем меньше запросов на те же посты."""
+        seed(users=2, groups=1, posts=30)
+        results = run_page_size_benchmark(sizes=(5, 10), total=20, repeat=1)
+        for view_name, sizes in results.items():
+            with self.subTest(view_name=view_name):
+                self.assertEqual(sizes['5']['requests'], 4)
+                self.assertEqual(sizes['10']['requests'], 2)
+                self.assertEqual(sizes['10']['posts_per_request'], 10)
+
+    def test_seed_is_reproducible(self):
+        seed(users=2, groups=1, posts=5, random_seed=7)
+        first = list(Post.objects.order_by('pk').values_list(
+            'text', 'author__username'
+        ))
+        Post.objects.all().delete()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        seed(users=2, groups=1, posts=5, random_seed=7)
+        second = list(Post.objects.order_by('pk').values_list(
+            'text', 'author__username'
+        ))
+        self.assertEqual(first, second)
@@ -0,0 +1,141 @@
+import gzip
+import zlib
+from unittest import mock
+
+import brotli
+from django.core.cache import caches
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import (RequestFactory, SimpleTestCase, TestCase,
+                         override_settings)
+from django.urls import reverse
+
+from core import compression
+from core.compression import accepted_encoding, compress_response
+from posts.models import Post, User
+
+TEXT = 'Длинный текст поста. ' * 100
+
+
+class AcceptedEncodingTests(SimpleTestCase):
+    def test_choice(self):
+        cases = {
+            '': None,
+            'gzip': 'gzip',
+            'gzip, deflate, br': 'br',
+            'br;q=0.5, gzip': 'gzip',
+            'gzip;q=0, br;q=0': None,
+            '*': 'br',
+            'br;q=0, *': 'gzip',
+            'identity': None,
+            'gzip;q=oops, br': 'br',
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(accepted_encoding(header), expected)
+
+    def test_gzip_without_brotli(self):
+        with mock.patch.object(compression, 'brotli', None):
+            self.assertEqual(accepted_encoding('br, gzip'), 'gzip')
+            self.assertIsNone(accepted_encoding('br'))
+
+
+class CompressResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def compress(self, response, encoding='gzip, br'):
+        return compress_response(
+            self.factory.get('/', HTTP_ACCEPT_ENCODING=encoding), response
+        )
+
+    def test_encodings(self):
+        decoders = {'gzip': gzip.decompress, 'br': brotli.decompress}
+        for encoding, decode in decoders.items():
+            with self.subTest(encoding=encoding):
+                response = HttpResponse(TEXT)
+                response['ETag'] = '"etag"'
+                response = self.compress(response, encoding)
+                self.assertEqual(response['Content-Encoding'], encoding)
+                self.assertEqual(decode(response.content).decode(), TEXT)
+                self.assertEqual(
+                    response['Content-Length'], str(len(response.content))
+                )
+                self.assertEqual(response['ETag'], 'W/"etag"')
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    @override_settings(COMPRESSION_MIN_SIZE=10000)
+    def test_threshold(self):
+        """Короткий ответ не сжимается и не зависит от Accept-Encoding."""
+        response = self.compress(HttpResponse(TEXT))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertFalse(response.has_header('Vary'))
+        self.assertEqual(response.content.decode(), TEXT)
+
+    def test_skips_binary_and_encoded(self):
+        image = HttpResponse(b'x' * 2000, content_type='image/png')
+        encoded = HttpResponse(TEXT)
+        encoded['Content-Encoding'] = 'identity'
+        for response in (image, encoded):
+            with self.subTest(response=response):
+                content = response.content
+                response = self.compress(response)
+                self.assertEqual(response.content, content)
+                self.assertFalse(response.has_header('Vary'))
+
+    def test_not_accepted(self):
+        response = self.compress(HttpResponse(TEXT), encoding='')
+        self.assertEqual(response.content.decode(), TEXT)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+
+    def test_precompressed_used(self):
+        response = HttpResponse(TEXT)
+        compression.precompress(response)
+        self.assertEqual(set(response.precompressed), {'br', 'gzip'})
+        with mock.patch.object(compression, 'compress') as compress:
+            response = self.compress(response, 'br')
+        compress.assert_not_called()
+        self.assertEqual(brotli.decompress(response.content).decode(), TEXT)
+
+    def test_streaming(self):
+        """Каждая часть потока сжимается и уходит без ожидания следующей."""
+        def chunks():
+            yield 'Шапка'
+            yield TEXT
+
+        response = self.compress(StreamingHttpResponse(chunks()), 'gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        parts = iter(response.streaming_content)
+        head = next(parts)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.assertEqual(decompressor.decompress(head).decode(), 'Шапка')
+        rest = decompressor.decompress(b''.join(parts)) + decompressor.flush()
+        self.assertEqual(rest.decode(), TEXT)
+
+
+@override_settings(POSTS_PAGE_CACHE=True)
+class CompressionMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(username='Автор')
+        Post.objects.create(author=author, text=TEXT)
+
+    def setUp(self):
+        caches['pages'].clear()
+
+    def test_page_compressed(self):
+        response = self.client.get(
+            reverse('posts:index'), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(TEXT, gzip.decompress(response.content).decode())
+
+    def test_cached_page_not_compressed_again(self):
+        """Попадание в кэш страниц отдаёт заранее сжатую копию."""
+        url = reverse('posts:index')
+        first = self.client.get(url, HTTP_ACCEPT_ENCODING='br')
+        with mock.patch.object(compression, 'compress') as compress:
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING='br')
+            plain = self.client.get(url)
+        compress.assert_not_called()
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(brotli.decompress(second.content), plain.content)
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.metrics import Histogram, format_prometheus, registry
+from posts.models import Post
+
+User = get_user_model()
+
+
+class HistogramTests(TestCase):
+    def test_percentiles(self):
+        """Перцентиль — верхняя граница корзины, не больше максимума."""
+        histogram = Histogram((1, 2, 5, 10))
+        for value in (1, 1, 1, 2, 2, 3, 4, 4, 9, 40):
+            histogram.observe(value)
+        self.assertEqual(histogram.count, 10)
+        self.assertEqual(histogram.sum, 67)
+        self.assertEqual(histogram.percentile(0.3), 1)
+        self.assertEqual(histogram.percentile(0.5), 2)
+        self.assertEqual(histogram.percentile(0.8), 5)
+        self.assertEqual(histogram.percentile(0.99), 40)
+        self.assertEqual(Histogram((1,)).percentile(0.5), 0)
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.user, text='Тестовый пост')
+        cls.admin = User.objects.create_user(
+            username='admin', is_staff=True
+        )
+
+    def setUp(self):
+        registry.clear()
+        self.client = Client()
+
+    def test_request_is_recorded(self):
+        """Запрос к ленте попадает в гистограммы своего представления."""
+        self.client.get(reverse('posts:index'))
+        metrics = registry.snapshot()['posts:index']
+        self.assertEqual(metrics['queries']['count'], 1)
+        self.assertGreater(metrics['queries']['sum'], 0)
+        self.assertGreater(metrics['db_seconds']['sum'], 0)
+        self.assertGreater(metrics['template_seconds']['sum'], 0)
+        self.assertGreaterEqual(
+            metrics['total_seconds']['sum'],
+            metrics['template_seconds']['sum'],
+        )
+
+    @override_settings(REQUEST_METRICS_QUERY_BUDGETS={'posts:index': 0})
+    def test_query_budget_warning(self):
+        """Превышение бюджета запросов пишется в лог предупреждением."""
+        with self.assertLogs('core.middleware', 'WARNING') as logs:
+            self.client.get(reverse('posts:index'))
+        self.assertIn('posts:index', logs.output[0])
+
+    def test_endpoints_are_admin_only(self):
+        """Метрики видит только персонал."""
+        for name in ('core:metrics', 'core:metrics_prometheus'):
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 302)
+                self.assertIn(reverse('admin:login'), response.url)
+
+    def test_endpoints_show_percentiles(self):
+        """Страница и выгрузка Prometheus показывают перцентили."""
+        self.client.get(reverse('posts:index'))
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('core:metrics'))
+        self.assertContains(response, 'posts:index')
+        response = self.client.get(reverse('core:metrics_prometheus'))
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertContains(response, '# TYPE yatube_request_queries summary')
+        self.assertContains(
+            response,
+            'yatube_request_queries_count{view="posts:index"} 1',
+        )
+
+    def test_prometheus_escapes_labels(self):
+        registry.record('a"b', {'queries': 1})
+        self.assertIn('view="a\\"b"', format_prometheus(registry.snapshot()))
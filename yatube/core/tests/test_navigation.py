@@ -0,0 +1,59 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from core.context_processors.year import year
+from core.templatetags.navigation import footer_html, header_html
+
+User = get_user_model()
+
+
+class NavigationTests(TestCase):
+    def setUp(self):
+        header_html.cache_clear()
+        footer_html.cache_clear()
+
+    def test_active_link(self):
+        response = self.client.get(reverse('about:author'))
+        self.assertContains(
+            response,
+            f'<a class="nav-link active" href="{reverse("about:author")}">',
+        )
+        self.assertContains(
+            response,
+            f'<a class="nav-link " href="{reverse("about:tech")}">',
+        )
+        self.assertContains(response, reverse('users:login'))
+
+    def test_user_in_cached_header(self):
+        """Пользователь подставляется в общую шапку так же, как reverse."""
+        for username in ('first', 'вася.пупкин+1@почта'):
+            with self.subTest(username=username):
+                self.client.force_login(User.objects.create_user(username))
+                response = self.client.get(reverse('about:tech'))
+                self.assertContains(
+                    response,
+                    f'href="{reverse("posts:profile", args=[username])}">'
+                    f'Пользователь: {username}</a>',
+                )
+                self.assertNotContains(response, 'navigation-')
+
+    def test_header_rendered_once_per_view(self):
+        for _ in range(3):
+            self.client.get(reverse('about:author'))
+        self.client.get(reverse('about:tech'))
+        info = header_html.cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(footer_html.cache_info().misses, 1)
+
+    def test_year_computed_lazily(self):
+        request = RequestFactory().get('/')
+        with mock.patch(
+            'core.context_processors.year.current_year', return_value=2030
+        ) as current_year:
+            context = year(request)
+            current_year.assert_not_called()
+            self.assertEqual(str(context['year']), '2030')
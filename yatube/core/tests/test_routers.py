@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.db import connections
+from django.test import (Client, RequestFactory, TransactionTestCase,
+                         override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.routers import PIN_COOKIE, ReplicaRouter, replica_reads, replicate
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='auth')
+        self.post = Post.objects.create(author=self.user, text='Пост')
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def queries(self, path, client=None):
+        """Число запросов к основной базе и к реплике."""
+        client = client or self.client
+        with CaptureQueriesContext(connections['default']) as primary:
+            with CaptureQueriesContext(connections['replica']) as replica:
+                response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(replica)
+
+    def test_router(self):
+        """Реплика — только внутри replica_reads и без закрепления."""
+        router = ReplicaRouter()
+        view = replica_reads(lambda request: router.db_for_read(Post))
+        factory = RequestFactory()
+        self.assertEqual(router.db_for_read(Post), 'default')
+        self.assertEqual(view(factory.get('/')), 'replica')
+        self.assertEqual(view(factory.post('/')), 'default')
+        pinned = factory.get('/')
+        pinned.COOKIES[PIN_COOKIE] = '1'
+        self.assertEqual(view(pinned), 'default')
+        self.assertEqual(router.db_for_write(Post), 'default')
+        self.assertTrue(router.allow_migrate('default', 'posts'))
+        self.assertFalse(router.allow_migrate('replica', 'posts'))
+
+    def test_read_views_use_replica(self):
+        """Ленты и страница поста читают с реплики, сессия — с основной."""
+        paths = (
+            reverse('posts:index'),
+            reverse('posts:profile', args=[self.user.username]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+            reverse('posts:search') + '?q=Пост',
+        )
+        for path in paths:
+            with self.subTest(path=path):
+                primary, replica = self.queries(path)
+                self.assertGreater(replica, 0)
+        self.assertEqual(
+            ReplicaRouter().db_for_read(Session), 'default'
+        )
+
+    def test_write_pins_client_to_primary(self):
+        """После создания поста редирект на профиль читается с основной."""
+        response = self.client.post(
+            reverse('posts:create_post'), {'text': 'Новый пост'}
+        )
+        self.assertIn(PIN_COOKIE, response.cookies)
+        primary, replica = self.queries(response.url)
+        self.assertEqual(replica, 0)
+        self.assertGreater(primary, 0)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas(self):
+        primary, replica = self.queries(reverse('posts:index'))
+        self.assertEqual(replica, 0)
+        response = self.client.post(
+            reverse('posts:create_post'), {'text': 'Новый пост'}
+        )
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_replicate(self):
+        """Копия основной базы содержит её данные."""
+        directory = tempfile.mkdtemp()
+        target = os.path.join(directory, 'replica.sqlite3')
+        try:
+            replicate(target)
+            with sqlite3.connect(target) as copy:
+                (count,) = copy.execute(
+                    'SELECT COUNT(*) FROM posts_post'
+                ).fetchone()
+            self.assertEqual(count, 1)
+        finally:
+            os.remove(target)
+            os.rmdir(directory)
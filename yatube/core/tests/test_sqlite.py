@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+@override_settings(SQLITE_PRAGMAS=settings.SQLITE_PROFILES['production'])
+class SQLitePragmasTests(SimpleTestCase):
+    def test_new_connection_is_tuned(self):
+        """Новое подключение к файлу получает WAL и остальные PRAGMA."""
+        directory = tempfile.mkdtemp()
+        wrapper = DatabaseWrapper(
+            {
+                **connection.settings_dict,
+                'NAME': os.path.join(directory, 'tuned.sqlite3'),
+            },
+            alias='tuned',
+        )
+        try:
+            wrapper.ensure_connection()
+            pragmas = {
+                name: wrapper.connection.execute(
+                    f'PRAGMA {name}'
+                ).fetchone()[0]
+                for name in (
+                    'journal_mode', 'synchronous', 'busy_timeout',
+                    'cache_size', 'mmap_size', 'temp_store',
+                )
+            }
+        finally:
+            wrapper.close()
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+        self.assertEqual(pragmas, {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'cache_size': -64000,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 2,
+        })
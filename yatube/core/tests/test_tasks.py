@@ -0,0 +1,207 @@
+import os
+import signal
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Task
+from core.management.commands import run_workers
+from core.tasks import claim, enqueue, run_pending, task
+from posts.models import Post, User
+
+calls = []
+
+
+@task(name='tests.remember')
+def remember(value):
+    calls.append(value)
+
+
+@task(name='tests.broken', max_attempts=2)
+def broken():
+    raise RuntimeError('сломалось')
+
+
+@override_settings(TASKS_QUEUE=True)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_task_runs_in_worker(self):
+        """Задача не выполняется при постановке, а ждёт воркера."""
+        enqueue(remember, 'значение')
+        self.assertEqual(calls, [])
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, ['значение'])
+        self.assertEqual(Task.objects.get().status, Task.DONE)
+        self.assertEqual(run_pending(), 0)
+
+    def test_enqueue_rolls_back_with_transaction(self):
+        try:
+            with transaction.atomic():
+                enqueue(remember, 1)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertFalse(Task.objects.exists())
+
+    def test_idempotency_key(self):
+        """Задача с тем же ключом не ставится второй раз."""
+        self.assertIsNotNone(enqueue(remember, 1, key='один раз'))
+        self.assertIsNone(enqueue(remember, 2, key='один раз'))
+        run_pending()
+        self.assertIsNone(enqueue(remember, 3, key='один раз'))
+        run_pending()
+        self.assertEqual(calls, [1])
+
+    @override_settings(TASKS_RETRY_DELAY=10)
+    def test_retry_with_backoff(self):
+        """Упавшая задача откладывается, после всех попыток — провалена."""
+        enqueue(broken)
+        started = timezone.now()
+        with self.assertLogs('core.tasks', 'WARNING'):
+            run_pending()
+        failed = Task.objects.get()
+        self.assertEqual(failed.status, Task.PENDING)
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn('сломалось', failed.error)
+        self.assertGreaterEqual(
+            failed.run_at, started + timedelta(seconds=5)
+        )
+        self.assertEqual(run_pending(), 0)
+
+        Task.objects.update(run_at=timezone.now())
+        with self.assertLogs('core.tasks', 'ERROR'):
+            run_pending()
+        failed.refresh_from_db()
+        self.assertEqual(failed.status, Task.FAILED)
+        self.assertEqual(failed.attempts, 2)
+
+    def test_task_of_dead_worker_reclaimed(self):
+        enqueue(remember, 1)
+        self.assertIsNotNone(claim())
+        self.assertIsNone(claim())
+        Task.objects.update(locked_until=timezone.now() - timedelta(1))
+        self.assertIsNotNone(claim())
+
+    def test_run_workers_burst(self):
+        enqueue(remember, 1)
+        enqueue(remember, 2)
+        output = StringIO()
+        call_command('run_workers', processes=1, burst=True, stdout=output)
+        self.assertEqual(sorted(calls), [1, 2])
+        self.assertIn('задач 2', output.getvalue())
+
+
+class FakeProcess:
+    """Процесс-воркер без процесса: родитель получает SIGTERM в join."""
+
+    started = []
+
+    def __init__(self, target, args, name):
+        self.target = target
+        self.alive = False
+        self.terminated = False
+        self.started.append(self)
+
+    def start(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def terminate(self):
+        self.terminated = True
+        self.alive = False
+
+    def join(self):
+        if self.alive:
+            os.kill(os.getpid(), signal.SIGTERM)
+
+
+class RunWorkersSignalTests(SimpleTestCase):
+    def test_sigterm_forwarded_to_workers(self):
+        """SIGTERM родителю передаётся воркерам, родитель их дожидается."""
+        FakeProcess.started = []
+        handler = signal.getsignal(signal.SIGTERM)
+        with mock.patch.object(
+            run_workers.multiprocessing, 'Process', FakeProcess
+        ):
+            call_command('run_workers', processes=2, stdout=StringIO())
+        workers = FakeProcess.started
+        self.assertEqual(len(workers), 2)
+        self.assertTrue(all(worker.terminated for worker in workers))
+        self.assertTrue(all(
+            worker.target is run_workers.run_worker for worker in workers
+        ))
+        self.assertIs(signal.getsignal(signal.SIGTERM), handler)
+
+
+@override_settings(TASKS_QUEUE=True)
+class PostTasksTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username='Писатель', email='writer@example.com'
+        )
+
+    @mock.patch(
+        'posts.signals.transaction.on_commit', lambda callback: callback()
+    )
+    def test_post_side_effects_queued(self):
+        """Индексация и письмо — задачами в транзакции поста."""
+        client = self.client
+        client.force_login(self.author)
+        client.post(reverse('posts:create_post'), {'text': 'Черепаха'})
+        post = Post.objects.get()
+        self.assertEqual(
+            set(Task.objects.values_list('name', flat=True)),
+            {'posts.tasks.reindex_post', 'posts.tasks.notify_author'},
+        )
+        self.assertTrue(Task.objects.filter(
+            key=f'notify_author:{post.pk}'
+        ).exists())
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertNotContains(
+            client.get(reverse('posts:search'), {'q': 'черепаха'}),
+            'Черепаха',
+        )
+
+        run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['writer@example.com'])
+        self.assertIn(
+            reverse('posts:post_detail', args=[post.pk]),
+            mail.outbox[0].body,
+        )
+        self.assertContains(
+            client.get(reverse('posts:search'), {'q': 'черепаха'}),
+            'Черепаха',
+        )
+
+    def test_failed_post_save_leaves_no_tasks(self):
+        """Ошибка после записи поста откатывает и пост, и его задачи."""
+        self.client.force_login(self.author)
+        create = Task.objects.create
+        created = []
+
+        def create_once(**kwargs):
+            if created:
+                raise RuntimeError('сбой')
+            created.append(create(**kwargs))
+            return created[-1]
+
+        with mock.patch.object(Task.objects, 'create', create_once):
+            with self.assertRaises(RuntimeError):
+                self.client.post(
+                    reverse('posts:create_post'), {'text': 'Черепаха'}
+                )
+        self.assertEqual(len(created), 1)
+        self.assertFalse(Post.objects.exists())
+        self.assertFalse(Task.objects.exists())
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    path('', views.metrics, name='metrics'),
+    path('prometheus/', views.metrics_prometheus, name='metrics_prometheus'),
+]
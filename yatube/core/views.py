@@ -0,0 +1,37 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+from django.shortcuts import render
+
+from .metrics import (METRICS, QUANTILES, collect, format_prometheus,
+                      registry)
+
+
+@staff_member_required
+def metrics(request):
+    """Перцентили метрик по представлениям этого процесса."""
+    rows = []
+    for view_name, view_metrics in registry.snapshot().items():
+        for metric, (description, _) in METRICS.items():
+            data = view_metrics[metric]
+            rows.append({
+                'view_name': view_name,
+                'description': description,
+                'count': data['count'],
+                'quantiles': [
+                    data['quantiles'][quantile] for quantile in QUANTILES
+                ],
+                'max': data['max'],
+            })
+    return render(request, 'core/metrics.html', {
+        'quantiles': QUANTILES,
+        'rows': rows,
+        'collected': collect(),
+    })
+
+
+@staff_member_required
+def metrics_prometheus(request):
+    return HttpResponse(
+        format_prometheus(registry.snapshot(), collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -1,6 +1,104 @@
+from django import forms
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Max
+from django.utils.functional import cached_property
 
 from .models import Group, Post
+from .search import filter_matching, fts_enabled, search_terms
+
+ADMIN_COUNT_LIMIT = getattr(settings, 'POSTS_ADMIN_COUNT_LIMIT', 100000)
+
+
+def estimated_count(model):
+    """Оценка числа строк без COUNT(*): из статистики или по max(id)."""
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s', [table]
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else None
+    return model.objects.aggregate(last=Max('pk'))['last']
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор админки, который не считает большие таблицы целиком.
+
+    Без фильтров число строк оценивается, с фильтрами — считается,
+    но не дальше ADMIN_COUNT_LIMIT.
+    """
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_count(queryset.model)
+            if estimate is not None and estimate > ADMIN_COUNT_LIMIT:
+                self.estimated = True
+                return estimate
+        return queryset[:ADMIN_COUNT_LIMIT].count()
+
+    def page(self, number):
+        """Страница; неполная страница поправляет завышенную оценку.
+
+        После удалений max(id) больше числа строк. По короткой странице
+        точное число известно сразу; за концом таблицы строки считаются
+        и отдаётся последняя настоящая страница.
+        """
+        page = super().page(number)
+        if not self.estimated or len(page) == self.per_page:
+            return page
+        self.estimated = False
+        self.__dict__.pop('num_pages', None)
+        if len(page):
+            self.count = (page.number - 1) * self.per_page + len(page)
+            return page
+        self.count = self.object_list.count()
+        return super().page(min(page.number, self.num_pages))
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """Автодополнение без запроса на каждую строку списка.
+
+    Выбранный объект берётся из уже загруженной строки.
+    """
+
+    preloaded = None
+
+    def optgroups(self, name, value, attr=None):
+        if self.preloaded is None:
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        selected = {str(item) for item in value}
+        for obj in self.preloaded:
+            if str(obj.pk) in selected:
+                options.append(self.create_option(
+                    name,
+                    obj.pk,
+                    self.choices.field.label_from_instance(obj),
+                    True,
+                    len(options),
+                ))
+        return [(None, options, 0)]
+
+
+class PostChangeListForm(forms.ModelForm):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        widget = self.fields['group'].widget
+        widget = getattr(widget, 'widget', widget)
+        if isinstance(widget, PreloadedAutocompleteSelect):
+            group = self.instance.group if self.instance.group_id else None
+            widget.preloaded = [group] if group else []
 
 
 @admin.register(Post)
@@ -13,9 +111,39 @@ class PostAdmin(admin.ModelAdmin):
         'group'
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('group',)
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    date_hierarchy = 'pub_date'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     empty_value_display = '-пусто-'
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'group':
+            kwargs['widget'] = PreloadedAutocompleteSelect(
+                db_field.remote_field,
+                self.admin_site,
+                using=kwargs.get('using'),
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_form(self, request, **kwargs):
+        kwargs.setdefault('form', PostChangeListForm)
+        return super().get_changelist_form(request, **kwargs)
+
+    def get_search_results(self, request, queryset, search_term):
+        """Ищет по полнотекстовому индексу вместо LIKE '%…%'."""
+        if not fts_enabled() or not search_terms(search_term):
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        return filter_matching(queryset, search_term), False
+
 
-admin.site.register(Group)
+@admin.register(Group)
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug', 'posts_count')
+    search_fields = ('title', 'slug')
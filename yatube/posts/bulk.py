@@ -0,0 +1,63 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Max
+
+from .counters import change_author_count, change_group_count
+from .feed_cache import feeds_reset
+from .models import Post
+from .page_cache import purge_post_pages
+from .search import index_posts_after
+from .syndication import reset_feeds
+from .timeline import reset_timeline
+
+
+def bulk_create_posts(posts, batch_size=None, keep_pub_date=False):
+    """Вставляет посты пачкой одной транзакцией.
+
+    bulk_create не шлёт сигналы, поэтому счётчики, поисковый индекс,
+    кэш страниц, ленты и списки постов групп и авторов обновляются
+    здесь — один раз на пачку. Постам проставляются id. keep_pub_date
+    оставляет pub_date из данных, а не время вставки.
+    """
+    posts = list(posts)
+    if not posts:
+        return posts
+    pub_dates = [post.pub_date for post in posts]
+    with transaction.atomic():
+        last_pk = Post.objects.aggregate(last=Max('pk'))['last'] or 0
+        Post.objects.bulk_create(posts, batch_size=batch_size)
+        if posts[0].pk is None:
+            # SQLite в Django 2.2 не возвращает id из bulk_create. Пока
+            # транзакция держит запись, последние id в таблице — наши
+            pks = list(Post.objects.order_by('-pk').values_list(
+                'pk', flat=True
+            )[:len(posts)])
+            for post, pk in zip(posts, reversed(pks)):
+                post.pk = pk
+        if keep_pub_date:
+            # auto_now_add при вставке записал текущее время; поле модели
+            # не трогаем — другим потокам оно нужно как есть
+            for post, pub_date in zip(posts, pub_dates):
+                post.pub_date = pub_date
+            Post.objects.bulk_update(
+                posts, ['pub_date'], batch_size=batch_size
+            )
+        authors = Counter(post.author_id for post in posts)
+        groups = Counter(
+            post.group_id for post in posts if post.group_id is not None
+        )
+        for author_id, total in authors.items():
+            change_author_count(author_id, total)
+        for group_id, total in groups.items():
+            change_group_count(group_id, total)
+        index_posts_after(last_pk)
+        transaction.on_commit(
+            lambda: purge_post_pages(authors.keys(), groups.keys())
+        )
+        transaction.on_commit(reset_timeline)
+        transaction.on_commit(reset_feeds)
+        transaction.on_commit(
+            lambda: feeds_reset(authors.keys(), groups.keys())
+        )
+    return posts
@@ -0,0 +1,86 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = 'includes/post_card.html'
+CARD_CACHE_TIMEOUT = getattr(settings, 'POST_CARD_CACHE_TIMEOUT', 60 * 60)
+
+
+def version_key(kind, pk):
+    return f'post_card:version:{kind}:{pk}'
+
+
+def new_version():
+    """Уникальная версия: вытесненный ключ не вернёт старые карточки."""
+    return time.time_ns()
+
+
+def get_version(kind, pk):
+    """Текущая версия сущности; при первом обращении заводит новую."""
+    key = version_key(kind, pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(kind, pk):
+    """Меняет версию поста, автора или группы — карточки пересоберутся."""
+    key = version_key(kind, pk)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = new_version()
+        cache.set(key, version, None)
+        return version
+
+
+def get_versions(posts):
+    """Версии всех сущностей страницы одним запросом к кэшу."""
+    keys = set()
+    for post in posts:
+        keys.add(version_key('post', post.pk))
+        keys.add(version_key('author', post.author_id))
+        if post.group_id is not None:
+            keys.add(version_key('group', post.group_id))
+    versions = cache.get_many(keys)
+    for key in keys - versions.keys():
+        cache.add(key, new_version(), None)
+        versions[key] = cache.get(key)
+    return versions
+
+
+def card_key(post, variant, versions):
+    return ':'.join(str(part) for part in (
+        'post_card',
+        variant,
+        post.pk,
+        versions[version_key('post', post.pk)],
+        post.author_id,
+        versions[version_key('author', post.author_id)],
+        post.group_id,
+        versions.get(version_key('group', post.group_id)),
+    ))
+
+
+def render_cards(posts, group_link=True):
+    """Карточки постов страницы: готовый HTML из кэша, остальное рендерим."""
+    posts = list(posts)
+    variant = 'group_link' if group_link else 'plain'
+    versions = get_versions(posts)
+    keys = [card_key(post, variant, versions) for post in posts]
+    cards = cache.get_many(keys)
+    missing = {}
+    for key, post in zip(keys, posts):
+        if key not in cards:
+            missing[key] = render_to_string(
+                CARD_TEMPLATE, {'post': post, 'group_link': group_link}
+            )
+    if missing:
+        cache.set_many(missing, CARD_CACHE_TIMEOUT)
+        cards.update(missing)
+    return [mark_safe(cards[key]) for key in keys]
@@ -0,0 +1,97 @@
+import hashlib
+
+from django.conf import settings
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import quote_etag
+
+from core.streaming import render_streaming
+
+from .cards import get_versions
+
+
+def make_etag(*parts):
+    raw = '|'.join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def card_versions(posts):
+    """Версии карточек постов, их авторов и групп в постоянном порядке.
+
+    Меняются при переименовании автора или группы — у постов при этом
+    updated прежний.
+    """
+    return sorted(get_versions(posts).items())
+
+
+def page_etag(request, page_obj, *extra):
+    """ETag страницы ленты.
+
+    Строится по id и датам изменения постов страницы, версиям их
+    карточек и счётчикам, поэтому проверка стоит один запрос страницы
+    и один запрос к кэшу, без рендера. Last-Modified лента не отдаёт:
+    удаления и правки авторов и групп не двигают даты постов, и ответ
+    на If-Modified-Since был бы устаревшим.
+    """
+    posts = list(page_obj)
+    paginator = page_obj.paginator
+    if getattr(paginator, 'is_cursor', False):
+        position = (page_obj.previous_cursor, page_obj.next_cursor)
+    else:
+        position = (page_obj.number, paginator.count)
+    position += (paginator.per_page,)
+    return make_etag(
+        request.user.pk,
+        *position,
+        *extra,
+        *((post.pk, post.updated.isoformat()) for post in posts),
+        *card_versions(posts),
+    )
+
+
+def post_etag(request, post, *extra):
+    """ETag страницы поста; без Last-Modified по той же причине."""
+    return make_etag(
+        request.user.pk,
+        post.pk,
+        post.updated.isoformat(),
+        *extra,
+        *card_versions([post]),
+    )
+
+
+def render_conditional(request, template_name, context, etag):
+    """Отвечает 304 по If-None-Match до рендера шаблона."""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = render(request, template_name, context)
+        response['ETag'] = etag
+    return response
+
+
+def streaming_enabled(request):
+    return (
+        getattr(settings, 'POSTS_STREAMING_RENDER', False)
+        and not getattr(request, 'caching_page', False)
+    )
+
+
+def render_feed(request, template_name, context, make_page, *extra):
+    """Страница ленты; make_page строит page_obj.
+
+    В потоковом режиме страница строится лениво, при рендере блока
+    content, — уже после того, как клиент получил шапку. Валидаторы
+    требуют постов страницы, поэтому такой ответ без ETag и 304.
+    """
+    if streaming_enabled(request):
+        context['page_obj'] = SimpleLazyObject(make_page)
+        return render_streaming(request, template_name, context)
+    page_obj = make_page()
+    context['page_obj'] = page_obj
+    return render_conditional(
+        request,
+        template_name,
+        context,
+        page_etag(request, page_obj, *extra),
+    )
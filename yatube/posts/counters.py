@@ -0,0 +1,96 @@
+from django.db.models import Count, F
+
+from .models import AuthorStats, Group, Post
+
+
+def author_posts_count(author):
+    """Число постов автора из счётчика, без COUNT(*)."""
+    try:
+        return author.post_stats.posts_count
+    except AuthorStats.DoesNotExist:
+        return 0
+
+
+def change_author_count(author_id, delta):
+    if author_id is None or not delta:
+        return
+    stats = AuthorStats.objects.filter(author_id=author_id)
+    if delta < 0:
+        stats.filter(posts_count__gte=-delta).update(
+            posts_count=F('posts_count') + delta
+        )
+        return
+    if not stats.update(posts_count=F('posts_count') + delta):
+        AuthorStats.objects.get_or_create(author_id=author_id)
+        stats.update(posts_count=F('posts_count') + delta)
+
+
+def change_group_count(group_id, delta):
+    if group_id is None or not delta:
+        return
+    groups = Group.objects.filter(pk=group_id)
+    if delta < 0:
+        groups = groups.filter(posts_count__gte=-delta)
+    groups.update(posts_count=F('posts_count') + delta)
+
+
+def rebuild_counters(fix=True, batch_size=1000):
+    """Сверяет счётчики с базой и, если fix, исправляет расхождения.
+
+    Возвращает пару словарей {pk: (в счётчике, на самом деле)}
+    для авторов и групп.
+    """
+    real_authors = dict(
+        Post.objects.order_by()
+        .values_list('author_id')
+        .annotate(total=Count('pk'))
+    )
+    stored_authors = dict(
+        AuthorStats.objects.values_list('author_id', 'posts_count')
+    )
+    author_drift = {
+        author_id: (stored_authors.get(author_id), total)
+        for author_id, total in real_authors.items()
+        if stored_authors.get(author_id) != total
+    }
+    author_drift.update(
+        (author_id, (stored, 0))
+        for author_id, stored in stored_authors.items()
+        if stored and author_id not in real_authors
+    )
+
+    group_drift = {
+        group.pk: (group.posts_count, group.total)
+        for group in Group.objects.annotate(total=Count('posts')).only(
+            'pk', 'posts_count'
+        )
+        if group.posts_count != group.total
+    }
+
+    if fix:
+        AuthorStats.objects.bulk_create(
+            (
+                AuthorStats(author_id=author_id, posts_count=total)
+                for author_id, (stored, total) in author_drift.items()
+                if stored is None
+            ),
+            batch_size=batch_size,
+        )
+        AuthorStats.objects.bulk_update(
+            [
+                AuthorStats(author_id=author_id, posts_count=total)
+                for author_id, (stored, total) in author_drift.items()
+                if stored is not None
+            ],
+            ['posts_count'],
+            batch_size=batch_size,
+        )
+        Group.objects.bulk_update(
+            [
+                Group(pk=group_id, posts_count=total)
+                for group_id, (stored, total) in group_drift.items()
+            ],
+            ['posts_count'],
+            batch_size=batch_size,
+        )
+    return author_drift, group_drift
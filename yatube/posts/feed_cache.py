@@ -0,0 +1,227 @@
+import bisect
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .cards import bump_version, get_version
+from .models import Post
+from .timeline import timeline_key
+
+# Оценка памяти на пост в списке: указатель, кортеж и два int
+ENTRY_BYTES = 136
+LIST_BYTES = 200
+
+FEED_FIELDS = {'group': 'group_id', 'author': 'author_id'}
+
+
+def feed_cache_enabled():
+    return getattr(settings, 'POSTS_FEED_CACHE', False)
+
+
+def feed_size():
+    return getattr(settings, 'POSTS_FEED_CACHE_SIZE', 1000)
+
+
+class FeedEntry:
+    """Ключи самых новых постов ленты и общее число её постов."""
+
+    def __init__(self, keys, count, version):
+        self.keys = keys
+        self.count = count
+        self.version = version
+
+    @property
+    def size(self):
+        return LIST_BYTES + ENTRY_BYTES * len(self.keys)
+
+
+class LRUCache:
+    """Кэш в памяти процесса с общим бюджетом байт и вытеснением LRU."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def max_bytes(self):
+        return getattr(settings, 'POSTS_FEED_CACHE_BYTES', 8 * 1024 * 1024)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def peek(self, key):
+        """Запись без учёта в статистике и порядке LRU."""
+        return self.entries.get(key)
+
+    def set(self, key, entry):
+        with self.lock:
+            self._discard(key)
+            if entry.size > self.max_bytes:
+                return
+            self.entries[key] = entry
+            self.bytes += entry.size
+            self._evict()
+
+    def replace_keys(self, key, entry, keys, count, version):
+        """Подменяет список целиком, а не правит его на месте.
+
+        Читатель, уже взявший старый список, не увидит его полуизменённым.
+        """
+        with self.lock:
+            if self.entries.get(key) is not entry:
+                return
+            self.bytes -= entry.size
+            entry.keys = keys
+            entry.count = count
+            entry.version = version
+            self.bytes += entry.size
+            if entry.size > self.max_bytes:
+                self._discard(key)
+            self._evict()
+
+    def discard(self, key):
+        with self.lock:
+            self._discard(key)
+
+    def _evict(self):
+        while self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.size
+            self.evictions += 1
+
+    def _discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+feed_cache = LRUCache()
+
+
+def feed_version(kind, pk):
+    """Общая для процессов версия ленты: чужая запись — пересборка."""
+    return get_version(f'{kind}_feed', pk)
+
+
+def build_entry(kind, pk, version):
+    """Окно из feed_size() новых постов; COUNT — только если оно полное."""
+    posts = Post.objects.db_manager(DEFAULT_DB_ALIAS).filter(
+        **{FEED_FIELDS[kind]: pk}
+    )
+    rows = posts.order_by('-pub_date', '-pk').values_list(
+        'pub_date', 'pk'
+    )[:feed_size()]
+    keys = [timeline_key(pub_date, post_pk) for pub_date, post_pk in rows]
+    count = posts.count() if len(keys) == feed_size() else len(keys)
+    return FeedEntry(keys, count, version)
+
+
+def feed_timeline(kind, pk):
+    """Упорядоченные ключи новых постов группы или автора.
+
+    Возвращает ленту в виде, который понимает TimelinePaginator,
+    или None, если кэш выключен. Страницы за окном идут в базу.
+    """
+    if not feed_cache_enabled():
+        return None
+    version = feed_version(kind, pk)
+    entry = feed_cache.get((kind, pk))
+    if entry is None or entry.version != version:
+        entry = build_entry(kind, pk, version)
+        feed_cache.set((kind, pk), entry)
+    return {'keys': entry.keys, 'count': entry.count}
+
+
+def change_feed(kind, pk, post, include, delta=0):
+    """Убирает пост из списка и, если include, вставляет на его место.
+
+    Правка и смена версии — после коммита: откаченная запись список
+    не трогает, а читатель до коммита не соберёт его под новой версией
+    без поста. Ключ считается сразу: к коммиту пост может измениться.
+    """
+    if pk is None or not feed_cache_enabled():
+        return
+    post_pk = post.pk
+    key = timeline_key(post.pub_date, post.pk) if include else None
+    transaction.on_commit(
+        lambda: update_feed(kind, pk, post_pk, key, delta)
+    )
+
+
+def update_feed(kind, pk, post_pk, key, delta):
+    """Правит список: убирает пост и, если есть key, вставляет его.
+
+    delta — на сколько меняется число постов ленты. Список правим
+    на месте, только если с нашей версии никто больше не писал; иначе
+    выбрасываем — соберётся при чтении. Пост за окном в него не
+    попадает, как и в ленте главной.
+    """
+    entry = feed_cache.peek((kind, pk))
+    version = bump_version(f'{kind}_feed', pk)
+    if entry is None:
+        return
+    if entry.version + 1 != version:
+        feed_cache.discard((kind, pk))
+        return
+    keys = [item for item in entry.keys if item[1] != -post_pk]
+    count = entry.count + delta
+    if key is not None:
+        if len(keys) == count - 1 or (keys and key < keys[-1]):
+            bisect.insort(keys, key)
+        del keys[feed_size():]
+    feed_cache.replace_keys((kind, pk), entry, keys, count, version)
+
+
+def feeds_saved(post, previous):
+    """Переносит пост между лентами групп и авторов после сохранения."""
+    for kind, field in FEED_FIELDS.items():
+        old_value = previous.get(field)
+        new_value = post.__dict__.get(field, old_value)
+        moved = old_value != new_value
+        if moved:
+            change_feed(kind, old_value, post, include=False, delta=-1)
+        change_feed(kind, new_value, post, include=True, delta=int(moved))
+
+
+def feeds_deleted(post):
+    for kind, field in FEED_FIELDS.items():
+        change_feed(
+            kind, post._counted.get(field), post, include=False, delta=-1
+        )
+
+
+def feeds_reset(author_ids, group_ids):
+    """Для массовых изменений мимо сигналов: списки пересоберутся."""
+    if not feed_cache_enabled():
+        return
+    for kind, ids in (('author', author_ids), ('group', group_ids)):
+        for pk in ids:
+            bump_version(f'{kind}_feed', pk)
+            feed_cache.discard((kind, pk))
@@ -1,13 +1,41 @@
 from django import forms
+from django.core.exceptions import ValidationError
+from PIL import Image
 
 from .models import Post
 
 
+class HeaderImageField(forms.ImageField):
+    """Картинка, проверенная только по заголовку.
+
+    Стандартное поле разбирает файл целиком. Здесь Pillow читает
+    лишь формат и размеры, а полностью картинку декодирует фоновая
+    нарезка превью — время запроса не зависит от размера файла.
+    """
+
+    def to_python(self, data):
+        upload = forms.FileField.to_python(self, data)
+        if upload is None:
+            return None
+        try:
+            image = Image.open(upload)
+        except Exception as error:
+            raise ValidationError(
+                self.error_messages['invalid_image'], code='invalid_image'
+            ) from error
+        upload.image = image
+        upload.content_type = Image.MIME.get(image.format)
+        upload.seek(0)
+        return upload
+
+
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
-        fields = ('text', 'group')
+        fields = ('text', 'group', 'image')
+        field_classes = {'image': HeaderImageField}
         help_texts = {
             'text': 'Текст нового поста',
             'group': 'Группа, к которой будет относиться пост',
+            'image': 'Картинка к посту',
         }
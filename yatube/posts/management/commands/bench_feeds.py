@@ -0,0 +1,165 @@
+import json
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from posts.counters import rebuild_counters
+from posts.models import Group, Post
+from posts.utils import POST_PER_PAGE, CursorPaginator
+
+User = get_user_model()
+
+FEED_INDEXES = ('post_feed_idx', 'post_group_feed_idx', 'post_author_feed_idx')
+
+
+class Command(BaseCommand):
+    help = (
+        'Засевает временную базу постами и сравнивает планы и время '
+        'первой, средней и последней страниц лент до и после индексов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--authors', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--output', help='Куда сохранить JSON с результатами.'
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0)
+        try:
+            self.seed(options)
+            report = {
+                'posts': options['posts'],
+                'authors': options['authors'],
+                'groups': options['groups'],
+                'results': {},
+            }
+            indexes = [
+                index for index in Post._meta.indexes
+                if index.name in FEED_INDEXES
+            ]
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.remove_index(Post, index)
+            report['results']['before'] = self.measure(options['repeat'])
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(Post, index)
+            report['results']['after'] = self.measure(options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.print_report(report)
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2)
+
+    def seed(self, options):
+        batch_size = options['batch_size']
+        User.objects.bulk_create(
+            (
+                User(username=f'bench-author-{number}')
+                for number in range(options['authors'])
+            ),
+            batch_size=batch_size,
+        )
+        Group.objects.bulk_create(
+            (
+                Group(
+                    title=f'Группа {number}',
+                    slug=f'bench-group-{number}',
+                    description='Группа для замеров',
+                )
+                for number in range(options['groups'])
+            ),
+            batch_size=batch_size,
+        )
+        authors = list(User.objects.values_list('pk', flat=True))
+        groups = list(Group.objects.values_list('pk', flat=True))
+        Post.objects.bulk_create(
+            (
+                Post(
+                    text=f'Пост для замеров номер {number}',
+                    author_id=authors[number % len(authors)],
+                    group_id=(
+                        groups[number % len(groups)] if number % 3 else None
+                    ),
+                )
+                for number in range(options['posts'])
+            ),
+            batch_size=batch_size,
+        )
+        rebuild_counters()
+
+    def feeds(self):
+        group = Group.objects.order_by('pk').first()
+        author = User.objects.order_by('pk').first()
+        return (
+            ('index', Post.objects.feed(), Post.objects.count()),
+            ('group_posts', group.posts.feed(), group.posts_count),
+            ('profile', author.posts.feed(), author.posts.count()),
+        )
+
+    def measure(self, repeat):
+        results = {}
+        for name, queryset, count in self.feeds():
+            last_page = max((count - 1) // POST_PER_PAGE, 0)
+            pages = (
+                ('first', 0),
+                ('middle', last_page // 2),
+                ('last', last_page),
+            )
+            for label, page in pages:
+                offset = page * POST_PER_PAGE
+                offset_page = queryset[offset:offset + POST_PER_PAGE]
+                results[f'{name}:{label}:offset'] = self.time_query(
+                    offset_page, repeat
+                )
+                cursor_page = self.cursor_queryset(queryset, offset)
+                results[f'{name}:{label}:cursor'] = self.time_query(
+                    cursor_page, repeat
+                )
+        return results
+
+    def cursor_queryset(self, queryset, offset):
+        """Запрос keyset-страницы, начинающейся с той же позиции."""
+        paginator = CursorPaginator(queryset, POST_PER_PAGE)
+        position = None
+        if offset:
+            anchor = paginator.queryset_after(None).values_list(
+                'pub_date', 'pk'
+            )[offset - 1]
+            position = tuple(anchor)
+        return paginator.queryset_after(position)[:POST_PER_PAGE]
+
+    def time_query(self, queryset, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        return {
+            'plan': queryset.explain(),
+            'median_ms': round(statistics.median(timings), 3),
+            'max_ms': round(max(timings), 3),
+        }
+
+    def print_report(self, report):
+        before = report['results']['before']
+        after = report['results']['after']
+        self.stdout.write(
+            f'{"feed:page:mode":<32}{"before, ms":>12}{"after, ms":>12}'
+        )
+        for key in before:
+            self.stdout.write(
+                f'{key:<32}'
+                f'{before[key]["median_ms"]:>12.3f}'
+                f'{after[key]["median_ms"]:>12.3f}'
+            )
@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.transfer import FORMATS, RecordWriter, detect_format, open_stream
+
+
+class Command(BaseCommand):
+    help = 'Выгружает посты в NDJSON или CSV потоком, пачками по id.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Файл или '-' для stdout.")
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--group', help='Только посты группы (slug).')
+        parser.add_argument('--author', help='Только посты автора.')
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('pk')
+        if options['group']:
+            posts = posts.filter(group__slug=options['group'])
+        if options['author']:
+            posts = posts.filter(author__username=options['author'])
+        rows = posts.values_list(
+            'pk', 'text', 'pub_date', 'author__username', 'group__slug'
+        )
+        chunk_size = options['chunk_size']
+        fmt = detect_format(options['path'], options['format'])
+        started = time.perf_counter()
+        exported = 0
+        last_pk = 0
+        with open_stream(options['path'], 'w') as stream:
+            writer = RecordWriter(stream, fmt)
+            while True:
+                chunk = rows.filter(pk__gt=last_pk)[:chunk_size]
+                count = 0
+                for pk, text, pub_date, author, group in chunk.iterator(
+                    chunk_size=chunk_size
+                ):
+                    writer.write(
+                        (pk, text, pub_date.isoformat(), author, group or '')
+                    )
+                    last_pk = pk
+                    count += 1
+                exported += count
+                if count < chunk_size:
+                    break
+        self.report(exported, time.perf_counter() - started)
+
+    def report(self, exported, elapsed):
+        rate = exported / elapsed if elapsed else 0
+        self.stderr.write(
+            f'Выгружено постов: {exported} за {elapsed:.2f} с '
+            f'({rate:.0f} в секунду)'
+        )
@@ -0,0 +1,141 @@
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.bulk import bulk_create_posts
+from posts.models import Group, ImportCheckpoint, Post, User
+from posts.transfer import FORMATS, detect_format, open_stream, read_records
+
+LOOKUP_CACHE_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает посты из NDJSON или CSV потоком: пачками через '
+        'bulk_create, с контрольной точкой для перезапуска.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Файл или '-' для stdin.")
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--checkpoint',
+            help='Имя контрольной точки в базе (по умолчанию — полный '
+                 'путь к файлу).',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Продолжить с записи, на которой остановилась контрольная '
+                 'точка.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        checkpoint = options['checkpoint'] or (
+            None if path == '-' else os.path.abspath(path)
+        )
+        skip = self.load_checkpoint(checkpoint) if options['resume'] else 0
+        self.authors = {}
+        self.groups = {}
+        processed = skip
+        imported = failed = 0
+        started = time.perf_counter()
+        with open_stream(path, 'r') as stream:
+            fmt = detect_format(path, options['format'])
+            records = islice(read_records(stream, fmt), skip, None)
+            while True:
+                chunk = list(islice(records, options['batch_size']))
+                if not chunk:
+                    break
+                posts, errors = self.build_posts(chunk, processed)
+                processed += len(chunk)
+                # Точка — в транзакции пачки: сбой откатит обе
+                with transaction.atomic():
+                    bulk_create_posts(posts, keep_pub_date=True)
+                    self.save_checkpoint(checkpoint, processed)
+                for error in errors:
+                    self.stderr.write(error)
+                imported += len(posts)
+                failed += len(errors)
+                if options['verbosity'] > 1:
+                    self.report(imported, failed, started)
+        self.report(imported, failed, started)
+        if checkpoint:
+            ImportCheckpoint.objects.filter(source=checkpoint).delete()
+
+    def build_posts(self, chunk, offset):
+        self.resolve(
+            self.authors, User, 'username',
+            {record.get('author') for record in chunk},
+        )
+        self.resolve(
+            self.groups, Group, 'slug',
+            {record.get('group') for record in chunk},
+        )
+        posts = []
+        errors = []
+        for number, record in enumerate(chunk, start=offset + 1):
+            text = record.get('text')
+            author_id = self.authors.get(record.get('author'))
+            group = record.get('group') or None
+            group_id = self.groups.get(group)
+            pub_date = record.get('pub_date')
+            pub_date = parse_datetime(pub_date) if pub_date else None
+            if pub_date and timezone.is_naive(pub_date):
+                pub_date = timezone.make_aware(pub_date)
+            if not text:
+                errors.append(f'Запись {number}: пустой текст')
+            elif author_id is None:
+                errors.append(
+                    f'Запись {number}: нет автора {record.get("author")!r}'
+                )
+            elif group and group_id is None:
+                errors.append(f'Запись {number}: нет группы {group!r}')
+            else:
+                posts.append(Post(
+                    text=text,
+                    author_id=author_id,
+                    group_id=group_id,
+                    pub_date=pub_date or timezone.now(),
+                ))
+        return posts, errors
+
+    def resolve(self, cache, model, field, keys):
+        """Ищет id по ключам одним запросом на пачку, с ограниченным кэшем."""
+        missing = {key for key in keys if key and key not in cache}
+        if not missing:
+            return
+        if len(cache) + len(missing) > LOOKUP_CACHE_SIZE:
+            cache.clear()
+        cache.update(
+            model.objects.filter(
+                **{f'{field}__in': missing}
+            ).values_list(field, 'pk')
+        )
+
+    def load_checkpoint(self, checkpoint):
+        try:
+            return ImportCheckpoint.objects.get(source=checkpoint).processed
+        except ImportCheckpoint.DoesNotExist:
+            raise CommandError('Контрольная точка не найдена.')
+
+    def save_checkpoint(self, checkpoint, processed):
+        if checkpoint:
+            ImportCheckpoint.objects.update_or_create(
+                source=checkpoint, defaults={'processed': processed}
+            )
+
+    def report(self, imported, failed, started):
+        elapsed = time.perf_counter() - started
+        rate = imported / elapsed if elapsed else 0
+        self.stderr.write(
+            f'Загружено постов: {imported}, пропущено: {failed} '
+            f'за {elapsed:.2f} с ({rate:.0f} в секунду)'
+        )
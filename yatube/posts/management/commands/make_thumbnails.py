@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.thumbnails import make_thumbnails
+
+
+class Command(BaseCommand):
+    help = (
+        'Нарезает превью постам, у которых их нет: например, если '
+        'процесс перезапустили раньше, чем пул успел их сделать.'
+    )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').filter(
+            thumbnails=''
+        ).values_list('pk', 'image')
+        made = sum(
+            make_thumbnails(pk, name) for pk, name in posts
+        )
+        self.stdout.write(self.style.SUCCESS(f'Нарезано превью: {made}'))
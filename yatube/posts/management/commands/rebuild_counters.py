@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов авторов и групп.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Только сверить счётчики, ничего не исправляя.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Размер пачки для bulk-обновлений.',
+        )
+
+    def handle(self, *args, **options):
+        check = options['check']
+        author_drift, group_drift = rebuild_counters(
+            fix=not check, batch_size=options['batch_size']
+        )
+        for label, drift in (('author', author_drift), ('group', group_drift)):
+            for pk, (stored, real) in sorted(drift.items()):
+                self.stdout.write(f'{label} {pk}: {stored} -> {real}')
+        total = len(author_drift) + len(group_drift)
+        if check and total:
+            raise CommandError(f'Расхождений в счётчиках: {total}')
+        action = 'Найдено' if check else 'Исправлено'
+        self.stdout.write(
+            self.style.SUCCESS(f'{action} расхождений: {total}')
+        )
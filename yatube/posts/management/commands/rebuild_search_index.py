@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс постов.'
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            self.stdout.write('Полнотекстовый индекс выключен.')
+            return
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-17 06:40
+
+from django.db import migrations
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS posts_post_fts USING fts5(text)'
+    )
+    schema_editor.execute(
+        'INSERT INTO posts_post_fts (rowid, text) SELECT id, text FROM posts_post'
+    )
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS posts_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_post_updated'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -1,4 +1,7 @@
+import json
+
 from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
 from django.db import models
 
 User = get_user_model()
@@ -8,6 +11,11 @@ class Group(models.Model):
     title = models.CharField(max_length=200, verbose_name='Заголовок',)
     slug = models.SlugField(unique=True)
     description = models.TextField(verbose_name='Описание')
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Число постов',
+    )
 
     class Meta:
         verbose_name = 'Группа'
@@ -17,12 +25,34 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def feed(self):
+        """Посты для лент: автор и группа одним JOIN, только нужные поля."""
+        return self.select_related('author', 'group').only(
+            'id',
+            'text',
+            'pub_date',
+            'updated',
+            'author__username',
+            'author__first_name',
+            'author__last_name',
+            'group__slug',
+            'group__title',
+            'image',
+            'thumbnails',
+        )
+
+
 class Post(models.Model):
     text = models.TextField(verbose_name='Текст',)
     pub_date = models.DateTimeField(
         auto_now_add=True,
         verbose_name='Дата публикации',
     )
+    updated = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -37,11 +67,94 @@ class Post(models.Model):
         related_name='posts',
         verbose_name='Группа',
     )
+    image = models.ImageField(
+        upload_to='posts/',
+        blank=True,
+        verbose_name='Картинка',
+    )
+    # JSON {размер: путь к превью}; заполняет фоновая нарезка
+    thumbnails = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Превью',
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('-pub_date', '-id'),
+                name='post_feed_idx',
+            ),
+            models.Index(
+                fields=('group', '-pub_date', '-id'),
+                name='post_group_feed_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date', '-id'),
+                name='post_author_feed_idx',
+            ),
+        )
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
 
     def __str__(self):
         return self.text[:15]
+
+    @property
+    def thumbnail_urls(self):
+        """URL готовых превью по размерам; пока их нет — пустой словарь."""
+        if not self.thumbnails:
+            return {}
+        return {
+            size: default_storage.url(name)
+            for size, name in json.loads(self.thumbnails).items()
+        }
+
+
+class AuthorStats(models.Model):
+    """Счётчики автора, которые поддерживаются сигналами Post."""
+
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_stats',
+        verbose_name='Автор',
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число постов',
+    )
+
+    class Meta:
+        verbose_name = 'Статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'{self.author_id}: {self.posts_count}'
+
+
+class ImportCheckpoint(models.Model):
+    """Сколько записей источника импорт уже загрузил.
+
+    Пишется в одной транзакции с пачкой постов, поэтому после сбоя
+    пачка не загрузится дважды.
+    """
+
+    source = models.CharField(
+        max_length=500, unique=True, verbose_name='Источник'
+    )
+    processed = models.PositiveIntegerField(
+        default=0, verbose_name='Обработано записей'
+    )
+    updated = models.DateTimeField(auto_now=True, verbose_name='Обновлена')
+
+    class Meta:
+        verbose_name = 'Контрольная точка импорта'
+        verbose_name_plural = 'Контрольные точки импорта'
+
+    def __str__(self):
+        return f'{self.source}: {self.processed}'
@@ -0,0 +1,143 @@
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.encoding import escape_uri_path
+
+from core.compression import precompress
+
+from .models import Group, User
+from .utils import PAGE_SIZE_PARAM, page_size
+
+PAGE_CACHE_ALIAS = 'pages'
+PAGE_CACHE_PARAMS = ('page', 'cursor', PAGE_SIZE_PARAM)
+
+
+def page_cache_enabled():
+    return getattr(settings, 'POSTS_PAGE_CACHE', False)
+
+
+def page_cache():
+    return caches[PAGE_CACHE_ALIAS]
+
+
+def generation_key(path):
+    return f'page_cache:generation:{path}'
+
+
+def page_key(path, generation, params, size):
+    """Ключ страницы; size — размер после пределов, а не сырой параметр."""
+    query = '&'.join(
+        f'{name}={params.get(name, "")}'
+        for name in PAGE_CACHE_PARAMS
+        if name != PAGE_SIZE_PARAM
+    )
+    return f'page_cache:{path}:{generation}:{query}&size={size}'
+
+
+def path_generation(cache, path):
+    """Поколение страниц ленты: при сбросе меняется, старые ключи умирают."""
+    key = generation_key(path)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), None)
+        generation = cache.get(key)
+    return generation
+
+
+def anonymous_page_cache(view):
+    """Кэширует готовые ответы ленты для анонимных GET-запросов.
+
+    Ключ — путь (в том же виде, что отдаёт reverse), параметры
+    пагинации и размер страницы; запросы с другими параметрами и ответы не 200
+    не кэшируются. Вместе с ответом хранятся его сжатые копии.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if (
+            not page_cache_enabled()
+            or request.method != 'GET'
+            or request.user.is_authenticated
+            or set(request.GET) - set(PAGE_CACHE_PARAMS)
+        ):
+            return view(request, *args, **kwargs)
+        cache = page_cache()
+        path = escape_uri_path(request.path)
+        key = page_key(
+            path,
+            path_generation(cache, path),
+            request.GET,
+            page_size(request),
+        )
+        response = cache.get(key)
+        if response is not None:
+            return get_conditional_response(
+                request, etag=response.get('ETag'), response=response
+            )
+        # Ответ для кэша рендерится целиком, а не потоком
+        request.caching_page = True
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            precompress(response)
+            cache.set(
+                key,
+                response,
+                getattr(settings, 'POSTS_PAGE_CACHE_TIMEOUT', 60 * 15),
+            )
+        return response
+    return wrapper
+
+
+def purge_paths(paths):
+    if not page_cache_enabled():
+        return
+    cache = page_cache()
+    for path in paths:
+        try:
+            cache.incr(generation_key(path))
+        except ValueError:
+            pass
+
+
+def purge_post_pages(author_ids, group_ids):
+    """Сбрасывает главную, ленты групп и профили авторов поста."""
+    if not page_cache_enabled():
+        return
+    author_ids = {pk for pk in author_ids if pk is not None}
+    group_ids = {pk for pk in group_ids if pk is not None}
+    paths = [reverse('posts:index')]
+    paths.extend(
+        reverse('posts:profile', args=[username])
+        for username in User.objects.filter(
+            pk__in=author_ids
+        ).values_list('username', flat=True)
+    )
+    if group_ids:
+        paths.extend(
+            reverse('posts:group_list', args=[slug])
+            for slug in Group.objects.filter(
+                pk__in=group_ids
+            ).exclude(slug='').values_list('slug', flat=True)
+        )
+    purge_paths(paths)
+
+
+def purge_group_pages(slugs):
+    """Сбрасывает ленту группы; после переименования slug их два."""
+    if not page_cache_enabled():
+        return
+    purge_paths([
+        reverse('posts:group_list', args=[slug]) for slug in slugs if slug
+    ])
+
+
+def purge_profile_pages(usernames):
+    """Сбрасывает профиль автора; после смены имени адресов два."""
+    if not page_cache_enabled():
+        return
+    purge_paths([
+        reverse('posts:profile', args=[username]) for username in usernames
+    ])
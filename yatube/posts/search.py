@@ -0,0 +1,104 @@
+import re
+from functools import reduce
+from operator import and_
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+FTS_TABLE = 'posts_post_fts'
+MAX_TERMS = 10
+
+
+def fts_enabled():
+    """Полнотекстовый индекс есть только у SQLite с FTS5."""
+    return (
+        getattr(settings, 'POSTS_SEARCH_BACKEND', 'fts5') == 'fts5'
+        and connection.vendor == 'sqlite'
+    )
+
+
+def search_terms(text):
+    return re.findall(r'\w+', text or '')[:MAX_TERMS]
+
+
+def match_expression(terms):
+    """Запрос FTS5: все слова, каждое — как префикс, без синтаксиса MATCH."""
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_posts(queryset, text):
+    """Посты, подходящие под запрос, от самых релевантных к менее.
+
+    Без FTS5 откатывается на LIKE по каждому слову.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+    if not fts_enabled():
+        return queryset.filter(
+            reduce(and_, (Q(text__icontains=term) for term in terms))
+        )
+    return queryset.extra(
+        select={'rank': f'bm25({FTS_TABLE})'},
+        tables=[FTS_TABLE],
+        where=[
+            f'{FTS_TABLE}.rowid = posts_post.id',
+            f'{FTS_TABLE} MATCH %s',
+        ],
+        params=[match_expression(terms)],
+    ).order_by('rank', '-pub_date')
+
+
+def filter_matching(queryset, text):
+    """Фильтр постов по индексу без ранжирования — для админки."""
+    return queryset.extra(
+        where=[
+            f'posts_post.id IN (SELECT rowid FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s)'
+        ],
+        params=[match_expression(search_terms(text))],
+    )
+
+
+def index_post(post):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, text) VALUES (%s, %s)',
+            [post.pk, post.text],
+        )
+
+
+def unindex_post(post_id):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def index_posts_after(pk):
+    """Индексирует посты с id больше pk — после bulk_create одной пачкой."""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid > %s', [pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, text) '
+            f'SELECT id, text FROM posts_post WHERE id > %s',
+            [pk],
+        )
+
+
+def rebuild_index():
+    """Перестраивает индекс целиком — после bulk-операций мимо сигналов."""
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, text) '
+            f'SELECT id, text FROM posts_post'
+        )
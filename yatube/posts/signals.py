@@ -0,0 +1,226 @@
+from django.db import transaction
+from django.db.models.signals import (post_delete, post_init, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from core.tasks import enqueue
+
+from .cards import bump_version
+from .counters import change_author_count, change_group_count
+from .feed_cache import feeds_deleted, feeds_saved
+from .models import Group, Post, User
+from .page_cache import (page_cache_enabled, purge_group_pages,
+                         purge_post_pages, purge_profile_pages)
+from .syndication import author_group_ids, bump_feeds, group_author_ids
+from .tasks import drop_from_index, notify_author, reindex_post
+from .thumbnails import image_replaced, remember_image, schedule_thumbnails
+from .timeline import timeline_deleted, timeline_saved
+
+COUNTED_FIELDS = ('author_id', 'group_id')
+CARD_AUTHOR_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+def remember_counted(instance):
+    """Запоминает автора и группу, под которыми пост уже посчитан.
+
+    Читаем прямо из __dict__, чтобы не дёргать отложенные поля.
+    """
+    instance._counted = {
+        field: instance.__dict__[field]
+        for field in COUNTED_FIELDS
+        if field in instance.__dict__
+    }
+
+
+@receiver(post_init, sender=Post)
+def post_initialized(sender, instance, **kwargs):
+    remember_counted(instance)
+    remember_image(instance)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = {} if created else instance._counted
+    if created:
+        change_author_count(instance.author_id, 1)
+        change_group_count(instance.group_id, 1)
+    else:
+        changes = (
+            ('author_id', change_author_count),
+            ('group_id', change_group_count),
+        )
+        for field, change_count in changes:
+            if field not in previous:
+                continue
+            old_value = previous[field]
+            new_value = instance.__dict__.get(field, old_value)
+            if old_value != new_value:
+                change_count(old_value, -1)
+                change_count(new_value, 1)
+    author_ids = {
+        previous.get('author_id'), instance.__dict__.get('author_id')
+    }
+    group_ids = {previous.get('group_id'), instance.__dict__.get('group_id')}
+    # Кэши сбрасываем после коммита: иначе запрос между сбросом
+    # и коммитом закэширует старые строки под новой версией
+    transaction.on_commit(
+        lambda: purge_post_pages(author_ids=author_ids, group_ids=group_ids)
+    )
+    feeds_saved(instance, previous)
+    if not created:
+        # Новые посты ленты дописывают сами, правка — пересборка лент
+        transaction.on_commit(
+            lambda: bump_feeds(author_ids=author_ids, group_ids=group_ids)
+        )
+    remember_counted(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    change_author_count(instance._counted.get('author_id'), -1)
+    change_group_count(instance._counted.get('group_id'), -1)
+    author_ids = {instance._counted.get('author_id')}
+    group_ids = {instance._counted.get('group_id')}
+    transaction.on_commit(
+        lambda: purge_post_pages(author_ids=author_ids, group_ids=group_ids)
+    )
+    feeds_deleted(instance)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_card_changed(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: bump_version('post', pk))
+
+
+@receiver(post_save, sender=User)
+def author_card_changed(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not CARD_AUTHOR_FIELDS & set(update_fields):
+        return
+    pk = instance.pk
+    transaction.on_commit(lambda: bump_version('author', pk))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_card_changed(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: bump_version('group', pk))
+
+
+@receiver(post_init, sender=Group)
+def group_initialized(sender, instance, **kwargs):
+    # Slug, под которым лента группы могла попасть в кэш страниц
+    instance._paged_slug = instance.__dict__.get('slug')
+
+
+@receiver(post_save, sender=Group)
+def group_page_changed(sender, instance, **kwargs):
+    slugs = {instance._paged_slug, instance.slug}
+    transaction.on_commit(lambda: purge_group_pages(slugs))
+    instance._paged_slug = instance.slug
+
+
+@receiver(pre_save, sender=User)
+def author_page_renaming(sender, instance, update_fields=None, raw=False,
+                         **kwargs):
+    # Имя, под которым профиль мог попасть в кэш страниц
+    instance._paged_username = None
+    if (
+        raw
+        or instance.pk is None
+        or (update_fields and 'username' not in update_fields)
+        or not page_cache_enabled()
+    ):
+        return
+    instance._paged_username = User.objects.filter(
+        pk=instance.pk
+    ).values_list('username', flat=True).first()
+
+
+@receiver(post_save, sender=User)
+def author_page_changed(sender, instance, **kwargs):
+    old = getattr(instance, '_paged_username', None)
+    if old and old != instance.username:
+        usernames = {old, instance.username}
+        transaction.on_commit(lambda: purge_profile_pages(usernames))
+
+
+@receiver(post_save, sender=Post)
+def post_search_changed(sender, instance, update_fields=None, raw=False,
+                        **kwargs):
+    if raw or (update_fields and 'text' not in update_fields):
+        return
+    enqueue(reindex_post, instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def post_search_deleted(sender, instance, **kwargs):
+    enqueue(drop_from_index, instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def post_published(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        enqueue(
+            notify_author, instance.pk, key=f'notify_author:{instance.pk}'
+        )
+
+
+@receiver(post_save, sender=Post)
+def post_timeline_changed(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        timeline_saved([instance], created)
+
+
+@receiver(post_delete, sender=Post)
+def post_timeline_deleted(sender, instance, **kwargs):
+    timeline_deleted(instance.pk)
+
+
+@receiver(pre_save, sender=Post)
+def post_image_replaced(sender, instance, raw=False, **kwargs):
+    if not raw and image_replaced(instance):
+        instance.thumbnails = ''
+
+
+@receiver(post_save, sender=Post)
+def post_image_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule_thumbnails(instance)
+    remember_image(instance)
+
+
+@receiver(post_delete, sender=Post)
+def post_syndication_deleted(sender, instance, **kwargs):
+    author_ids = {instance._counted.get('author_id')}
+    group_ids = {instance._counted.get('group_id')}
+    transaction.on_commit(
+        lambda: bump_feeds(author_ids=author_ids, group_ids=group_ids)
+    )
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def group_syndication_changed(sender, instance, **kwargs):
+    # pre_delete: после удаления посты уже отвязаны от группы
+    author_ids = group_author_ids(instance.pk)
+    group_ids = {instance.pk}
+    transaction.on_commit(
+        lambda: bump_feeds(author_ids=author_ids, group_ids=group_ids)
+    )
+
+
+@receiver(post_save, sender=User)
+def author_syndication_changed(sender, instance, update_fields=None,
+                               **kwargs):
+    if update_fields and not CARD_AUTHOR_FIELDS & set(update_fields):
+        return
+    author_ids = {instance.pk}
+    group_ids = author_group_ids(instance.pk)
+    transaction.on_commit(
+        lambda: bump_feeds(author_ids=author_ids, group_ids=group_ids)
+    )
@@ -0,0 +1,208 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from django.http import HttpResponse, HttpResponseBadRequest
+from django.template.defaultfilters import truncatechars
+from django.urls import reverse
+from django.utils import feedgenerator
+from django.utils.cache import get_conditional_response
+
+from .cards import bump_version, get_version
+from .conditional import make_etag
+from .models import Post
+
+FORMATS = {
+    'rss': feedgenerator.Rss201rev2Feed,
+    'atom': feedgenerator.Atom1Feed,
+    'json': None,
+}
+JSON_FEED_VERSION = 'https://jsonfeed.org/version/1.1'
+JSON_FEED_TYPE = 'application/feed+json; charset=utf-8'
+# Версия всех лент сразу: её меняют массовые изменения мимо сигналов
+ROOT = ('syndication', 0)
+
+
+class FormatConverter:
+    regex = '|'.join(FORMATS)
+
+    def to_python(self, value):
+        return value
+
+    def to_url(self, value):
+        return value
+
+
+def syndication_size():
+    return getattr(settings, 'POSTS_SYNDICATION_SIZE', 50)
+
+
+def feed_posts(kind, pk):
+    """Посты ленты в том же порядке, что и на страницах posts.views.
+
+    Читаем с основной базы: записи ленты общие для всех запросов,
+    и отставшая реплика закэшировала бы старые данные.
+    """
+    posts = Post.objects.db_manager(DEFAULT_DB_ALIAS).feed()
+    if kind == 'group':
+        posts = posts.filter(group_id=pk)
+    elif kind == 'author':
+        posts = posts.filter(author_id=pk)
+    return posts.order_by('-pub_date', '-pk')
+
+
+def serialize_post(post):
+    """Запись ленты, общая для RSS, Atom и JSON: только строки и даты."""
+    return {
+        'id': post.pk,
+        'pub_date': post.pub_date,
+        'updated': post.updated,
+        'title': truncatechars(post.text, 50),
+        'text': post.text,
+        'link': reverse('posts:post_detail', args=[post.pk]),
+        'author': post.author.get_full_name() or post.author.username,
+        'author_link': reverse('posts:profile', args=[post.author.username]),
+        'category': post.group.title if post.group else None,
+    }
+
+
+def entries_key(kind, pk):
+    return 'syndication:{}:{}:{}:{}'.format(
+        get_version(*ROOT), kind, pk, get_version(f'{kind}_syndication', pk)
+    )
+
+
+def load_entries(kind, pk):
+    """Записи ленты: из кэша плюс посты новее первой записи.
+
+    Новые посты дописываются в начало, самые старые уходят за размер
+    ленты; правки и удаления меняют версию ленты — тогда она собирается
+    заново.
+    """
+    key = entries_key(kind, pk)
+    entries = cache.get(key)
+    posts = feed_posts(kind, pk)
+    if entries:
+        newest = entries[0]
+        posts = posts.filter(
+            Q(pub_date__gt=newest['pub_date'])
+            | Q(pub_date=newest['pub_date'], pk__gt=newest['id'])
+        )
+    fresh = [serialize_post(post) for post in posts[:syndication_size()]]
+    if entries is None or fresh:
+        entries = (fresh + (entries or []))[:syndication_size()]
+        cache.set(key, entries, None)
+    return entries
+
+
+def bump_feeds(author_ids=(), group_ids=()):
+    """Меняет версии главной и затронутых лент авторов и групп."""
+    bump_version('index_syndication', 0)
+    for pk in set(author_ids):
+        if pk is not None:
+            bump_version('author_syndication', pk)
+    for pk in set(group_ids):
+        if pk is not None:
+            bump_version('group_syndication', pk)
+
+
+def group_author_ids(group_id):
+    """Записи несут название группы: оно есть и в лентах её авторов."""
+    return list(Post.objects.db_manager(DEFAULT_DB_ALIAS).filter(
+        group_id=group_id
+    ).values_list('author_id', flat=True).distinct())
+
+
+def author_group_ids(author_id):
+    """Записи несут имя автора: оно есть и в лентах групп, где он пишет."""
+    return list(Post.objects.db_manager(DEFAULT_DB_ALIAS).filter(
+        author_id=author_id
+    ).values_list('group_id', flat=True).distinct())
+
+
+def reset_feeds():
+    bump_version(*ROOT)
+
+
+def write_json(request, meta, entries):
+    items = [{
+        'id': str(entry['id']),
+        'url': request.build_absolute_uri(entry['link']),
+        'title': entry['title'],
+        'content_text': entry['text'],
+        'date_published': entry['pub_date'].isoformat(),
+        'date_modified': entry['updated'].isoformat(),
+        'authors': [{
+            'name': entry['author'],
+            'url': request.build_absolute_uri(entry['author_link']),
+        }],
+        'tags': [entry['category']] if entry['category'] else [],
+    } for entry in entries]
+    return HttpResponse(
+        json.dumps({
+            'version': JSON_FEED_VERSION,
+            'title': meta['title'],
+            'description': meta['description'],
+            'home_page_url': request.build_absolute_uri(meta['link']),
+            'feed_url': request.build_absolute_uri(),
+            'items': items,
+        }, ensure_ascii=False),
+        content_type=JSON_FEED_TYPE,
+    )
+
+
+def write_xml(request, fmt, meta, entries):
+    feed = FORMATS[fmt](
+        title=meta['title'],
+        link=request.build_absolute_uri(meta['link']),
+        description=meta['description'],
+        feed_url=request.build_absolute_uri(),
+        language=settings.LANGUAGE_CODE,
+    )
+    for entry in entries:
+        link = request.build_absolute_uri(entry['link'])
+        feed.add_item(
+            title=entry['title'],
+            link=link,
+            description=entry['text'],
+            unique_id=link,
+            pubdate=entry['pub_date'],
+            updateddate=entry['updated'],
+            author_name=entry['author'],
+            author_link=request.build_absolute_uri(entry['author_link']),
+            categories=[entry['category']] if entry['category'] else None,
+        )
+    response = HttpResponse(content_type=feed.content_type)
+    feed.write(response, 'utf-8')
+    return response
+
+
+def syndication_response(request, fmt, kind, pk, meta):
+    """Лента в формате fmt; ?since_id= — только посты с id больше него.
+
+    На If-None-Match отвечает 304 до сериализации. В ETag — версия
+    ленты: переименование автора или группы не меняет дат записей,
+    поэтому Last-Modified лента не отдаёт.
+    """
+    since_id = request.GET.get('since_id')
+    if since_id is not None:
+        if not since_id.isdigit():
+            return HttpResponseBadRequest('since_id — это id поста')
+        since_id = int(since_id)
+    entries = load_entries(kind, pk)
+    if since_id is not None:
+        entries = [entry for entry in entries if entry['id'] > since_id]
+    etag = make_etag(
+        fmt, entries_key(kind, pk), since_id, *meta.values(),
+        *((entry['id'], entry['updated'].isoformat()) for entry in entries),
+    )
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        if fmt == 'json':
+            response = write_json(request, meta, entries)
+        else:
+            response = write_xml(request, fmt, meta, entries)
+        response['ETag'] = etag
+    return response
@@ -0,0 +1,37 @@
+from django.core.mail import send_mail
+from django.urls import reverse
+
+from core.tasks import task
+
+from .models import Post
+from .search import index_post, unindex_post
+
+
+@task()
+def reindex_post(post_id):
+    """Индексирует пост по его текущему тексту; удалённый — убирает."""
+    post = Post.objects.filter(pk=post_id).only('text').first()
+    if post is None:
+        unindex_post(post_id)
+    else:
+        index_post(post)
+
+
+@task()
+def drop_from_index(post_id):
+    unindex_post(post_id)
+
+
+@task()
+def notify_author(post_id):
+    """Письмо автору о том, что пост опубликован."""
+    post = Post.objects.select_related('author').filter(pk=post_id).first()
+    if post is None or not post.author.email:
+        return
+    send_mail(
+        'Пост опубликован',
+        f'Ваш пост «{post}» опубликован: '
+        f'{reverse("posts:post_detail", args=[post.pk])}',
+        None,
+        [post.author.email],
+    )
@@ -0,0 +1,119 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostAdminPerformanceTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.group = Group.objects.create(
+            title='Группа админки',
+            slug='admin-slug',
+            description='Описание',
+        )
+        cls.url = reverse('admin:posts_post_changelist')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.admin)
+
+    def create_posts(self, count):
+        start = User.objects.count()
+        for number in range(start, start + count):
+            author = User.objects.create_user(username=f'Автор {number}')
+            Post.objects.create(
+                text=f'Пост {number}', author=author, group=self.group
+            )
+
+    def changelist_queries(self, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, params or {})
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Число запросов списка постов не зависит от числа строк."""
+        self.create_posts(2)
+        _, few = self.changelist_queries()
+        self.create_posts(20)
+        _, many = self.changelist_queries()
+        self.assertEqual(len(few), len(many))
+
+    def test_changelist_does_not_list_every_group(self):
+        """Колонка группы — виджет автодополнения, а не список всех групп."""
+        self.create_posts(1)
+        Group.objects.create(
+            title='Лишняя группа', slug='extra-slug', description='-'
+        )
+        response, _ = self.changelist_queries()
+        self.assertNotContains(response, 'Лишняя группа')
+
+    def test_large_table_count_is_estimated(self):
+        """На большой таблице COUNT(*) по всей таблице не выполняется."""
+        self.create_posts(3)
+        with mock.patch('posts.admin.ADMIN_COUNT_LIMIT', 1):
+            response, queries = self.changelist_queries()
+        self.assertEqual(
+            response.context['cl'].result_count,
+            Post.objects.order_by('-pk').first().pk,
+        )
+        self.assertFalse(
+            any('COUNT(' in query.upper() for query in queries)
+        )
+
+    def test_estimate_clamped_after_deletes(self):
+        """После удалений за оценкой нет пустых страниц."""
+        posts = [
+            Post.objects.create(text=f'Пост {number}', author=self.admin)
+            for number in range(30)
+        ]
+        Post.objects.filter(pk__in=[post.pk for post in posts[:20]]).delete()
+        with mock.patch('posts.admin.ADMIN_COUNT_LIMIT', 1), mock.patch(
+            'posts.admin.PostAdmin.list_per_page', 5
+        ):
+            response = self.client.get(self.url, {'p': 1})
+            estimated_pages = response.context['cl'].paginator.num_pages
+            self.assertGreaterEqual(estimated_pages, 6)
+            response = self.client.get(
+                self.url, {'p': estimated_pages - 1}
+            )
+        self.assertEqual(response.status_code, 200)
+        paginator = response.context['cl'].paginator
+        self.assertEqual((paginator.count, paginator.num_pages), (10, 2))
+        self.assertEqual(len(response.context['cl'].result_list), 5)
+
+    def test_date_hierarchy_avoids_distinct_dates(self):
+        """Навигация по датам не агрегирует даты всей таблицы."""
+        self.create_posts(3)
+        response, queries = self.changelist_queries()
+        self.assertTrue(response.context['cl'].date_hierarchy)
+        self.assertFalse(any('DISTINCT' in query for query in queries))
+        self.assertContains(response, 'pub_date__day=')
+
+    def test_change_form_and_date_drill_down_render(self):
+        """Форма поста и переходы по годам и месяцам открываются."""
+        self.create_posts(1)
+        post = Post.objects.get()
+        response = self.client.get(
+            reverse('admin:posts_post_change', args=[post.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        year = post.pub_date.year
+        for params in (
+            {'pub_date__year': year},
+            {'pub_date__year': year, 'pub_date__month': post.pub_date.month},
+        ):
+            with self.subTest(params=params):
+                response, _ = self.changelist_queries(params)
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.cards import get_version
+from posts.models import Group, Post
+
+User = get_user_model()
+
+on_commit_now = mock.patch(
+    'posts.signals.transaction.on_commit', lambda callback: callback()
+)
+
+
+@on_commit_now
+class PostCardsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.author = User.objects.create_user(
+            username='Автор карточек', first_name='Старое', last_name='Имя'
+        )
+        self.group = Group.objects.create(
+            title='Группа карточек',
+            slug='old-slug',
+            description='Описание',
+        )
+        self.post = Post.objects.create(
+            text='Текст карточки', author=self.author, group=self.group
+        )
+        self.index = reverse('posts:index')
+
+    def test_cards_rendered_once(self):
+        """Повторный запрос берёт карточки из кэша, не рендеря шаблон."""
+        self.guest_client.get(self.index)
+        with mock.patch('posts.cards.render_to_string') as render:
+            response = self.guest_client.get(self.index)
+        render.assert_not_called()
+        self.assertContains(response, '<p>Текст карточки</p>')
+
+    def test_post_edit_invalidates_card(self):
+        """Правка поста меняет версию карточки."""
+        self.guest_client.get(self.index)
+        self.post.text = 'Новый текст карточки'
+        self.post.save()
+        response = self.guest_client.get(self.index)
+        self.assertContains(response, 'Новый текст карточки')
+
+    def test_author_name_change_invalidates_card(self):
+        """Смена имени автора меняет версию карточки."""
+        self.guest_client.get(self.index)
+        self.author.first_name = 'Новое'
+        self.author.save()
+        response = self.guest_client.get(self.index)
+        self.assertContains(response, 'Новое Имя')
+
+    def test_group_slug_change_invalidates_card(self):
+        """Смена slug группы меняет ссылку в карточке."""
+        self.guest_client.get(self.index)
+        self.group.slug = 'new-slug'
+        self.group.save()
+        response = self.guest_client.get(self.index)
+        self.assertContains(response, '/group/new-slug/')
+        self.assertNotContains(response, '/group/old-slug/')
+
+    def test_group_delete_invalidates_card(self):
+        """После удаления группы карточка теряет ссылку на неё."""
+        self.guest_client.get(self.index)
+        self.group.delete()
+        response = self.guest_client.get(self.index)
+        self.assertNotContains(response, '/group/old-slug/')
+
+
+class CardVersionCommitTests(TestCase):
+    def test_version_bumped_after_commit(self):
+        """До коммита версия прежняя: старый пост не закэшируется под новой."""
+        author = User.objects.create_user(username='Автор')
+        post = Post.objects.create(author=author, text='Старый текст')
+        del connection.run_on_commit[:]
+        version = get_version('post', post.pk)
+        post.text = 'Новый текст'
+        post.save()
+        self.assertEqual(get_version('post', post.pk), version)
+        # TestCase не коммитит: выполняем то, что осталось до коммита
+        for _, callback in connection.run_on_commit:
+            callback()
+        self.assertNotEqual(get_version('post', post.pk), version)
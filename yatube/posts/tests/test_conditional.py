@@ -0,0 +1,102 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+on_commit_now = mock.patch(
+    'posts.signals.transaction.on_commit', lambda callback: callback()
+)
+
+
+@on_commit_now
+class ConditionalResponsesTests(TestCase):
+    def setUp(self):
+        self.guest_client = Client()
+        self.author = User.objects.create_user(username='Условный автор')
+        self.group = Group.objects.create(
+            title='Условная группа',
+            slug='conditional-slug',
+            description='Описание',
+        )
+        self.post = Post.objects.create(
+            text='Условный пост', author=self.author, group=self.group
+        )
+        self.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[self.group.slug]),
+            reverse('posts:profile', args=[self.author.username]),
+            reverse('posts:post_detail', args=[self.post.pk]),
+        )
+
+    def test_if_none_match_returns_not_modified(self):
+        """Совпавший ETag даёт 304 без рендера шаблона."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.guest_client.get(url)['ETag']
+                with mock.patch('posts.conditional.render') as render:
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=etag
+                    )
+                render.assert_not_called()
+                self.assertEqual(
+                    response.status_code, HTTPStatus.NOT_MODIFIED
+                )
+
+    def test_no_last_modified(self):
+        """Без Last-Modified: If-Modified-Since не даёт устаревший 304."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+                )
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_edit_changes_etag(self):
+        """Правка поста меняет ETag всех его страниц."""
+        etags = [self.guest_client.get(url)['ETag'] for url in self.urls]
+        self.post.text = 'Отредактированный пост'
+        self.post.save()
+        for url, etag in zip(self.urls, etags):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_new_post_changes_feed_etag(self):
+        """Новый пост меняет ETag ленты."""
+        etag = self.guest_client.get(self.urls[0])['ETag']
+        Post.objects.create(text='Новый пост', author=self.author)
+        response = self.guest_client.get(
+            self.urls[0], HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_author_and_group_rename_change_etag(self):
+        """Переименование автора или группы меняет ETag страниц поста."""
+        index, _, _, detail = self.urls
+        for rename in (self.rename_author, self.rename_group):
+            with self.subTest(rename=rename.__name__):
+                etags = [
+                    self.guest_client.get(url)['ETag']
+                    for url in (index, detail)
+                ]
+                rename()
+                for url, etag in zip((index, detail), etags):
+                    response = self.guest_client.get(
+                        url, HTTP_IF_NONE_MATCH=etag
+                    )
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def rename_author(self):
+        self.author.first_name = 'Новое имя'
+        self.author.save()
+
+    def rename_group(self):
+        self.group.title = 'Новое название'
+        self.group.save()
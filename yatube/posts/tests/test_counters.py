@@ -0,0 +1,94 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from posts.counters import author_posts_count, rebuild_counters
+from posts.models import AuthorStats, Group, Post
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Считаемый автор')
+        cls.another_author = User.objects.create_user(username='Другой автор')
+        cls.group = Group.objects.create(
+            title='Считаемая группа',
+            slug='counted-slug',
+            description='Описание',
+        )
+        cls.another_group = Group.objects.create(
+            title='Другая группа',
+            slug='another-counted-slug',
+            description='Описание',
+        )
+
+    def assert_counts(self, author, group, another_author, another_group):
+        self.assertEqual(
+            author_posts_count(User.objects.get(pk=self.author.pk)), author
+        )
+        self.assertEqual(
+            author_posts_count(User.objects.get(pk=self.another_author.pk)),
+            another_author,
+        )
+        self.group.refresh_from_db()
+        self.another_group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, group)
+        self.assertEqual(self.another_group.posts_count, another_group)
+
+    def test_counters_follow_create_and_delete(self):
+        """Счётчики растут при создании поста и падают при удалении."""
+        post = Post.objects.create(
+            text='Пост', author=self.author, group=self.group
+        )
+        Post.objects.create(text='Пост без группы', author=self.author)
+        self.assert_counts(2, 1, 0, 0)
+        post.delete()
+        self.assert_counts(1, 0, 0, 0)
+
+    def test_counters_follow_author_and_group_change(self):
+        """Смена автора и группы переносит пост между счётчиками."""
+        post = Post.objects.create(
+            text='Пост', author=self.author, group=self.group
+        )
+        post = Post.objects.get(pk=post.pk)
+        post.author = self.another_author
+        post.group = self.another_group
+        post.save()
+        self.assert_counts(0, 0, 1, 1)
+        post.group = None
+        post.save()
+        self.assert_counts(0, 0, 1, 0)
+
+    def test_group_delete_keeps_counters_consistent(self):
+        """Удаление группы (SET_NULL) не ломает счётчики."""
+        group = Group.objects.create(
+            title='Удаляемая группа',
+            slug='deleted-slug',
+            description='Описание',
+        )
+        Post.objects.create(text='Пост', author=self.author, group=group)
+        group.delete()
+        post = Post.objects.get()
+        self.assertIsNone(post.group_id)
+        post.group = self.another_group
+        post.save()
+        self.assertEqual(author_posts_count(self.author), 1)
+        self.another_group.refresh_from_db()
+        self.assertEqual(self.another_group.posts_count, 1)
+        self.assertEqual(rebuild_counters(fix=False), ({}, {}))
+
+    def test_rebuild_counters_command(self):
+        """Команда находит и исправляет разошедшиеся счётчики."""
+        Post.objects.create(text='Пост', author=self.author, group=self.group)
+        Post.objects.update(group=self.another_group)
+        AuthorStats.objects.all().delete()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_counters', '--check', stdout=StringIO())
+        call_command('rebuild_counters', stdout=StringIO())
+        self.assert_counts(1, 0, 0, 1)
+        self.assertEqual(rebuild_counters(fix=False), ({}, {}))
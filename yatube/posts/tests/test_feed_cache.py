@@ -0,0 +1,208 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.bulk import bulk_create_posts
+from posts.feed_cache import (ENTRY_BYTES, LIST_BYTES, feed_cache,
+                              feed_timeline)
+from posts.models import Group, Post, User
+from posts.utils import POST_PER_PAGE
+
+on_commit_now = mock.patch(
+    'posts.feed_cache.transaction.on_commit', lambda callback: callback()
+)
+
+
+@override_settings(POSTS_FEED_CACHE=True)
+class FeedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        feed_cache.clear()
+        self.author = User.objects.create_user(username='Плодовитый')
+        self.other = User.objects.create_user(username='Другой')
+        self.group = Group.objects.create(
+            title='Популярная', slug='popular', description='Описание'
+        )
+        self.other_group = Group.objects.create(
+            title='Соседняя', slug='neighbour', description='Описание'
+        )
+        now = timezone.now()
+        for number in range(15):
+            post = Post.objects.create(
+                author=self.author, group=self.group, text=f'Пост {number}'
+            )
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=now - timedelta(minutes=number)
+            )
+        self.group_page = reverse('posts:group_list', args=[self.group.slug])
+        self.profile = reverse('posts:profile', args=[self.author.username])
+
+    def ids(self, kind, pk):
+        return [-key[1] for key in feed_timeline(kind, pk)['keys']]
+
+    def expected(self, **filters):
+        return list(
+            Post.objects.filter(**filters).order_by(
+                '-pub_date', '-pk'
+            ).values_list('pk', flat=True)
+        )
+
+    def test_pages_hydrate_from_cached_ids(self):
+        """Страница группы и профиля — по id из кэша, без сортировки."""
+        for path in (self.group_page, self.profile):
+            with self.subTest(path=path):
+                Client().get(path)
+                with CaptureQueriesContext(connection) as queries:
+                    response = Client().get(path, {'page': 2})
+                page_obj = response.context['page_obj']
+                self.assertEqual(len(page_obj), 15 - POST_PER_PAGE)
+                self.assertEqual(
+                    [post.pk for post in page_obj],
+                    self.expected(group=self.group)[POST_PER_PAGE:],
+                )
+                self.assertFalse(any(
+                    'FROM "posts_post"' in query['sql']
+                    and 'ORDER BY' in query['sql']
+                    for query in queries
+                ))
+        self.assertEqual(feed_cache.stats()['hits'], 2)
+        self.assertEqual(feed_cache.stats()['misses'], 2)
+
+    @on_commit_now
+    def test_incremental_updates(self):
+        """Изменения постов правят закэшированные списки на месте."""
+        self.ids('group', self.group.pk)
+        self.ids('author', self.author.pk)
+        post = Post.objects.create(
+            author=self.author, group=self.group, text='Новый'
+        )
+        self.assertEqual(self.ids('group', self.group.pk)[0], post.pk)
+        post.group = self.other_group
+        post.author = self.other
+        post.save()
+        self.assertEqual(
+            self.ids('group', self.group.pk), self.expected(group=self.group)
+        )
+        self.assertEqual(
+            self.ids('author', self.author.pk),
+            self.expected(author=self.author),
+        )
+        old = Post.objects.filter(group=self.group).last()
+        old.delete()
+        self.assertNotIn(old.pk, self.ids('group', self.group.pk))
+        stats = feed_cache.stats()
+        self.assertEqual(stats['misses'], 2)
+        self.assertEqual(stats['entries'], 2)
+
+    @on_commit_now
+    def test_foreign_write_rebuilds_list(self):
+        """Запись другого процесса меняет общую версию — список пересобран."""
+        self.ids('group', self.group.pk)
+        post = Post.objects.create(
+            author=self.author, group=self.group, text='Чужой'
+        )
+        cache.incr(f'post_card:version:group_feed:{self.group.pk}')
+        Post.objects.filter(pk=post.pk).delete()
+        self.assertEqual(
+            self.ids('group', self.group.pk), self.expected(group=self.group)
+        )
+
+    @on_commit_now
+    @override_settings(POSTS_FEED_CACHE_SIZE=POST_PER_PAGE)
+    def test_list_bounded_by_window(self):
+        """В списке не больше окна постов; страницы за ним — из базы."""
+        timeline = feed_timeline('group', self.group.pk)
+        self.assertEqual(len(timeline['keys']), POST_PER_PAGE)
+        self.assertEqual(timeline['count'], 15)
+        post = Post.objects.create(
+            author=self.author, group=self.group, text='Новый'
+        )
+        timeline = feed_timeline('group', self.group.pk)
+        self.assertEqual(self.ids('group', self.group.pk)[0], post.pk)
+        self.assertEqual(len(timeline['keys']), POST_PER_PAGE)
+        self.assertEqual(timeline['count'], 16)
+        post.delete()
+        self.assertEqual(feed_timeline('group', self.group.pk)['count'], 15)
+        response = Client().get(self.group_page, {'page': 2})
+        self.assertEqual(
+            [post.pk for post in response.context['page_obj']],
+            self.expected(group=self.group)[POST_PER_PAGE:],
+        )
+        self.assertEqual(feed_cache.stats()['misses'], 1)
+
+    def test_rolled_back_save_keeps_lists(self):
+        """Списки меняются только после коммита, откат их не трогает."""
+        self.ids('group', self.group.pk)
+        del connection.run_on_commit[:]
+        try:
+            with transaction.atomic():
+                Post.objects.create(
+                    author=self.author, group=self.group, text='Откачен'
+                )
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        post = Post.objects.create(
+            author=self.author, group=self.group, text='Сохранён'
+        )
+        self.assertNotIn(post.pk, self.ids('group', self.group.pk))
+        # TestCase не коммитит: выполняем то, что осталось до коммита
+        for _, callback in connection.run_on_commit:
+            callback()
+        timeline = feed_timeline('group', self.group.pk)
+        self.assertEqual(self.ids('group', self.group.pk)[0], post.pk)
+        self.assertEqual(timeline['count'], 16)
+        self.assertEqual(
+            self.ids('group', self.group.pk), self.expected(group=self.group)
+        )
+        self.assertEqual(feed_cache.stats()['misses'], 1)
+
+    def test_bulk_create_resets_lists(self):
+        """Пачка мимо сигналов сбрасывает списки своих групп и авторов."""
+        self.ids('group', self.group.pk)
+        self.ids('author', self.author.pk)
+        with mock.patch(
+            'posts.bulk.transaction.on_commit', lambda callback: callback()
+        ):
+            bulk_create_posts([
+                Post(author=self.author, group=self.group, text='Пачкой')
+            ])
+        self.assertEqual(
+            self.ids('group', self.group.pk), self.expected(group=self.group)
+        )
+        self.assertEqual(
+            self.ids('author', self.author.pk),
+            self.expected(author=self.author),
+        )
+
+    def test_memory_budget_evicts_least_recent(self):
+        """Списки сверх бюджета вытесняются, начиная с давно не читанных."""
+        budget = LIST_BYTES * 3 + ENTRY_BYTES * 15
+        with override_settings(POSTS_FEED_CACHE_BYTES=budget):
+            self.ids('group', self.group.pk)
+            self.ids('author', self.other.pk)
+            self.ids('group', self.group.pk)
+            self.ids('group', self.other_group.pk)
+            self.assertEqual(feed_cache.stats()['evictions'], 0)
+            self.ids('author', self.author.pk)
+            stats = feed_cache.stats()
+            self.assertEqual(stats['evictions'], 2)
+            self.assertLessEqual(stats['bytes'], budget)
+            self.assertEqual(
+                set(feed_cache.entries),
+                {('group', self.other_group.pk), ('author', self.author.pk)},
+            )
+
+    def test_stats_exposed_in_metrics(self):
+        self.ids('group', self.group.pk)
+        admin = User.objects.create_user(username='admin', is_staff=True)
+        client = Client()
+        client.force_login(admin)
+        response = client.get(reverse('core:metrics_prometheus'))
+        self.assertContains(response, 'yatube_posts_feed_cache_misses 1')
@@ -0,0 +1,170 @@
+import shutil
+import tempfile
+from http import HTTPStatus
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+on_commit_now = mock.patch(
+    'posts.signals.transaction.on_commit', lambda callback: callback()
+)
+
+
+@on_commit_now
+@override_settings(POSTS_PAGE_CACHE=True)
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        caches['pages'].clear()
+        self.guest_client = Client()
+        self.author = User.objects.create_user(username='Кэшируемый автор')
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.author)
+        self.group = Group.objects.create(
+            title='Кэшируемая группа',
+            slug='cached-slug',
+            description='Описание',
+        )
+        self.other_group = Group.objects.create(
+            title='Соседняя группа',
+            slug='other-cached-slug',
+            description='Описание',
+        )
+        Post.objects.create(
+            text='Первый пост', author=self.author, group=self.group
+        )
+        self.index = reverse('posts:index')
+        self.group_page = reverse('posts:group_list', args=[self.group.slug])
+        self.other_group_page = reverse(
+            'posts:group_list', args=[self.other_group.slug]
+        )
+        self.profile = reverse('posts:profile', args=[self.author.username])
+
+    def test_anonymous_feed_served_from_cache(self):
+        """Повторный анонимный запрос ленты не ходит в базу."""
+        for url in (self.index, self.group_page, self.profile):
+            with self.subTest(url=url):
+                first = self.guest_client.get(url)
+                with self.assertNumQueries(0):
+                    second = self.guest_client.get(url)
+                self.assertEqual(first.content, second.content)
+
+    def test_cached_page_answers_not_modified(self):
+        """Страница из кэша тоже отвечает 304 по ETag."""
+        etag = self.guest_client.get(self.index)['ETag']
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(
+                self.index, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_authorized_feed_not_cached(self):
+        """Авторизованный пользователь всегда получает свежую страницу."""
+        self.authorized_client.get(self.index)
+        response = self.authorized_client.get(self.index)
+        self.assertIsNotNone(response.context)
+
+    @override_settings(POSTS_MAX_PAGE_SIZE=50)
+    def test_page_size_in_cache_key(self):
+        """Размеры страниц кэшируются отдельно, ключ — после пределов."""
+        Post.objects.create(text='Второй пост', author=self.author)
+        small = self.guest_client.get(self.index, {'page_size': 1})
+        whole = self.guest_client.get(self.index)
+        self.assertNotContains(small, 'Первый пост')
+        self.assertContains(whole, 'Первый пост')
+        self.guest_client.get(self.index, {'page_size': 50})
+        with self.assertNumQueries(0):
+            cached_small = self.guest_client.get(
+                self.index, {'page_size': 1}
+            )
+            self.guest_client.get(self.index, {'page_size': 500})
+        self.assertEqual(cached_small.content, small.content)
+
+    def test_create_post_purges_only_affected_pages(self):
+        """Новый пост сбрасывает главную, свою группу и профиль автора."""
+        for url in (
+            self.index, self.group_page, self.profile, self.other_group_page
+        ):
+            self.guest_client.get(url)
+        self.authorized_client.post(
+            reverse('posts:create_post'),
+            data={'text': 'Свежий пост', 'group': self.group.pk},
+        )
+        for url in (self.index, self.group_page, self.profile):
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(response, 'Свежий пост')
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.other_group_page)
+
+    def test_edit_post_purges_old_and_new_group(self):
+        """Перенос поста в другую группу сбрасывает обе ленты групп."""
+        post = Post.objects.get()
+        self.guest_client.get(self.group_page)
+        self.guest_client.get(self.other_group_page)
+        self.authorized_client.post(
+            reverse('posts:post_edit', args=[post.pk]),
+            data={'text': 'Первый пост', 'group': self.other_group.pk},
+        )
+        self.assertNotContains(
+            self.guest_client.get(self.group_page), 'Первый пост'
+        )
+        self.assertContains(
+            self.guest_client.get(self.other_group_page), 'Первый пост'
+        )
+
+    def test_group_rename_purges_old_slug(self):
+        """Смена slug сбрасывает ленту, закэшированную по старому адресу."""
+        self.guest_client.get(self.group_page)
+        group = Group.objects.get(pk=self.group.pk)
+        group.slug = 'renamed-slug'
+        group.save()
+        response = self.guest_client.get(self.group_page)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+        self.assertContains(
+            self.guest_client.get(
+                reverse('posts:group_list', args=['renamed-slug'])
+            ),
+            'Первый пост',
+        )
+
+    def test_username_change_purges_old_profile(self):
+        """Смена имени сбрасывает профиль, закэшированный по старому адресу."""
+        self.guest_client.get(self.profile)
+        author = User.objects.get(pk=self.author.pk)
+        author.username = 'Переименованный'
+        author.save()
+        response = self.guest_client.get(self.profile)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+
+class FilePageCacheTests(AnonymousPageCacheTests):
+    """Те же сценарии на файловом бэкенде вместо локальной памяти."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.cache_settings = override_settings(CACHES={
+            'default': settings.CACHES['default'],
+            'pages': {
+                'BACKEND': (
+                    'django.core.cache.backends.filebased.FileBasedCache'
+                ),
+                'LOCATION': cls.cache_dir,
+            },
+        })
+        cls.cache_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.cache_settings.disable()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostsSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Искомый автор')
+        cls.another_author = User.objects.create_user(username='Другой автор')
+        cls.group = Group.objects.create(
+            title='Поисковая группа',
+            slug='search-slug',
+            description='Описание',
+        )
+        cls.best = Post.objects.create(
+            text='Котики котики котики и собаки',
+            author=cls.author,
+            group=cls.group,
+        )
+        cls.worse = Post.objects.create(
+            text='Длинный текст про погоду, огород, рыбалку и котиков',
+            author=cls.another_author,
+        )
+        Post.objects.create(text='Только про собак', author=cls.author)
+        cls.url = reverse('posts:search')
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, **params):
+        response = self.guest_client.get(self.url, params)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return list(response.context['page_obj'])
+
+    def test_search_ranks_results(self):
+        """Выдача отсортирована по релевантности, префиксы совпадают."""
+        self.assertEqual(self.search(q='котик'), [self.best, self.worse])
+
+    def test_search_filters_by_group_and_author(self):
+        """Выдачу можно сузить до группы и автора."""
+        self.assertEqual(
+            self.search(q='котик', group=self.group.slug), [self.best]
+        )
+        self.assertEqual(
+            self.search(q='котик', author=self.another_author.username),
+            [self.worse],
+        )
+
+    def test_index_follows_edit_and_delete(self):
+        """Правка и удаление поста сразу видны в поиске."""
+        post = Post.objects.get(pk=self.worse.pk)
+        post.text = 'Теперь про попугаев'
+        post.save()
+        self.assertEqual(self.search(q='котик'), [self.best])
+        self.assertEqual(self.search(q='попугаев'), [post])
+        post.delete()
+        self.assertEqual(self.search(q='попугаев'), [])
+
+    def test_query_syntax_is_escaped(self):
+        """Спецсимволы MATCH в запросе не ломают поиск."""
+        self.assertEqual(self.search(q='"котики" OR NOT*'), [])
+        self.assertEqual(self.search(q=''), [])
+
+    def test_admin_search_uses_index(self):
+        """Поиск в админке находит посты через индекс."""
+        admin = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        client = Client()
+        client.force_login(admin)
+        response = client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'собак'}
+        )
+        self.assertEqual(response.context['cl'].result_count, 2)
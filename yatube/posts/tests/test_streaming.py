@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.templatetags import navigation
+from posts.models import Group, Post, User
+
+
+@override_settings(POSTS_STREAMING_RENDER=True)
+class StreamingRenderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='Автор')
+        cls.group = Group.objects.create(
+            title='Группа', slug='group', description='Описание'
+        )
+        Post.objects.create(
+            author=cls.author, group=cls.group, text='Потоковый пост'
+        )
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=[cls.group.slug]),
+            reverse('posts:profile', args=[cls.author.username]),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_header_sent_before_posts_query(self):
+        """Первая часть — шапка; посты запрашиваются только после неё."""
+        for url in self.urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url)
+                    parts = iter(response.streaming_content)
+                    head = next(parts).decode()
+                self.assertIn('<header>', head)
+                self.assertNotIn('Потоковый пост', head)
+                self.assertFalse(any(
+                    'posts_post' in query['sql']
+                    for query in context.captured_queries
+                ))
+                self.assertIn('Потоковый пост', b''.join(parts).decode())
+
+    def test_same_page_as_buffered(self):
+        self.client.force_login(self.author)
+        for url in self.urls:
+            with self.subTest(url=url):
+                streamed = b''.join(self.client.get(url).streaming_content)
+                with override_settings(POSTS_STREAMING_RENDER=False):
+                    buffered = self.client.get(url)
+                self.assertEqual(streamed, buffered.content)
+
+    def test_each_part_rendered_once(self):
+        """Шапка и подвал рендерятся по разу: страница не рендерится дважды."""
+        with mock.patch.object(
+            navigation, 'header_html', wraps=navigation.header_html
+        ) as header_html, mock.patch.object(
+            navigation, 'footer_html', wraps=navigation.footer_html
+        ) as footer_html:
+            b''.join(self.client.get(self.urls[0]).streaming_content)
+        self.assertEqual(header_html.call_count, 1)
+        self.assertEqual(footer_html.call_count, 1)
+
+    @override_settings(POSTS_PAGE_CACHE=True)
+    def test_cached_pages_rendered_whole(self):
+        """Страница для кэша страниц не потоковая: её можно сохранить."""
+        caches['pages'].clear()
+        response = self.client.get(self.urls[0])
+        self.assertFalse(response.streaming)
+        with self.assertNumQueries(0):
+            self.client.get(self.urls[0])
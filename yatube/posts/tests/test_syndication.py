@@ -0,0 +1,186 @@
+import json
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts import syndication
+from posts.models import Group, Post, User
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+on_commit_now = mock.patch(
+    'posts.signals.transaction.on_commit', lambda callback: callback()
+)
+
+
+@on_commit_now
+class SyndicationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username='Автор', first_name='Лев', last_name='Толстой'
+        )
+        self.other = User.objects.create_user(username='Другой')
+        self.group = Group.objects.create(
+            title='Классика', slug='classic', description='Описание'
+        )
+        self.posts = [
+            Post.objects.create(
+                author=self.author, group=self.group, text=f'Глава {number}'
+            )
+            for number in range(3)
+        ]
+        self.foreign = Post.objects.create(author=self.other, text='Чужой')
+        self.client = Client()
+
+    def json_feed(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response['Content-Type'], syndication.JSON_FEED_TYPE)
+        items = json.loads(response.content)['items']
+        return [int(item['id']) for item in items]
+
+    def test_formats(self):
+        """RSS, Atom и JSON Feed: посты в порядке лент сайта."""
+        expected = [post.pk for post in reversed(self.posts)]
+        url = reverse('posts:group_feed', args=[self.group.slug, 'rss'])
+        rss = ElementTree.fromstring(self.client.get(url).content)
+        self.assertEqual(
+            [item.findtext('title') for item in rss.iter('item')],
+            ['Глава 2', 'Глава 1', 'Глава 0'],
+        )
+        self.assertEqual(
+            rss.find('channel').findtext('title'), self.group.title
+        )
+        url = reverse(
+            'posts:profile_feed', args=[self.author.username, 'atom']
+        )
+        atom = ElementTree.fromstring(self.client.get(url).content)
+        entries = list(atom.iter(f'{ATOM}entry'))
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(
+            entries[0].find(f'{ATOM}author').findtext(f'{ATOM}name'),
+            'Лев Толстой',
+        )
+        self.assertEqual(
+            self.json_feed(reverse('posts:index_feed', args=['json'])),
+            [self.foreign.pk] + expected,
+        )
+        self.assertEqual(self.client.get('/feed/xml/').status_code, 404)
+
+    def test_new_posts_appended_incrementally(self):
+        """Новые посты дописываются к кэшу, старые не сериализуются."""
+        url = reverse('posts:index_feed', args=['json'])
+        self.json_feed(url)
+        post = Post.objects.create(author=self.other, text='Новый')
+        with mock.patch(
+            'posts.syndication.serialize_post',
+            wraps=syndication.serialize_post,
+        ) as serialize:
+            ids = self.json_feed(url)
+        self.assertEqual(serialize.call_count, 1)
+        self.assertEqual(ids[0], post.pk)
+        self.assertEqual(len(ids), 5)
+
+    @override_settings(POSTS_SYNDICATION_SIZE=2)
+    def test_size_limit(self):
+        url = reverse('posts:index_feed', args=['json'])
+        self.json_feed(url)
+        post = Post.objects.create(author=self.other, text='Новый')
+        self.assertEqual(self.json_feed(url), [post.pk, self.foreign.pk])
+
+    def test_edits_and_deletes_rebuild(self):
+        url = reverse('posts:group_feed', args=[self.group.slug, 'json'])
+        self.json_feed(url)
+        moved = self.posts[0]
+        moved.group = None
+        moved.save()
+        self.assertNotIn(moved.pk, self.json_feed(url))
+        self.posts[1].delete()
+        self.assertEqual(self.json_feed(url), [self.posts[2].pk])
+        self.group.title = 'Новая классика'
+        self.group.save()
+        response = self.client.get(url)
+        self.assertEqual(
+            json.loads(response.content)['items'][0]['tags'],
+            ['Новая классика'],
+        )
+
+    def test_renames_rebuild_related_feeds(self):
+        """Имя автора и название группы меняются во всех лентах с ними."""
+        group_url = reverse('posts:group_feed', args=[self.group.slug, 'json'])
+        profile_url = reverse(
+            'posts:profile_feed', args=[self.author.username, 'json']
+        )
+        self.client.get(group_url)
+        self.client.get(profile_url)
+        self.author.first_name = 'Алексей'
+        self.author.save()
+        group_items = json.loads(self.client.get(group_url).content)['items']
+        self.assertEqual(
+            group_items[0]['authors'][0]['name'], 'Алексей Толстой'
+        )
+        self.client.get(profile_url)
+        self.group.title = 'Новая классика'
+        self.group.save()
+        profile_items = json.loads(
+            self.client.get(profile_url).content
+        )['items']
+        self.assertEqual(profile_items[0]['tags'], ['Новая классика'])
+
+    def test_rename_changes_etag(self):
+        """Переименование меняет ETag: опрос не получит устаревший 304."""
+        url = reverse('posts:group_feed', args=[self.group.slug, 'json'])
+        response = self.client.get(url)
+        self.assertFalse(response.has_header('Last-Modified'))
+        self.author.first_name = 'Алексей'
+        self.author.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_group_delete_rebuilds_author_feeds(self):
+        url = reverse(
+            'posts:profile_feed', args=[self.author.username, 'json']
+        )
+        self.client.get(url)
+        self.group.delete()
+        items = json.loads(self.client.get(url).content)['items']
+        self.assertEqual(items[0]['tags'], [])
+
+    def test_since_id(self):
+        url = reverse('posts:index_feed', args=['json'])
+        self.assertEqual(
+            self.json_feed(url, since_id=self.posts[1].pk),
+            [self.foreign.pk, self.posts[2].pk],
+        )
+        self.assertEqual(self.json_feed(url, since_id=self.foreign.pk), [])
+        self.assertEqual(
+            self.client.get(url, {'since_id': 'вчера'}).status_code, 400
+        )
+
+    def test_conditional_get(self):
+        """Повторный опрос без новых постов — 304 и один запрос к базе."""
+        url = reverse('posts:index_feed', args=['rss'])
+        response = self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            repeated = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(repeated.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        Post.objects.create(author=self.other, text='Новый')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+
+    def test_feed_links_on_pages(self):
+        response = self.client.get(
+            reverse('posts:group_list', args=[self.group.slug])
+        )
+        self.assertContains(
+            response,
+            reverse('posts:group_feed', args=[self.group.slug, 'rss']),
+        )
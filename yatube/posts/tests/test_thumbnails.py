@@ -0,0 +1,165 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import Executor, Future
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from posts import thumbnails
+from posts.models import Post, User
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+class CollectingExecutor(Executor):
+    """Копит задачи, пока тест не выполнит их сам: «фоновый» пул."""
+
+    def __init__(self):
+        self.tasks = []
+
+    def submit(self, function, *args, **kwargs):
+        self.tasks.append((function, args, kwargs))
+        return Future()
+
+    def run(self):
+        tasks, self.tasks = self.tasks, []
+        for function, args, kwargs in tasks:
+            function(*args, **kwargs)
+
+
+def image_file(name='cat.png', size=(1200, 800)):
+    content = BytesIO()
+    Image.new('RGB', size, 'orange').save(content, 'PNG')
+    return SimpleUploadedFile(name, content.getvalue(), 'image/png')
+
+
+def thumbnail_names(post):
+    return [
+        url[len('/media/'):] for url in post.thumbnail_urls.values()
+    ]
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+@mock.patch('posts.thumbnails.transaction.on_commit', lambda task: task())
+class ThumbnailTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Фотограф')
+        self.client = Client()
+        self.client.force_login(self.author)
+        self.pool = CollectingExecutor()
+        patcher = mock.patch(
+            'posts.thumbnails.thumbnail_pool', lambda: self.pool
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_post(self, image):
+        self.client.post(
+            reverse('posts:create_post'),
+            {'text': 'С картинкой', 'image': image},
+        )
+        return Post.objects.get(text='С картинкой')
+
+    def test_thumbnails_made_in_background(self):
+        """Пост создаётся сразу, превью появляются после работы пула."""
+        post = self.create_post(image_file())
+        self.assertTrue(post.image.name.startswith('posts/cat'))
+        self.assertEqual(post.thumbnails, '')
+        self.assertEqual(len(self.pool.tasks), 1)
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, 'img/placeholder.svg')
+
+        self.pool.run()
+        post.refresh_from_db()
+        urls = post.thumbnail_urls
+        self.assertEqual(set(urls), {'feed', 'detail'})
+        for name in thumbnail_names(post):
+            self.assertTrue(os.path.exists(os.path.join(MEDIA_ROOT, name)))
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, urls['feed'])
+        self.assertNotContains(response, 'img/placeholder.svg')
+        response = self.client.get(
+            reverse('posts:post_detail', args=[post.pk])
+        )
+        self.assertContains(response, urls['detail'])
+
+    def test_thumbnails_written_once(self):
+        post = self.create_post(image_file())
+        self.pool.run()
+        post.refresh_from_db()
+        paths = [
+            os.path.join(MEDIA_ROOT, name) for name in thumbnail_names(post)
+        ]
+        mtimes = [os.stat(path).st_mtime_ns for path in paths]
+        backend = 'sorl.thumbnail.base.ThumbnailBackend'
+        with mock.patch(f'{backend}._create_thumbnail') as create:
+            thumbnails.make_thumbnails(post.pk, post.image.name)
+        create.assert_not_called()
+        self.assertEqual(
+            [os.stat(path).st_mtime_ns for path in paths], mtimes
+        )
+
+    def test_replaced_image_gets_new_thumbnails(self):
+        post = self.create_post(image_file())
+        self.pool.run()
+        self.client.post(
+            reverse('posts:post_edit', args=[post.pk]),
+            {'text': 'С картинкой', 'image': image_file('dog.png')},
+        )
+        post.refresh_from_db()
+        self.assertTrue(post.image.name.startswith('posts/dog'))
+        self.assertEqual(post.thumbnails, '')
+        self.pool.run()
+        post.refresh_from_db()
+        self.assertTrue(post.thumbnails)
+
+    def test_stale_task_skipped(self):
+        """Задача для заменённой картинки ничего не пишет."""
+        post = self.create_post(image_file())
+        self.assertFalse(
+            thumbnails.make_thumbnails(post.pk, 'posts/other.png')
+        )
+        post.refresh_from_db()
+        self.assertEqual(post.thumbnails, '')
+
+    def test_form_reads_only_header(self):
+        """Форма не декодирует картинку целиком и отвергает не картинки."""
+        image = image_file(size=(4000, 3000))
+        with mock.patch.object(Image.Image, 'verify') as verify, \
+                mock.patch.object(Image.Image, 'load') as load:
+            self.create_post(image)
+        verify.assert_not_called()
+        load.assert_not_called()
+        response = self.client.post(
+            reverse('posts:create_post'),
+            {
+                'text': 'Не картинка',
+                'image': SimpleUploadedFile('cat.png', b'text', 'image/png'),
+            },
+        )
+        self.assertFormError(
+            response, 'form', 'image',
+            'Загрузите правильное изображение. Файл, который вы загрузили, '
+            'поврежден или не является изображением.',
+        )
+
+    def test_command_makes_missing_thumbnails(self):
+        self.create_post(image_file())
+        self.pool.tasks.clear()
+        output = StringIO()
+        call_command('make_thumbnails', stdout=output)
+        self.assertIn('Нарезано превью: 1', output.getvalue())
+        self.assertTrue(Post.objects.get(text='С картинкой').thumbnails)
@@ -0,0 +1,157 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import (Client, SimpleTestCase, TestCase,
+                         override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.bulk import bulk_create_posts
+from posts.models import Post, User
+from posts.timeline import (LOCK_KEY, TIMELINE_KEY, check_timeline_cache,
+                            key_pub_date, load_timeline, timeline_key)
+from posts.utils import POST_PER_PAGE
+
+TIMELINE_SIZE = 15
+
+on_commit_now = mock.patch(
+    'posts.timeline.transaction.on_commit', lambda callback: callback()
+)
+
+
+@override_settings(POSTS_TIMELINE=True, POSTS_TIMELINE_SIZE=TIMELINE_SIZE)
+class HomeTimelineTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(username='Автор ленты')
+        now = timezone.now()
+        for number in range(25):
+            post = Post.objects.create(
+                author=self.author, text=f'Пост ленты {number}'
+            )
+            Post.objects.filter(pk=post.pk).update(
+                pub_date=now - timedelta(minutes=number)
+            )
+        self.index = reverse('posts:index')
+
+    def expected(self, page=1):
+        posts = Post.objects.order_by('-pub_date', '-pk')
+        bottom = (page - 1) * POST_PER_PAGE
+        return list(posts[bottom:bottom + POST_PER_PAGE])
+
+    def page(self, number=1):
+        response = Client().get(self.index, {'page': number})
+        return response.context['page_obj']
+
+    def window(self):
+        return [-pk for _, pk in load_timeline()['keys']]
+
+    def test_pages_match_database(self):
+        """Страницы из ленты и за её окном совпадают с выдачей базы."""
+        for number in (1, 2, 3):
+            with self.subTest(page=number):
+                page_obj = self.page(number)
+                self.assertEqual(list(page_obj), self.expected(number))
+                self.assertEqual(page_obj.paginator.count, 25)
+
+    def test_first_page_without_sorting(self):
+        """Первая страница из прогретой ленты не сортирует таблицу."""
+        self.page()
+        with CaptureQueriesContext(connection) as queries:
+            self.page()
+        post_queries = [
+            query['sql'] for query in queries
+            if 'FROM "posts_post"' in query['sql']
+        ]
+        self.assertEqual(len(post_queries), 1)
+        self.assertNotIn('ORDER BY', post_queries[0])
+        self.assertNotIn('COUNT', post_queries[0])
+
+    @on_commit_now
+    def test_incremental_updates(self):
+        """Создание, перенос за окно и удаление меняют ленту без сборки."""
+        load_timeline()
+        new_post = Post.objects.create(author=self.author, text='Свежий')
+        self.assertEqual(self.window()[0], new_post.pk)
+        self.assertEqual(load_timeline()['count'], 26)
+        self.assertEqual(len(self.window()), TIMELINE_SIZE)
+
+        new_post.pub_date = timezone.now() - timedelta(days=10)
+        new_post.save()
+        self.assertNotIn(new_post.pk, self.window())
+        self.assertEqual(len(self.window()), TIMELINE_SIZE - 1)
+        self.assertEqual(list(self.page(2)), self.expected(2))
+
+        first = self.window()[0]
+        Post.objects.get(pk=first).delete()
+        self.assertNotIn(first, self.window())
+        self.assertEqual(load_timeline()['count'], 25)
+        self.assertEqual(list(self.page()), self.expected())
+
+    @on_commit_now
+    def test_small_table_fits_window(self):
+        """Пока постов меньше окна, в ленту попадает любой пост."""
+        Post.objects.all().delete()
+        cache.clear()
+        post = Post.objects.create(author=self.author, text='Один')
+        load_timeline()
+        old = Post.objects.create(author=self.author, text='Старый')
+        old.pub_date = post.pub_date - timedelta(days=1)
+        old.save()
+        self.assertEqual(self.window(), [post.pk, old.pk])
+        self.assertEqual(list(self.page()), [post, old])
+
+    def test_rolled_back_save_keeps_timeline(self):
+        """Лента меняется только после коммита, откат её не трогает."""
+        load_timeline()
+        # посты из setUp уже учтены сборкой
+        del connection.run_on_commit[:]
+        try:
+            with transaction.atomic():
+                Post.objects.create(author=self.author, text='Откачен')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        post = Post.objects.create(author=self.author, text='Сохранён')
+        self.assertNotIn(post.pk, self.window())
+        # TestCase не коммитит: выполняем то, что осталось до коммита
+        for _, callback in connection.run_on_commit:
+            callback()
+        self.assertEqual(self.window()[0], post.pk)
+        self.assertEqual(load_timeline()['count'], 26)
+
+    def test_bulk_create_resets_timeline(self):
+        load_timeline()
+        with mock.patch(
+            'posts.bulk.transaction.on_commit', lambda callback: callback()
+        ):
+            bulk_create_posts([Post(author=self.author, text='Пачкой')])
+        self.assertIsNone(cache.get(TIMELINE_KEY))
+
+    @on_commit_now
+    def test_busy_lock_drops_timeline(self):
+        """Не дождавшись блокировки, запись сбрасывает ленту."""
+        load_timeline()
+        cache.set(LOCK_KEY, 1)
+        Post.objects.create(author=self.author, text='Без блокировки')
+        self.assertIsNone(cache.get(TIMELINE_KEY))
+        self.assertEqual(len(self.page()), POST_PER_PAGE)
+
+    def test_key_round_trip(self):
+        pub_date = timezone.now()
+        self.assertEqual(key_pub_date(timeline_key(pub_date, 1)), pub_date)
+
+
+class TimelineCacheCheckTests(SimpleTestCase):
+    @override_settings(POSTS_TIMELINE=True, POSTS_TIMELINE_TIMEOUT=None)
+    def test_endless_timeline_needs_shared_cache(self):
+        self.assertEqual(
+            [error.id for error in check_timeline_cache(None)], ['posts.E001']
+        )
+
+    @override_settings(POSTS_TIMELINE=True)
+    def test_finite_timeout_allowed(self):
+        self.assertEqual(check_timeline_cache(None), [])
@@ -0,0 +1,162 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.counters import rebuild_counters
+from posts.models import Group, ImportCheckpoint, Post
+
+User = get_user_model()
+
+
+class PostsTransferTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.author = User.objects.create_user(username='Переносимый автор')
+        self.group = Group.objects.create(
+            title='Переносимая группа',
+            slug='transfer-slug',
+            description='Описание',
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def write_ndjson(self, name, records):
+        with open(self.path(name), 'w', encoding='utf-8') as stream:
+            for record in records:
+                stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+        return self.path(name)
+
+    def records(self, count):
+        return [
+            {
+                'text': f'Импортированный пост {number}',
+                'pub_date': f'2020-01-{number % 28 + 1:02d}T10:00:00+03:00',
+                'author': self.author.username,
+                'group': self.group.slug if number % 2 else '',
+            }
+            for number in range(count)
+        ]
+
+    def test_export_import_round_trip(self):
+        """Выгруженные посты загружаются обратно с датами и группами."""
+        for fmt in ('ndjson', 'csv'):
+            with self.subTest(fmt=fmt):
+                Post.objects.all().delete()
+                path = self.write_ndjson('source.ndjson', self.records(5))
+                call_command('import_posts', path, stderr=StringIO())
+                exported = self.path(f'posts.{fmt}')
+                call_command('export_posts', exported, stderr=StringIO())
+                original = list(Post.objects.values_list(
+                    'text', 'pub_date', 'author_id', 'group_id'
+                ).order_by('text'))
+                Post.objects.all().delete()
+                call_command('import_posts', exported, stderr=StringIO())
+                imported = list(Post.objects.values_list(
+                    'text', 'pub_date', 'author_id', 'group_id'
+                ).order_by('text'))
+                self.assertEqual(imported, original)
+                self.assertEqual(
+                    original[0][1].isoformat(), '2020-01-01T07:00:00+00:00'
+                )
+
+    def test_import_keeps_counters_and_search_in_sync(self):
+        """После импорта счётчики сходятся, а посты ищутся."""
+        path = self.write_ndjson('source.ndjson', self.records(7))
+        call_command(
+            'import_posts', path, '--batch-size', '3', stderr=StringIO()
+        )
+        self.assertEqual(rebuild_counters(fix=False), ({}, {}))
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 3)
+        response = Client().get(
+            reverse('posts:search'), {'q': 'Импортированный'}
+        )
+        self.assertEqual(len(response.context['page_obj']), 7)
+
+    def test_import_skips_bad_records(self):
+        """Записи без автора, группы или текста пропускаются с ошибкой."""
+        records = self.records(2) + [
+            {'text': 'x', 'author': 'Нет такого'},
+            {'text': 'x', 'author': self.author.username, 'group': 'nope'},
+            {'text': '', 'author': self.author.username},
+        ]
+        errors = StringIO()
+        call_command(
+            'import_posts',
+            self.write_ndjson('source.ndjson', records),
+            stderr=errors,
+        )
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertIn('Запись 3', errors.getvalue())
+
+    def test_import_resumes_from_checkpoint(self):
+        """После сбоя импорт продолжается с последней целой пачки."""
+        path = self.write_ndjson('source.ndjson', self.records(6))
+        original = Post.objects.bulk_create
+        calls = []
+
+        def failing_bulk_create(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError('сбой')
+            return original(*args, **kwargs)
+
+        with mock.patch.object(
+            Post.objects, 'bulk_create', failing_bulk_create
+        ):
+            with self.assertRaises(RuntimeError):
+                call_command(
+                    'import_posts', path, '--batch-size', '2',
+                    stderr=StringIO(),
+                )
+        self.assertEqual(Post.objects.count(), 2)
+        call_command(
+            'import_posts', path, '--batch-size', '2', '--resume',
+            stderr=StringIO(),
+        )
+        self.assertEqual(Post.objects.count(), 6)
+        self.assertFalse(ImportCheckpoint.objects.exists())
+
+    def test_failed_checkpoint_rolls_back_batch(self):
+        """Пачка и контрольная точка коммитятся вместе: дублей нет."""
+        path = self.write_ndjson('source.ndjson', self.records(6))
+        original = ImportCheckpoint.objects.update_or_create
+        calls = []
+
+        def failing_update_or_create(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError('сбой')
+            return original(*args, **kwargs)
+
+        with mock.patch.object(
+            ImportCheckpoint.objects, 'update_or_create',
+            failing_update_or_create,
+        ):
+            with self.assertRaises(RuntimeError):
+                call_command(
+                    'import_posts', path, '--batch-size', '2',
+                    stderr=StringIO(),
+                )
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(ImportCheckpoint.objects.get().processed, 2)
+        call_command(
+            'import_posts', path, '--batch-size', '2', '--resume',
+            stderr=StringIO(),
+        )
+        self.assertEqual(
+            sorted(Post.objects.values_list('text', flat=True)),
+            sorted(record['text'] for record in self.records(6)),
+        )
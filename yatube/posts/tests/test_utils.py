@@ -0,0 +1,116 @@
+from django.contrib.auth import get_user_model
+from django.test import (Client, RequestFactory, SimpleTestCase, TestCase,
+                         override_settings)
+from django.urls import resolve, reverse
+
+from posts.models import Post
+from posts.utils import (POST_PER_PAGE, CursorPaginator, decode_cursor,
+                         page_size)
+
+User = get_user_model()
+
+
+class CursorPaginatorTests(TestCase):
+    page_limit_second = 3
+
+    count_range = POST_PER_PAGE + page_limit_second
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Курсорный автор')
+        Post.objects.bulk_create(
+            Post(text=f'Пост номер {count}', author=cls.user)
+            for count in range(cls.count_range)
+        )
+        cls.ordered = list(Post.objects.order_by('-pub_date', '-pk'))
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_cursor_pages_walk_whole_feed(self):
+        """Курсоры проходят ленту вперёд и назад без пропусков."""
+        paginator = CursorPaginator(Post.objects.all(), POST_PER_PAGE)
+        first_page = paginator.get_page(None)
+        self.assertEqual(list(first_page), self.ordered[:POST_PER_PAGE])
+        self.assertFalse(first_page.has_previous())
+        self.assertTrue(first_page.has_next())
+
+        second_page = paginator.get_page(first_page.next_cursor)
+        self.assertEqual(list(second_page), self.ordered[POST_PER_PAGE:])
+        self.assertFalse(second_page.has_next())
+
+        back_page = paginator.get_page(second_page.previous_cursor)
+        self.assertEqual(list(back_page), self.ordered[:POST_PER_PAGE])
+
+    def test_cursor_is_opaque_and_broken_cursor_is_first_page(self):
+        """Токен непрозрачен, а испорченный токен даёт первую страницу."""
+        paginator = CursorPaginator(Post.objects.all(), POST_PER_PAGE)
+        self.assertIsNone(decode_cursor('не-курсор'))
+        page = paginator.get_page('не-курсор')
+        self.assertEqual(list(page), self.ordered[:POST_PER_PAGE])
+
+    def test_cursor_page_cost_does_not_depend_on_depth(self):
+        """Страница по курсору — один запрос без COUNT(*)."""
+        paginator = CursorPaginator(Post.objects.all(), POST_PER_PAGE)
+        cursor = paginator.get_page(None).next_cursor
+        with self.assertNumQueries(1):
+            list(paginator.get_page(cursor))
+
+    @override_settings(POSTS_PAGINATION='cursor')
+    def test_index_uses_cursor_mode(self):
+        """В режиме cursor главная отдаёт страницы по ?cursor=."""
+        response = self.guest_client.get(reverse('posts:index'))
+        page_obj = response.context['page_obj']
+        self.assertEqual(len(page_obj), POST_PER_PAGE)
+        self.assertContains(response, f'?cursor={page_obj.next_cursor}')
+
+        response = self.guest_client.get(
+            reverse('posts:index') + f'?cursor={page_obj.next_cursor}'
+        )
+        self.assertEqual(
+            len(response.context['page_obj']), self.page_limit_second
+        )
+
+    def test_page_size_param(self):
+        """Размер страницы из ?page_size= сохраняется в ссылках."""
+        response = self.guest_client.get(
+            reverse('posts:index'), {'page_size': 4}
+        )
+        page_obj = response.context['page_obj']
+        self.assertEqual(list(page_obj), self.ordered[:4])
+        self.assertContains(response, 'page_size=4&amp;page=2')
+
+
+@override_settings(
+    POSTS_PAGE_SIZE=10,
+    POSTS_MAX_PAGE_SIZE=50,
+    POSTS_PAGE_SIZES={'posts:search': (5, 20)},
+)
+class PageSizeTests(SimpleTestCase):
+    def size(self, url, **params):
+        request = RequestFactory().get(url, params)
+        request.resolver_match = resolve(url)
+        return page_size(request)
+
+    def test_bounded_by_view_limits(self):
+        """?page_size= урезается до максимума своего представления."""
+        index = reverse('posts:index')
+        search = reverse('posts:search')
+        cases = (
+            (index, {}, 10),
+            (index, {'page_size': '30'}, 30),
+            (index, {'page_size': '500'}, 50),
+            (search, {}, 5),
+            (search, {'page_size': '500'}, 20),
+        )
+        for url, params, expected in cases:
+            with self.subTest(url=url, params=params):
+                self.assertEqual(self.size(url, **params), expected)
+
+    def test_broken_size_is_default(self):
+        for value in ('', 'много', '0', '-5', '1.5'):
+            with self.subTest(value=value):
+                self.assertEqual(
+                    self.size(reverse('posts:index'), page_size=value), 10
+                )
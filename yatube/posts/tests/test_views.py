@@ -283,3 +283,52 @@ class PostsPaginatorViewsTests(TestCase):
         )
 
         self.assertEqual(len(response.context.get('page_obj').object_list), 3)
+
+
+class PostsFeedQueriesTests(TestCase):
+    """Число запросов ленты не зависит от количества постов на странице."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='Автор ленты', first_name='Имя', last_name='Фамилия'
+        )
+        cls.group = Group.objects.create(
+            title='Группа ленты',
+            slug='feed-slug',
+            description='Описание группы ленты',
+        )
+        cls.feeds = (
+            (reverse('posts:index'), 2),
+            (reverse('posts:group_list', args=[cls.group.slug]), 2),
+            (reverse('posts:profile', args=[cls.user.username]), 2),
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def create_posts(self, count):
+        for number in range(count):
+            author = User.objects.create_user(username=f'Автор {number}')
+            Post.objects.create(
+                text=f'Пост ленты {number}',
+                author=self.user if number % 2 else author,
+                group=self.group,
+            )
+
+    def assert_feed_queries(self):
+        for url, queries in self.feeds:
+            with self.subTest(url=url):
+                with self.assertNumQueries(queries):
+                    self.guest_client.get(url)
+
+    def test_feed_queries_one_post(self):
+        """Лента из пары постов укладывается в фиксированное число запросов."""
+        self.create_posts(2)
+        self.assert_feed_queries()
+
+    def test_feed_queries_full_page(self):
+        """Полная страница ленты — столько же запросов, сколько и пара."""
+        self.create_posts(POST_PER_PAGE * 2)
+        self.assert_feed_queries()
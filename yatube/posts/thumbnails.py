@@ -0,0 +1,113 @@
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from sorl.thumbnail import get_thumbnail
+
+from core.tasks import enqueue, queue_enabled, task
+
+from .models import Post
+
+logger = logging.getLogger(__name__)
+
+# Размер превью: геометрия sorl-thumbnail и её опции
+THUMBNAILS = {
+    'feed': ('960x339', {'crop': 'center', 'upscale': True}),
+    'detail': ('960', {'upscale': False}),
+}
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending = set()
+
+
+def thumbnail_sizes():
+    return getattr(settings, 'POSTS_THUMBNAILS', THUMBNAILS)
+
+
+def thumbnail_pool():
+    """Общий на процесс пул потоков нарезки; создаётся при первой задаче."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                getattr(settings, 'POSTS_THUMBNAIL_THREADS', 2),
+                thread_name_prefix='thumbnails',
+            )
+        return _pool
+
+
+def image_name(instance):
+    """Имя картинки из __dict__, если поле загружено, иначе None."""
+    if 'image' not in instance.__dict__:
+        return None
+    value = instance.__dict__['image']
+    return getattr(value, 'name', value) or ''
+
+
+def remember_image(instance):
+    instance._image_name = image_name(instance)
+
+
+def image_replaced(instance):
+    name = image_name(instance)
+    return name is not None and name != getattr(instance, '_image_name', name)
+
+
+def schedule_thumbnails(post):
+    """Отдаёт пост без превью в нарезку.
+
+    С очередью задач — задачей в той же транзакции, иначе после
+    коммита в пул потоков процесса.
+    """
+    if not post.image or post.thumbnails:
+        return
+    name = post.image.name
+    if queue_enabled():
+        enqueue(
+            make_thumbnails, post.pk, name, key=f'thumbnails:{post.pk}:{name}'
+        )
+        return
+    transaction.on_commit(lambda: submit_thumbnails(post.pk, name))
+
+
+def submit_thumbnails(post_id, name):
+    with _pool_lock:
+        if (post_id, name) in _pending:
+            return
+        _pending.add((post_id, name))
+    thumbnail_pool().submit(make_thumbnails_in_pool, post_id, name)
+
+
+def make_thumbnails_in_pool(post_id, name):
+    try:
+        make_thumbnails(post_id, name)
+    except Exception:
+        logger.exception('Не удалось нарезать превью поста %s', post_id)
+    finally:
+        with _pool_lock:
+            _pending.discard((post_id, name))
+        connections.close_all()
+
+
+@task()
+def make_thumbnails(post_id, name):
+    """Режет превью всех размеров и сохраняет их пути в пост.
+
+    Если картинку успели заменить или пост удалили — ничего не делает.
+    Файл превью sorl-thumbnail пишет один раз: повторный вызов найдёт
+    его в своём хранилище ключей.
+    """
+    post = Post.objects.filter(pk=post_id, image=name).first()
+    if post is None:
+        return False
+    post.thumbnails = json.dumps({
+        size: get_thumbnail(post.image, geometry, **options).name
+        for size, (geometry, options) in thumbnail_sizes().items()
+    })
+    # updated меняется, чтобы условный GET не отдал 304 с заглушкой
+    post.save(update_fields=('thumbnails', 'updated'))
+    return True
@@ -0,0 +1,211 @@
+import bisect
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.checks import Error, Tags, register
+from django.core.paginator import Paginator
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from .models import Post
+
+TIMELINE_KEY = 'home_timeline'
+LOCK_KEY = 'home_timeline:lock'
+LOCK_TIMEOUT = 5
+LOCK_ATTEMPTS = 20
+LOCK_WAIT = 0.005
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def timeline_enabled():
+    return getattr(settings, 'POSTS_TIMELINE', False)
+
+
+def timeline_size():
+    return getattr(settings, 'POSTS_TIMELINE_SIZE', 200)
+
+
+def timeline_cache():
+    """Кэш ленты: правки видны всем процессам, только если он общий."""
+    return caches[getattr(settings, 'POSTS_TIMELINE_CACHE', 'default')]
+
+
+def timeline_timeout():
+    """Сколько живёт лента; None — вечно, годится только общему кэшу."""
+    return getattr(settings, 'POSTS_TIMELINE_TIMEOUT', 60)
+
+
+LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_timeline_cache(app_configs, **kwargs):
+    """Вечная лента в кэше процесса разойдётся с базой у других воркеров."""
+    if not timeline_enabled() or timeline_timeout() is not None:
+        return []
+    alias = getattr(settings, 'POSTS_TIMELINE_CACHE', 'default')
+    if settings.CACHES[alias]['BACKEND'] not in LOCAL_CACHES:
+        return []
+    return [Error(
+        f'Кэш ленты "{alias}" не общий для процессов.',
+        hint='Задайте POSTS_TIMELINE_TIMEOUT или общий POSTS_TIMELINE_CACHE.',
+        id='posts.E001',
+    )]
+
+
+def timeline_key(pub_date, pk):
+    """Ключ поста в ленте: по возрастанию ключей — от новых к старым."""
+    return (-((pub_date - EPOCH) // MICROSECOND), -pk)
+
+
+def key_pub_date(key):
+    return EPOCH - key[0] * MICROSECOND
+
+
+@contextmanager
+def timeline_lock():
+    """Блокировка через cache.add; если не дождались — отдаёт False."""
+    cache = timeline_cache()
+    for _ in range(LOCK_ATTEMPTS):
+        if cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+            try:
+                yield True
+            finally:
+                cache.delete(LOCK_KEY)
+            return
+        time.sleep(LOCK_WAIT)
+    yield False
+
+
+def build_timeline():
+    """Собирает ленту заново из основной базы: реплика может отставать."""
+    posts = Post.objects.db_manager(DEFAULT_DB_ALIAS)
+    rows = posts.order_by('-pub_date', '-pk').values_list(
+        'pub_date', 'pk'
+    )[:timeline_size()]
+    return {
+        'keys': [timeline_key(pub_date, pk) for pub_date, pk in rows],
+        'count': posts.count(),
+    }
+
+
+def load_timeline():
+    """Материализованная лента главной или None, если её нет и не собрать.
+
+    В ленте — ключи самых новых постов и общее число постов. Ключи —
+    всегда точное начало ленты: если пост выпал за окно, окно короче,
+    но не врёт.
+    """
+    cache = timeline_cache()
+    timeline = cache.get(TIMELINE_KEY)
+    if timeline is not None:
+        return timeline
+    with timeline_lock() as locked:
+        if not locked:
+            return None
+        timeline = build_timeline()
+        cache.set(TIMELINE_KEY, timeline, timeline_timeout())
+    return timeline
+
+
+def update_timeline(change):
+    """Применяет change к ленте под блокировкой.
+
+    Ленты нет — менять нечего, соберётся при чтении. Не дождались
+    блокировки — сбрасываем, чтобы не разойтись с базой.
+    """
+    if not timeline_enabled():
+        return
+    cache = timeline_cache()
+    with timeline_lock() as locked:
+        if not locked:
+            cache.delete(TIMELINE_KEY)
+            return
+        timeline = cache.get(TIMELINE_KEY)
+        if timeline is None:
+            return
+        change(timeline)
+        cache.set(TIMELINE_KEY, timeline, timeline_timeout())
+
+
+def remove_key(keys, pk):
+    for index, key in enumerate(keys):
+        if key[1] == -pk:
+            del keys[index]
+            return True
+    return False
+
+
+def timeline_saved(posts, created):
+    """Добавляет или передвигает посты после коммита их сохранения.
+
+    Откаченное сохранение ленту не трогает. Ключи считаются сразу:
+    к коммиту объекты могут измениться.
+    """
+    saved = [(post.pk, timeline_key(post.pub_date, post.pk)) for post in posts]
+
+    def change(timeline):
+        keys = timeline['keys']
+        for pk, key in saved:
+            remove_key(keys, pk)
+            if created:
+                timeline['count'] += 1
+            everything = len(keys) == timeline['count'] - 1
+            if everything or (keys and key < keys[-1]):
+                bisect.insort(keys, key)
+        del keys[timeline_size():]
+
+    transaction.on_commit(lambda: update_timeline(change))
+
+
+def timeline_deleted(pk):
+    """Убирает пост из ленты после коммита удаления."""
+    def change(timeline):
+        remove_key(timeline['keys'], pk)
+        timeline['count'] -= 1
+
+    transaction.on_commit(lambda: update_timeline(change))
+
+
+def reset_timeline():
+    """Для массовых изменений мимо сигналов: лента соберётся заново."""
+    timeline_cache().delete(TIMELINE_KEY)
+
+
+class TimelinePaginator(Paginator):
+    """Страницы главной из материализованной ленты.
+
+    Страница внутри окна — выборка постов по id, без сортировки
+    и COUNT(*); страницы за окном идут в базу как обычно.
+    """
+
+    def __init__(self, object_list, per_page, timeline):
+        super().__init__(object_list.order_by('-pub_date', '-pk'), per_page)
+        self.timeline = timeline
+
+    @property
+    def count(self):
+        return self.timeline['count']
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        keys = self.timeline['keys']
+        if top > len(keys) and len(keys) < self.count:
+            return super().page(number)
+        ids = [-pk for _, pk in keys[bottom:top]]
+        posts = self.object_list.in_bulk(ids)
+        return self._get_page(
+            [posts[pk] for pk in ids if pk in posts], number, self
+        )
+
+    def newest_pub_date(self):
+        keys = self.timeline['keys']
+        return key_pub_date(keys[0]) if keys else None
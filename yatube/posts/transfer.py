@@ -0,0 +1,52 @@
+import csv
+import json
+import sys
+from contextlib import contextmanager
+
+FIELDS = ('id', 'text', 'pub_date', 'author', 'group')
+FORMATS = ('ndjson', 'csv')
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return 'csv' if path.endswith('.csv') else 'ndjson'
+
+
+@contextmanager
+def open_stream(path, mode):
+    """Файл или stdin/stdout для пути '-'."""
+    if path == '-':
+        yield sys.stdin if 'r' in mode else sys.stdout
+        return
+    with open(path, mode, encoding='utf-8', newline='') as stream:
+        yield stream
+
+
+def read_records(stream, fmt):
+    """Построчно читает записи постов, не загружая файл в память."""
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class RecordWriter:
+    def __init__(self, stream, fmt):
+        self.stream = stream
+        self.fmt = fmt
+        if fmt == 'csv':
+            self.csv = csv.writer(stream)
+            self.csv.writerow(FIELDS)
+
+    def write(self, row):
+        if self.fmt == 'csv':
+            self.csv.writerow(row)
+        else:
+            self.stream.write(
+                json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False)
+            )
+            self.stream.write('\n')
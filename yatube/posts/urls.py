@@ -1,6 +1,9 @@
-from django.urls import path
+from django.urls import path, register_converter
 
 from . import views
+from .syndication import FormatConverter
+
+register_converter(FormatConverter, 'feed_format')
 
 app_name = "posts"
 urlpatterns = [
@@ -8,6 +11,18 @@ urlpatterns = [
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('search/', views.search, name='search'),
+    path('feed/<feed_format:fmt>/', views.index_feed, name='index_feed'),
+    path(
+        'group/<slug:slug>/feed/<feed_format:fmt>/',
+        views.group_feed,
+        name='group_feed',
+    ),
+    path(
+        'profile/<str:username>/feed/<feed_format:fmt>/',
+        views.profile_feed,
+        name='profile_feed',
+    ),
     path('create/', views.create_post, name='create_post'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
 ]
@@ -1,10 +1,179 @@
-from django.core.paginator import Paginator
+from django.conf import settings
+from django.core.paginator import Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from .timeline import TimelinePaginator
 
 POST_PER_PAGE = 10
+MAX_PAGE_SIZE = 50
+PAGE_SIZE_PARAM = 'page_size'
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+
+
+def post_position(post):
+    """Позиция (pub_date, id) поста или строки values() с этими полями."""
+    if isinstance(post, dict):
+        return post['pub_date'], post['id']
+    return post.pub_date, post.pk
+
+
+def encode_cursor(direction, post):
+    """Упаковывает позицию (pub_date, id) в непрозрачный токен."""
+    pub_date, pk = post_position(post)
+    raw = f'{direction}|{pub_date.isoformat()}|{pk}'
+    return urlsafe_base64_encode(raw.encode())
+
+
+def decode_cursor(token):
+    """Распаковывает токен; для битого токена возвращает None."""
+    try:
+        raw = urlsafe_base64_decode(token).decode()
+        direction, pub_date, pk = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        return None
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS) or pub_date is None:
+        return None
+    return direction, pub_date, pk
+
+
+class CursorPage(Page):
+    """Страница keyset-пагинации.
+
+    Номера страницы нет: вместо него — токены соседних страниц.
+    """
+
+    def __init__(self, object_list, paginator, next_cursor, previous_cursor):
+        super().__init__(object_list, None, paginator)
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class CursorPaginator(Paginator):
+    """Пагинация по ключу (pub_date, id) без OFFSET и COUNT(*).
+
+    Любая страница стоит столько же, сколько первая: база
+    сразу находит позицию курсора по индексу.
+    """
+
+    is_cursor = True
+    ordering = ('-pub_date', '-pk')
+
+    def get_page(self, cursor):
+        """Возвращает страницу по токену; битый токен — первая страница."""
+        position = decode_cursor(cursor) if cursor else None
+        if position is None:
+            return self.page_after(None)
+        direction, pub_date, pk = position
+        if direction == CURSOR_PREVIOUS:
+            return self.page_before(pub_date, pk)
+        return self.page_after((pub_date, pk))
+
+    def queryset_after(self, position):
+        """Посты строго после позиции (pub_date, pk) в порядке ленты."""
+        queryset = self.object_list.order_by(*self.ordering)
+        if position is None:
+            return queryset
+        pub_date, pk = position
+        return queryset.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+        )
+
+    def page_after(self, position):
+        queryset = self.queryset_after(position)
+        posts = list(queryset[:self.per_page + 1])
+        has_next = len(posts) > self.per_page
+        posts = posts[:self.per_page]
+        return self._build_page(
+            posts,
+            has_next=has_next,
+            has_previous=position is not None and bool(posts),
+        )
+
+    def page_before(self, pub_date, pk):
+        queryset = self.object_list.order_by('pub_date', 'pk').filter(
+            Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+        )
+        posts = list(queryset[:self.per_page + 1])
+        has_previous = len(posts) > self.per_page
+        posts = posts[:self.per_page][::-1]
+        if not posts:
+            return self.page_after(None)
+        return self._build_page(
+            posts, has_next=True, has_previous=has_previous
+        )
+
+    def _build_page(self, posts, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if has_next:
+            next_cursor = encode_cursor(CURSOR_NEXT, posts[-1])
+        if has_previous:
+            previous_cursor = encode_cursor(CURSOR_PREVIOUS, posts[0])
+        return CursorPage(posts, self, next_cursor, previous_cursor)
+
+
+def page_size_limits(view_name):
+    """(размер по умолчанию, максимум) страницы представления."""
+    sizes = getattr(settings, 'POSTS_PAGE_SIZES', {})
+    return sizes.get(view_name, (
+        getattr(settings, 'POSTS_PAGE_SIZE', POST_PER_PAGE),
+        getattr(settings, 'POSTS_MAX_PAGE_SIZE', MAX_PAGE_SIZE),
+    ))
+
+
+def page_size(request):
+    """Размер страницы из ?page_size=, урезанный до максимума.
+
+    Пределы задаются на представление (см. page_size_limits); битое
+    или неположительное значение — размер по умолчанию.
+    """
+    match = request.resolver_match
+    default, maximum = page_size_limits(match.view_name if match else None)
+    try:
+        size = int(request.GET.get(PAGE_SIZE_PARAM, default))
+    except ValueError:
+        return default
+    if size < 1:
+        return default
+    return min(size, maximum)
+
 
+def paginator(request, post_list, count=None, allow_cursor=True,
+              timeline=None):
+    """Страница постов; count — готовое число постов вместо COUNT(*).
 
-def paginator(request, post_list):
-    paginator = Paginator(post_list, POST_PER_PAGE)
+    allow_cursor=False оставляет обычные номера страниц — для выдачи,
+    отсортированной не по дате. timeline — материализованная лента
+    (главной, группы или автора), из которой берутся страницы;
+    её счётчик важнее count. Размер страницы — page_size(request).
+    """
+    per_page = page_size(request)
+    cursor = request.GET.get('cursor')
+    cursor_mode = cursor is not None or getattr(
+        settings, 'POSTS_PAGINATION', 'offset'
+    ) == 'cursor'
+    if allow_cursor and cursor_mode:
+        return CursorPaginator(post_list, per_page).get_page(cursor)
+    if timeline is not None:
+        paginator = TimelinePaginator(post_list, per_page, timeline)
+    else:
+        paginator = Paginator(post_list, per_page)
+        if count is not None:
+            paginator.count = count
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
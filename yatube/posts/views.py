@@ -1,56 +1,164 @@
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 
+from core.routers import replica_reads
+
+from .conditional import post_etag, render_conditional, render_feed
+from .counters import author_posts_count
+from .feed_cache import feed_timeline
 from .forms import PostForm
 from .models import Group, Post, User
+from .page_cache import anonymous_page_cache
+from .search import search_posts
+from .syndication import syndication_response
+from .timeline import load_timeline, timeline_enabled
 from .utils import paginator
 
 
+@anonymous_page_cache
+@replica_reads
 def index(request):
-    post_list = Post.objects.all()
-    page_obj = paginator(request, post_list)
-    context = {'page_obj': page_obj, }
-    return render(request, 'posts/index.html', context)
+    def make_page():
+        timeline = load_timeline() if timeline_enabled() else None
+        return paginator(request, Post.objects.feed(), timeline=timeline)
+
+    return render_feed(request, 'posts/index.html', {}, make_page)
 
 
+@anonymous_page_cache
+@replica_reads
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all()
-    page_obj = paginator(request, posts)
+
+    def make_page():
+        return paginator(
+            request,
+            group.posts.feed(),
+            count=group.posts_count,
+            timeline=feed_timeline('group', group.pk),
+        )
+
+    return render_feed(
+        request,
+        'posts/group_list.html',
+        {'group': group},
+        make_page,
+        group.title,
+        group.description,
+    )
+
+
+@anonymous_page_cache
+@replica_reads
+def profile(request, username):
+    author = get_object_or_404(
+        User.objects.select_related('post_stats'), username=username
+    )
+    posts_count = author_posts_count(author)
+
+    def make_page():
+        return paginator(
+            request,
+            author.posts.feed(),
+            count=posts_count,
+            timeline=feed_timeline('author', author.pk),
+        )
+
+    return render_feed(
+        request,
+        'posts/profile.html',
+        {'author': author, 'posts_count': posts_count},
+        make_page,
+        posts_count,
+        author.get_full_name(),
+    )
+
+
+@replica_reads
+def post_detail(request, post_id):
+    posts = Post.objects.select_related(
+        'author__post_stats', 'group'
+    )
+    post = get_object_or_404(posts, id=post_id)
+    posts_count = author_posts_count(post.author)
     context = {
-        'group': group,
-        'page_obj': page_obj,
+        'post': post,
+        'posts_count': posts_count,
     }
-    return render(request, 'posts/group_list.html', context)
+    etag = post_etag(
+        request,
+        post,
+        posts_count,
+        post.author.get_full_name(),
+        post.group and post.group.slug,
+    )
+    return render_conditional(
+        request, 'posts/post_detail.html', context, etag
+    )
 
 
-def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.all()
-    page_obj = paginator(request, posts)
+@replica_reads
+def search(request):
+    query = request.GET.get('q', '')
+    posts = Post.objects.feed()
+    group_slug = request.GET.get('group')
+    if group_slug:
+        posts = posts.filter(group__slug=group_slug)
+    author = request.GET.get('author')
+    if author:
+        posts = posts.filter(author__username=author)
+    page_obj = paginator(
+        request, search_posts(posts, query), allow_cursor=False
+    )
     context = {
         'page_obj': page_obj,
+        'query': query,
+        'groups': Group.objects.only('slug', 'title'),
+        'group_slug': group_slug,
         'author': author,
     }
-    return render(request, 'posts/profile.html', context)
+    return render(request, 'posts/search.html', context)
 
 
-def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
-    context = {
-        'post': post,
-    }
-    return render(request, 'posts/post_detail.html', context)
+def index_feed(request, fmt):
+    return syndication_response(request, fmt, 'index', 0, {
+        'title': 'Последние обновления на сайте',
+        'description': 'Новые посты всех авторов',
+        'link': reverse('posts:index'),
+    })
+
+
+def group_feed(request, slug, fmt):
+    group = get_object_or_404(Group, slug=slug)
+    return syndication_response(request, fmt, 'group', group.pk, {
+        'title': group.title,
+        'description': group.description,
+        'link': reverse('posts:group_list', args=[group.slug]),
+    })
+
+
+def profile_feed(request, username, fmt):
+    author = get_object_or_404(User, username=username)
+    name = author.get_full_name() or author.username
+    return syndication_response(request, fmt, 'author', author.pk, {
+        'title': f'Посты пользователя {name}',
+        'description': f'Новые посты пользователя {name}',
+        'link': reverse('posts:profile', args=[author.username]),
+    })
 
 
 @login_required
 def create_post(request):
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if request.method == "POST":
         if form.is_valid():
             create_post = form.save(commit=False)
             create_post.author = request.user
-            create_post.save()
+            # Пост и задачи его сигналов — в одной транзакции
+            with transaction.atomic():
+                create_post.save()
             return redirect('posts:profile', request.user.username)
     context = {'form': form, 'is_edit': True}
     return render(request, 'posts/create_post.html', context)
@@ -62,10 +170,15 @@ def post_edit(request, post_id):
     edit_post = get_object_or_404(posts, id=post_id)
     if request.user.id != edit_post.author_id:
         return redirect('posts:post_detail', post_id)
-    form = PostForm(request.POST or None, instance=edit_post)
+    form = PostForm(
+        request.POST or None,
+        files=request.FILES or None,
+        instance=edit_post,
+    )
     if request.method == "POST":
         if form.is_valid():
-            form.save()
+            with transaction.atomic():
+                form.save()
             return redirect('posts:post_detail', post_id)
     context = {'form': form, 'is_edit': True}
     return render(request, 'posts/create_post.html', context)
@@ -20,15 +20,20 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'sorl.thumbnail',
 
-    'posts',
+    'posts.apps.PostsConfig',
     'users',
-    'core',
+    'core.apps.CoreConfig',
     'about',
+    'api',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -65,7 +70,68 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+    },
+    # Реплика для чтения лент; локально — копия db.sqlite3,
+    # которую обновляет manage.py replicate_db
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+# PRAGMA для каждого подключения SQLite (core/sqlite.py).
+# 'production' — WAL: читатели не ждут писателя; synchronous=NORMAL
+# в WAL не теряет целостность; кэш 64 МиБ и mmap 256 МиБ.
+# 'default' — журнал SQLite по умолчанию, для сравнения.
+SQLITE_PROFILES = {
+    'default': {
+        'journal_mode': 'delete',
+    },
+    'production': {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'busy_timeout': 5000,
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'memory',
+    },
+}
+SQLITE_PRAGMAS = SQLITE_PROFILES[os.environ.get('SQLITE_PROFILE', 'production')]
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Псевдонимы реплик, с которых читают ленты; пусто — всё с default
+DATABASE_REPLICAS = [
+    alias
+    for alias in os.environ.get('DATABASE_REPLICAS', '').split(',')
+    if alias
+]
+# Сколько секунд после записи клиент читает с основной базы
+REPLICA_PIN_SECONDS = 10
+
+PAGE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'page_cache'),
+    },
+    'redis': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': os.getenv('PAGE_CACHE_REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': PAGE_CACHE_BACKENDS[os.getenv('PAGE_CACHE_BACKEND', 'locmem')],
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -96,6 +162,9 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
 
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
@@ -103,3 +172,99 @@ EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:index'
+
+# 'offset' — классические ?page=N, 'cursor' — keyset-пагинация по ?cursor=
+POSTS_PAGINATION = 'offset'
+
+# Постов на странице; ?page_size= меняет размер, но не больше
+# максимума. POSTS_PAGE_SIZES — (по умолчанию, максимум) для отдельных
+# представлений, остальным — POSTS_PAGE_SIZE и POSTS_MAX_PAGE_SIZE
+POSTS_PAGE_SIZE = 10
+POSTS_MAX_PAGE_SIZE = 50
+POSTS_PAGE_SIZES = {
+    'posts:search': (10, 20),
+    'api:posts': (10, 100),
+    'api:group_posts': (10, 100),
+    'api:profile_posts': (10, 100),
+}
+
+# Сколько секунд живёт отрендеренная карточка поста в кэше
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+
+# Кэш готовых страниц лент для анонимов (бэкенд — CACHES['pages'])
+POSTS_PAGE_CACHE = False
+POSTS_PAGE_CACHE_TIMEOUT = 60 * 15
+
+# Материализованная лента главной: ключи самых новых постов в кэше,
+# первые страницы index отдаются из неё без сортировки таблицы
+POSTS_TIMELINE = False
+POSTS_TIMELINE_SIZE = 200
+# Правки ленты видны всем воркерам только в общем кэше (Redis,
+# Memcached); в кэше процесса лента живёт не дольше таймаута
+POSTS_TIMELINE_CACHE = 'default'
+POSTS_TIMELINE_TIMEOUT = 60
+
+# Списки id постов групп и авторов в памяти процесса: бюджет
+# в байтах на все списки, лишнее вытесняется по LRU; в списке —
+# не больше POSTS_FEED_CACHE_SIZE новых постов
+POSTS_FEED_CACHE = False
+POSTS_FEED_CACHE_BYTES = 8 * 1024 * 1024
+POSTS_FEED_CACHE_SIZE = 1000
+
+# Сколько последних постов отдают ленты RSS, Atom и JSON Feed
+POSTS_SYNDICATION_SIZE = 50
+
+# Ленты отдаются потоком: шапка уходит клиенту до запроса постов.
+# Такие ответы без ETag и 304; страницы для кэша страниц
+# рендерятся целиком, как раньше
+POSTS_STREAMING_RENDER = False
+
+# Превью картинок постов режутся в фоне пулом из POSTS_THUMBNAIL_THREADS
+# потоков. Размеры — posts.thumbnails.THUMBNAILS; чтобы их сменить,
+# задайте здесь POSTS_THUMBNAILS в том же виде
+POSTS_THUMBNAIL_THREADS = 2
+
+# Очередь фоновых задач (core.tasks) в таблице core_task: задачи
+# ставятся в транзакции записи поста и выполняются manage.py run_workers.
+# Выключена — задачи выполняются сразу, в самом запросе
+TASKS_QUEUE = False
+TASKS_WORKERS = 2
+TASKS_MAX_ATTEMPTS = 5
+# Пауза перед повтором удваивается от TASKS_RETRY_DELAY секунд,
+# но не больше TASKS_RETRY_MAX_DELAY
+TASKS_RETRY_DELAY = 5
+TASKS_RETRY_MAX_DELAY = 60 * 60
+# Через столько секунд задачу упавшего воркера заберёт другой
+TASKS_LOCK_TIMEOUT = 5 * 60
+
+# Сколько постов принимает POST /api/v1/posts/bulk/ за один запрос
+API_BULK_SIZE = 1000
+
+# 'fts5' — индекс SQLite FTS5, любое другое значение — LIKE по словам
+POSTS_SEARCH_BACKEND = 'fts5'
+
+# Больше стольких строк админка постов не считает, а оценивает
+POSTS_ADMIN_COUNT_LIMIT = 100000
+
+# Гистограммы запросов, времени базы и шаблонов по представлениям
+REQUEST_METRICS = True
+# Больше стольких SQL-запросов — предупреждение в лог core.middleware;
+# словарь переопределяет бюджет для отдельных представлений
+REQUEST_METRICS_QUERY_BUDGET = 20
+REQUEST_METRICS_QUERY_BUDGETS = {
+    'posts:index': 5,
+    'posts:group_list': 5,
+    'posts:profile': 5,
+    'posts:post_detail': 5,
+}
+
+# Потоки ASGI-обработчика (yatube/asgi.py): для лент и страницы поста
+# и для всего остального
+ASGI_READ_THREADS = 8
+ASGI_THREADS = 4
+
+# Сжатие ответов (core.middleware.CompressionMiddleware): br, если
+# установлен пакет brotli, иначе gzip. Ответы короче
+# COMPRESSION_MIN_SIZE байт не сжимаются
+COMPRESSION = True
+COMPRESSION_MIN_SIZE = 512